@@ -0,0 +1,166 @@
+"""Measure microphone capture latency with a fake sounddevice stream.
+
+A fake InputStream fires the capture callback from its own thread once per
+block, like PortAudio does, and records when each block was delivered.
+The benchmark then measures how long each block takes to come out of
+get_audio_chunks(). It compares LocalVoiceSource's callback-driven queue
+with the previous executor-polling loop (queue.Queue.get(timeout=0.1) in
+run_in_executor, plus a 10 ms sleep on every empty poll).
+
+Usage:
+
+    PYTHONPATH=src python benchmarks/mic_latency.py [--blocks 100] [--block-ms 100]
+
+Add --load to keep the default executor busy with other blocking work, as
+the dashboard and state store do in a real session.
+"""
+
+import argparse
+import asyncio
+import os
+import queue
+import statistics
+import sys
+import threading
+import time
+import types
+
+import numpy as np
+
+
+class FakeInputStream:
+    """Calls the callback with a sine block every blocksize/samplerate seconds."""
+
+    deliveries: list[float] = []
+
+    def __init__(self, samplerate, channels, dtype, blocksize, callback):
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+        self.callback = callback
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        t = np.arange(blocksize) / samplerate
+        self._block = (0.1 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)[:, None]
+
+    def _run(self):
+        period = self.blocksize / self.samplerate
+        next_at = time.monotonic() + period
+        while not self._stop.is_set():
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            next_at += period
+            FakeInputStream.deliveries.append(time.monotonic())
+            self.callback(self._block, self.blocksize, None, None)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def close(self):
+        pass
+
+
+class FakeOutputStream:
+    def __init__(self, **kwargs):
+        pass
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+
+sys.modules["sounddevice"] = types.SimpleNamespace(
+    InputStream=FakeInputStream, OutputStream=FakeOutputStream
+)
+
+from conversator_voice.voice_sources.local import LocalVoiceSource  # noqa: E402
+
+
+class PollingVoiceSource(LocalVoiceSource):
+    """The previous capture path: a thread-safe queue drained by executor polls."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._input_queue: queue.Queue[bytes] = queue.Queue()
+
+    def _post_frame(self, frame):
+        self._input_queue.put(frame.pcm)
+
+    async def get_audio_chunks(self):
+        while self._running:
+            try:
+                chunk = await asyncio.get_event_loop().run_in_executor(
+                    None, lambda: self._input_queue.get(timeout=0.1)
+                )
+                yield chunk
+            except queue.Empty:
+                await asyncio.sleep(0.01)
+
+
+async def blocking_load(stop: asyncio.Event) -> None:
+    """Keep every default-executor worker busy with short blocking jobs."""
+    loop = asyncio.get_running_loop()
+    workers = min(32, (os.cpu_count() or 1) + 4)
+    while not stop.is_set():
+        jobs = (loop.run_in_executor(None, time.sleep, 0.05) for _ in range(workers * 2))
+        await asyncio.gather(*jobs)
+
+
+async def run(source_cls, blocks: int, block_ms: int, load: bool) -> list[float]:
+    FakeInputStream.deliveries = []
+    source = source_cls(chunk_duration_ms=block_ms)
+    stop_load = asyncio.Event()
+    loader = asyncio.create_task(blocking_load(stop_load)) if load else None
+
+    await source.start()
+    latencies = []
+    received = 0
+    async for _ in source.get_audio_chunks():
+        latencies.append(time.monotonic() - FakeInputStream.deliveries[received])
+        received += 1
+        if received >= blocks:
+            break
+    await source.stop()
+
+    if loader:
+        stop_load.set()
+        await loader
+    return latencies
+
+
+def report(label: str, latencies: list[float]) -> None:
+    ms = sorted(x * 1000 for x in latencies)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    print(
+        f"{label:<28} median {statistics.median(ms):7.2f} ms   "
+        f"p95 {p95:7.2f} ms   max {ms[-1]:7.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=100)
+    parser.add_argument("--block-ms", type=int, default=100)
+    parser.add_argument("--load", action="store_true", help="Saturate the default executor")
+    args = parser.parse_args()
+
+    load = " under executor load" if args.load else ""
+    print(f"{args.blocks} blocks of {args.block_ms} ms{load}\n")
+    for label, cls in (
+        ("executor polling (old)", PollingVoiceSource),
+        ("callback -> asyncio.Queue", LocalVoiceSource),
+    ):
+        report(label, asyncio.run(run(cls, args.blocks, args.block_ms, args.load)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Replay an OpenCode event stream through the SSE parsers.
+
+Compares the old parsing loop (httpx aiter_lines(), strip, concatenate,
+json.loads inline) with SSEDecoder over aiter_bytes() on the same chunks,
+then replays the stream end to end through OpenCodeSSEClient's reader and
+dispatcher, handlers included.
+
+Record a real stream with:
+
+    curl -sN http://localhost:4158/event > events.sse
+
+Usage:
+
+    PYTHONPATH=src python benchmarks/sse_replay.py [--file events.sse] [--chunk 4096]
+
+Without --file a synthetic builder session is generated: one part streamed
+token by token (every update resends the whole part, as OpenCode does),
+interleaved with tool parts carrying large outputs.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import httpx
+
+from conversator_voice.opencode_sse_client import OpenCodeSSEClient
+from conversator_voice.sse_parser import SSEDecoder, loads_event_data
+
+
+def synthetic_stream(tokens: int = 4000, tool_every: int = 200) -> bytes:
+    """Build an event stream resembling a busy builder session."""
+    events = [{"type": "session.updated", "properties": {"info": {"id": "ses_bench"}}}]
+    text = ""
+    for i in range(tokens):
+        text += f"token{i} "
+        events.append({
+            "type": "message.part.updated",
+            "properties": {
+                "part": {
+                    "id": "prt_text",
+                    "messageID": "msg_bench",
+                    "sessionID": "ses_bench",
+                    "type": "text",
+                    "text": text[-2000:],
+                },
+                "delta": f"token{i} ",
+            },
+        })
+        if i % tool_every == 0:
+            events.append({
+                "type": "message.part.updated",
+                "properties": {
+                    "part": {
+                        "id": f"prt_tool_{i}",
+                        "messageID": "msg_bench",
+                        "sessionID": "ses_bench",
+                        "type": "tool",
+                        "tool": "bash",
+                        "state": {"status": "completed", "output": "line of output\n" * 400},
+                    }
+                },
+            })
+    return b"".join(
+        f"id: {n}\nevent: {e['type']}\ndata: {json.dumps(e)}\n\n".encode()
+        for n, e in enumerate(events)
+    )
+
+
+def chunked(stream: bytes, size: int) -> list[bytes]:
+    return [stream[i:i + size] for i in range(0, len(stream), size)]
+
+
+def replay_response(chunks: list[bytes]) -> httpx.Response:
+    """A streaming httpx response that yields the recorded chunks."""
+
+    async def body():
+        for chunk in chunks:
+            yield chunk
+
+    return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=body())
+
+
+async def legacy_parse(chunks: list[bytes]) -> int:
+    """The previous aiter_lines() loop, minus the handler call."""
+    event_type = ""
+    event_data = ""
+    count = 0
+    async for line in replay_response(chunks).aiter_lines():
+        line = line.strip()
+        if line.startswith("event:"):
+            event_type = line[6:].strip()
+            continue
+        if line.startswith("data:"):
+            part = line[5:].strip()
+            event_data = (event_data + "\n" + part).strip() if event_data else part
+            continue
+        if line == "" and event_data:
+            data = json.loads(event_data)
+            _ = data.get("type") or event_type
+            count += 1
+            event_type = ""
+            event_data = ""
+    return count
+
+
+async def decoder_parse(chunks: list[bytes], loads=loads_event_data) -> int:
+    decoder = SSEDecoder()
+    count = 0
+    async for chunk in replay_response(chunks).aiter_bytes():
+        for event in decoder.feed(chunk):
+            loads(event.data)
+            count += 1
+    return count
+
+
+def decoder_framing(chunks: list[bytes]) -> int:
+    decoder = SSEDecoder()
+    return sum(len(decoder.feed(chunk)) for chunk in chunks)
+
+
+async def replay_client(chunks: list[bytes]) -> int:
+    client = OpenCodeSSEClient(base_url="http://localhost:4158")
+    client._running = True
+    await client._consume_stream(replay_response(chunks))
+    await client.transport.aclose()
+    return client._events_received
+
+
+def measure(label: str, fn, total_bytes: int, repeat: int) -> None:
+    best = float("inf")
+    events = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        events = fn()
+        best = min(best, time.perf_counter() - started)
+    print(
+        f"{label:<28} {events:>7} events  {best * 1000:8.1f} ms  "
+        f"{events / best:>10,.0f} ev/s  {total_bytes / best / 1e6:7.1f} MB/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file", type=Path, help="Recorded raw SSE stream")
+    parser.add_argument("--chunk", type=int, default=4096, help="Bytes per socket read")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    stream = args.file.read_bytes() if args.file else synthetic_stream()
+    chunks = chunked(stream, args.chunk)
+    print(f"Replaying {len(stream) / 1e6:.1f} MB in {len(chunks)} chunks of {args.chunk} bytes\n")
+    sizes = (len(stream), args.repeat)
+
+    measure("aiter_lines loop (old)", lambda: asyncio.run(legacy_parse(chunks)), *sizes)
+    measure(
+        "SSEDecoder + json",
+        lambda: asyncio.run(decoder_parse(chunks, loads=json.loads)),
+        *sizes,
+    )
+    if loads_event_data is not json.loads:
+        measure("SSEDecoder + orjson", lambda: asyncio.run(decoder_parse(chunks)), *sizes)
+    measure("SSEDecoder framing only", lambda: decoder_framing(chunks), *sizes)
+    measure("client replay (handlers)", lambda: asyncio.run(replay_client(chunks)), *sizes)
+
+
+if __name__ == "__main__":
+    main()
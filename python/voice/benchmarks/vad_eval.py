@@ -0,0 +1,240 @@
+"""Evaluate voice activity detection offline against recorded WAV files.
+
+Each WAV file may have a label file next to it, in Audacity's label
+format: one "start<TAB>end[<TAB>text]" line per speech region, in seconds.
+The label file is <name>.txt or <name>.labels.txt. The audio is split into
+frames as the send loop sees them and run through each engine:
+
+- fixed: the previous rule (RMS above voice.speech_threshold, end of turn
+  after 10 quiet 100 ms chunks)
+- energy: adaptive noise-floor VAD
+- webrtc: webrtcvad model (only if the optional package is installed)
+
+Reported per engine:
+
+- frame precision/recall against the labels;
+- end-of-turn latency: from the end of a labelled turn to the detector's
+  end event;
+- false ends: end events in the middle of a turn (cutting the user off);
+- missed ends: turns that never got an end event;
+- uplink saved: audio an UpstreamGate in "speech" mode would not send
+  upstream for this engine, as seconds and a share of the recording.
+
+Usage:
+
+    PYTHONPATH=src python benchmarks/vad_eval.py recordings/*.wav
+    PYTHONPATH=src python benchmarks/vad_eval.py            # synthetic rooms
+
+Without files, a quiet room and a noisy room are synthesised, with
+speech-like bursts of syllables separated by pauses. One turn is a
+connected monologue of over 10 s, longer than the VAD's noise window.
+"""
+
+import argparse
+import statistics
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from conversator_voice.audio_analysis import SpeechLevels
+from conversator_voice.upstream_gate import GateSettings, UpstreamGate
+from conversator_voice.vad import (
+    EnergyClassifier,
+    VADSettings,
+    VoiceActivityDetector,
+    WebRTCClassifier,
+    frames_from_pcm,
+)
+
+SAMPLE_RATE = 16000
+# Silence between labelled regions that makes them separate turns
+TURN_GAP_S = 1.0
+# An end event this long after a turn's end still counts as ending it
+MATCH_WINDOW_S = 3.0
+
+
+class FixedClassifier:
+    """The previous fixed-threshold rule."""
+
+    def __init__(self, levels: SpeechLevels):
+        self.levels = levels
+        self.noise_floor = 0.0
+
+    def classify(self, frame, generating=False):
+        return self.levels.is_speech(frame, generating), frame.rms
+
+
+def read_wav(path: Path) -> np.ndarray:
+    """Mono int16 samples at SAMPLE_RATE."""
+    with wave.open(str(path), "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit PCM is supported")
+        rate, channels = wav.getframerate(), wav.getnchannels()
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+    samples = samples.reshape(-1, channels).mean(axis=1)
+    if rate != SAMPLE_RATE:
+        positions = np.arange(0, len(samples), rate / SAMPLE_RATE)
+        samples = np.interp(positions, np.arange(len(samples)), samples)
+    return samples.astype(np.int16)
+
+
+def read_labels(path: Path) -> list[tuple[float, float]] | None:
+    for candidate in (path.with_suffix(".labels.txt"), path.with_suffix(".txt")):
+        if candidate.exists():
+            regions = []
+            for line in candidate.read_text().splitlines():
+                fields = line.split("\t")
+                if len(fields) >= 2:
+                    regions.append((float(fields[0]), float(fields[1])))
+            return sorted(regions)
+    return None
+
+
+def synthetic_room(noise_rms: float, seed: int) -> tuple[np.ndarray, list[tuple[float, float]]]:
+    """Pauses and speech-like syllable bursts over steady background noise."""
+    rng = np.random.default_rng(seed)
+    chunks, regions, t = [], [], 0.0
+
+    def add(samples):
+        nonlocal t
+        chunks.append(samples)
+        t += len(samples) / SAMPLE_RATE
+
+    add(rng.normal(0, noise_rms, int(3.0 * SAMPLE_RATE)))
+    for turn in range(8):
+        start = t
+        # One connected monologue (no word gaps) longer than the noise window
+        monologue = turn == 4
+        for _ in range(60 if monologue else rng.integers(4, 12)):
+            # A syllable: voiced harmonics under a smooth envelope
+            n = int(rng.uniform(0.12, 0.3) * SAMPLE_RATE)
+            k = np.arange(n) / SAMPLE_RATE
+            pitch = rng.uniform(110, 220)
+            voice = sum(np.sin(2 * np.pi * pitch * h * k) / h for h in range(1, 6))
+            envelope = np.sin(np.pi * np.arange(n) / n) * rng.uniform(8000, 16000)
+            add(voice * envelope + rng.normal(0, noise_rms, n))
+            # Short gaps between words stay inside the turn
+            gap = 0.0 if monologue else rng.uniform(0.02, 0.25)
+            add(rng.normal(0, noise_rms, int(gap * SAMPLE_RATE)))
+        regions.append((start, t))
+        add(rng.normal(0, noise_rms, int(rng.uniform(1.5, 4.0) * SAMPLE_RATE)))
+    samples = np.clip(np.concatenate(chunks), -32768, 32767).astype(np.int16)
+    return samples, regions
+
+
+def turns(regions: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    """Merge labelled regions separated by less than TURN_GAP_S."""
+    merged: list[tuple[float, float]] = []
+    for start, end in regions:
+        if merged and start - merged[-1][1] < TURN_GAP_S:
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def build(engine: str, settings: VADSettings, levels: SpeechLevels) -> VoiceActivityDetector:
+    if engine == "fixed":
+        legacy = VADSettings(min_speech_ms=1, end_of_speech_ms=1000, pre_roll_ms=0)
+        return VoiceActivityDetector(FixedClassifier(levels), legacy)
+    if engine == "webrtc":
+        return VoiceActivityDetector(WebRTCClassifier(settings), settings)
+    return VoiceActivityDetector(EnergyClassifier(settings, levels), settings)
+
+
+def evaluate(detector, samples, regions, frame_ms: int, keepalive_ms: float) -> dict:
+    frames = frames_from_pcm(samples, SAMPLE_RATE, frame_ms)
+    gate = UpstreamGate(
+        GateSettings(mode="speech", keepalive_ms=keepalive_ms, sample_rate=SAMPLE_RATE)
+    )
+    frame_s = frame_ms / 1000
+    truth, predicted, ends = [], [], []
+    for i, frame in enumerate(frames):
+        mid = (i + 0.5) * frame_s
+        truth.append(any(start <= mid < end for start, end in regions))
+        result = detector.process(frame)
+        gate.admit(frame, result)
+        predicted.append(result.voiced)
+        if result.ended:
+            ends.append((i + 1) * frame_s)
+
+    truth_arr, pred_arr = np.array(truth), np.array(predicted)
+    true_pos = int(np.sum(truth_arr & pred_arr))
+    latencies, false_ends, missed = [], 0, 0
+    turn_list = turns(regions)
+    for start, end in turn_list:
+        false_ends += sum(1 for e in ends if start < e < end)
+        matched = [e - end for e in ends if end <= e <= end + MATCH_WINDOW_S]
+        if matched:
+            latencies.append(matched[0])
+        else:
+            missed += 1
+    return {
+        "precision": true_pos / max(int(pred_arr.sum()), 1),
+        "recall": true_pos / max(int(truth_arr.sum()), 1),
+        "latencies": latencies,
+        "false_ends": false_ends,
+        "missed": missed,
+        "turns": len(turn_list),
+        "uplink": gate.stats(),
+    }
+
+
+def report(name: str, engine: str, stats: dict) -> None:
+    latency = "     n/a"
+    if stats["latencies"]:
+        latency = f"{statistics.median(stats['latencies']) * 1000:6.0f} ms"
+    print(
+        f"{name:<22} {engine:<7} precision {stats['precision']:5.2f}  "
+        f"recall {stats['recall']:5.2f}  end latency {latency}  "
+        f"false ends {stats['false_ends']:3d}  missed {stats['missed']:2d}/{stats['turns']}  "
+        f"uplink saved {stats['uplink']['seconds_saved']:5.1f} s "
+        f"({stats['uplink']['saved_ratio']:.0%})"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", type=Path, help="WAV recordings (16-bit PCM)")
+    parser.add_argument("--frame-ms", type=int, default=100)
+    parser.add_argument("--end-of-speech-ms", type=float, default=500.0)
+    parser.add_argument("--speech-threshold", type=float, default=1500.0)
+    parser.add_argument("--margin-db", type=float, default=6.0)
+    parser.add_argument("--keepalive-ms", type=float, default=2000.0)
+    args = parser.parse_args()
+
+    settings = VADSettings(end_of_speech_ms=args.end_of_speech_ms, margin_db=args.margin_db)
+    levels = SpeechLevels(speech=args.speech_threshold)
+    engines = ["fixed", "energy"]
+    try:
+        import webrtcvad  # noqa: F401
+
+        engines.append("webrtc")
+    except ImportError:
+        print("(webrtcvad not installed; skipping the webrtc engine)\n")
+
+    if args.files:
+        inputs = []
+        for path in args.files:
+            labels = read_labels(path)
+            if labels is None:
+                print(f"{path}: no label file, skipped")
+                continue
+            inputs.append((path.name, read_wav(path), labels))
+    else:
+        inputs = [
+            ("synthetic quiet room", *synthetic_room(150, seed=1)),
+            ("synthetic noisy room", *synthetic_room(2500, seed=2)),
+        ]
+
+    for name, samples, labels in inputs:
+        for engine in engines:
+            detector = build(engine, settings, levels)
+            stats = evaluate(detector, samples, labels, args.frame_ms, args.keepalive_ms)
+            report(name, engine, stats)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import { useEffect, useCallback } from 'react';
 import { Zap, WifiOff, Wifi } from 'lucide-react';
-import { useWebSocket, WebSocketMessage } from './hooks/useWebSocket';
+import { useWebSocket, WebSocketMessage, WebSocketSubscription } from './hooks/useWebSocket';
 import { useEventStore } from './stores/eventStore';
 import { api, ConversationEntry, Task, InboxItem } from './api/client';
 import { ConversationLogPanel } from './components/panels/ConversationLogPanel';
@@ -10,6 +10,11 @@ import { InboxPanel } from './components/panels/InboxPanel';
 import { SystemHealthPanel } from './components/panels/SystemHealthPanel';
 import { EventTimelinePanel } from './components/panels/EventTimelinePanel';
 
+// Topics the panels below render; OpenCode message streams are not among them
+const SUBSCRIPTION: WebSocketSubscription = {
+  topics: ['conversation', 'tasks', 'inbox', 'builders', 'system']
+};
+
 function App() {
   const setConversation = useEventStore((s) => s.setConversation);
   const addConversationEntry = useEventStore((s) => s.addConversationEntry);
@@ -23,6 +28,28 @@ function App() {
   const setWsConnected = useEventStore((s) => s.setWsConnected);
   const wsConnected = useEventStore((s) => s.wsConnected);
 
+  // Load full state over REST (initially, and when the server drops our backlog)
+  const fetchSnapshot = useCallback(async () => {
+    try {
+      // Fetch all data in parallel
+      const [conversationRes, tasksRes, inboxRes, buildersRes, healthRes] = await Promise.all([
+        api.getConversation(200),
+        api.getTasks(),
+        api.getInbox(),
+        api.getBuilders(),
+        api.getHealth()
+      ]);
+
+      setConversation(conversationRes.entries);
+      setTasks(tasksRes.tasks);
+      setInbox(inboxRes.items, inboxRes.unread_count);
+      setBuilders(buildersRes.builders);
+      setHealth(healthRes);
+    } catch (e) {
+      console.error('Failed to fetch initial data:', e);
+    }
+  }, [setConversation, setTasks, setInbox, setBuilders, setHealth]);
+
   // Handle WebSocket messages
   const handleMessage = useCallback((msg: WebSocketMessage) => {
     switch (msg.type) {
@@ -40,40 +67,24 @@ function App() {
         updateBuilderStatus(name, status);
         break;
       }
+      case 'resync':
+        // We fell too far behind and missed events; reload everything
+        fetchSnapshot();
+        break;
     }
-  }, [addConversationEntry, updateTask, addInboxItem, updateBuilderStatus]);
+  }, [addConversationEntry, updateTask, addInboxItem, updateBuilderStatus, fetchSnapshot]);
 
   // WebSocket connection
   useWebSocket({
     onMessage: handleMessage,
+    subscription: SUBSCRIPTION,
     onConnect: () => setWsConnected(true),
     onDisconnect: () => setWsConnected(false)
   });
 
   // Initial data fetch
   useEffect(() => {
-    const fetchInitialData = async () => {
-      try {
-        // Fetch all data in parallel
-        const [conversationRes, tasksRes, inboxRes, buildersRes, healthRes] = await Promise.all([
-          api.getConversation(200),
-          api.getTasks(),
-          api.getInbox(),
-          api.getBuilders(),
-          api.getHealth()
-        ]);
-
-        setConversation(conversationRes.entries);
-        setTasks(tasksRes.tasks);
-        setInbox(inboxRes.items, inboxRes.unread_count);
-        setBuilders(buildersRes.builders);
-        setHealth(healthRes);
-      } catch (e) {
-        console.error('Failed to fetch initial data:', e);
-      }
-    };
-
-    fetchInitialData();
+    fetchSnapshot();
 
     // Refresh health periodically
     const healthInterval = setInterval(async () => {
@@ -86,7 +97,7 @@ function App() {
     }, 10000);
 
     return () => clearInterval(healthInterval);
-  }, [setConversation, setTasks, setInbox, setBuilders, setHealth]);
+  }, [fetchSnapshot, setHealth]);
 
   return (
     <div className="min-h-screen bg-surface flex flex-col">
@@ -0,0 +1,54 @@
+// Decoding of dashboard WebSocket frames (see dashboard/ws_protocol.py).
+//
+// We offer the compact binary protocol when the browser can inflate raw
+// DEFLATE, and always fall back to the plain JSON text protocol. A server
+// that does not know the binary protocol simply accepts none and keeps
+// sending JSON text, which decodeFrame also handles.
+
+const DEFLATED = 0x01;
+const MSGPACK = 0x02;
+
+const canInflate = typeof DecompressionStream !== 'undefined';
+
+// Most preferred first
+export const SUBPROTOCOLS = canInflate
+  ? ['conversator.binary', 'conversator.json']
+  : ['conversator.json'];
+
+export interface DecodedFrame {
+  type: string;
+  data: unknown;
+  timestamp?: string;
+}
+
+async function inflateRaw(bytes: Uint8Array): Promise<Uint8Array> {
+  const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('deflate-raw'));
+  return new Uint8Array(await new Response(stream).arrayBuffer());
+}
+
+export async function decodeFrame(raw: string | ArrayBuffer): Promise<DecodedFrame> {
+  if (typeof raw === 'string') {
+    return JSON.parse(raw) as DecodedFrame;
+  }
+
+  const frame = new Uint8Array(raw);
+  const flags = frame[0];
+  if (flags & MSGPACK) {
+    // Never offered by this client; the server only sends it when asked
+    throw new Error('msgpack frames are not supported by the dashboard');
+  }
+  let body = frame.subarray(1);
+  if (flags & DEFLATED) {
+    body = await inflateRaw(body);
+  }
+  const envelope = JSON.parse(new TextDecoder().decode(body)) as {
+    type: string;
+    data: unknown;
+    ts: number;
+  };
+  return {
+    type: envelope.type,
+    data: envelope.data,
+    timestamp: new Date(envelope.ts).toISOString()
+  };
+}
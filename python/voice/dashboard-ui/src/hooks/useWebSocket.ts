@@ -1,18 +1,36 @@
 import { useEffect, useRef, useCallback } from 'react';
+import { SUBPROTOCOLS, decodeFrame } from '../api/wsProtocol';
 
 export type WebSocketEventType =
   | 'conversation_entry'
   | 'task_update'
   | 'inbox_item'
-  | 'builder_status';
+  | 'builder_status'
+  | 'resync';
 
 export interface WebSocketMessage {
   type: WebSocketEventType;
   data: unknown;
 }
 
+// Server-side filters; events outside them are never sent to this client
+export type WebSocketTopic =
+  | 'conversation'
+  | 'tasks'
+  | 'inbox'
+  | 'builders'
+  | 'system'
+  | 'sessions'
+  | 'messages';
+
+export interface WebSocketSubscription {
+  topics?: WebSocketTopic[];
+  sessions?: string[];
+}
+
 interface UseWebSocketOptions {
   onMessage?: (msg: WebSocketMessage) => void;
+  subscription?: WebSocketSubscription;
   onConnect?: () => void;
   onDisconnect?: () => void;
   reconnectInterval?: number;
@@ -23,6 +41,7 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
     onMessage,
     onConnect,
     onDisconnect,
+    subscription,
     reconnectInterval = 3000
   } = options;
 
@@ -37,20 +56,28 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
     const apiHost = import.meta.env.DEV ? 'localhost:8080' : window.location.host;
     const wsUrl = `${protocol}//${apiHost}/ws/events`;
 
-    const ws = new WebSocket(wsUrl);
+    const ws = new WebSocket(wsUrl, SUBPROTOCOLS);
+    ws.binaryType = 'arraybuffer';
+    // Inflating is async; chain decodes so messages are handled in order
+    let decoding: Promise<void> = Promise.resolve();
 
     ws.onopen = () => {
       console.log('[WS] Connected');
+      if (subscription) {
+        ws.send(JSON.stringify({ action: 'subscribe', ...subscription }));
+      }
       onConnect?.();
     };
 
     ws.onmessage = (event) => {
-      try {
-        const msg = JSON.parse(event.data) as WebSocketMessage;
-        onMessage?.(msg);
-      } catch (e) {
-        console.error('[WS] Parse error:', e);
-      }
+      decoding = decoding.then(async () => {
+        try {
+          const msg = (await decodeFrame(event.data)) as WebSocketMessage;
+          onMessage?.(msg);
+        } catch (e) {
+          console.error('[WS] Parse error:', e);
+        }
+      });
     };
 
     ws.onclose = () => {
@@ -68,7 +95,7 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
     };
 
     wsRef.current = ws;
-  }, [onMessage, onConnect, onDisconnect, reconnectInterval]);
+  }, [onMessage, onConnect, onDisconnect, subscription, reconnectInterval]);
 
   const disconnect = useCallback(() => {
     if (reconnectTimeoutRef.current) {
@@ -0,0 +1,118 @@
+"""Per-frame audio analysis shared by capture, echo gating and speech detection.
+
+Each captured frame is analysed once, when it enters the pipeline. The
+results travel with the frame as an AudioFrame, so echo suppression in the
+voice source and end-of-speech detection in the send loop read the same
+numbers rather than computing RMS separately. SpeechLevels holds the
+thresholds that both places compare against.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+
+import numpy as np
+
+# Chunks starting with this carry a typed command rather than audio (Telegram)
+TEXT_PREFIX = b"TEXT:"
+
+
+@dataclass(slots=True)
+class AudioFrame:
+    """One chunk of 16-bit PCM with its analysis results."""
+
+    pcm: bytes
+    rms: float
+    peak: int
+    captured_at: float = field(default_factory=time.monotonic)
+    # Only computed when features are requested
+    zero_crossing_rate: float | None = None
+    spectral_centroid: float | None = None
+
+
+@dataclass
+class SpeechLevels:
+    """RMS thresholds (int16 scale) used to classify frames."""
+
+    speech: float = 1500.0
+    # The model's own voice leaks into the mic while it talks; require more
+    generating_factor: float = 3.0
+    # Loud enough to be the user talking over playback rather than echo
+    interrupt: float = 10000.0
+
+    def is_speech(self, frame: AudioFrame, generating: bool = False) -> bool:
+        """Whether a frame is loud enough to count as speech."""
+        threshold = self.speech * self.generating_factor if generating else self.speech
+        return frame.rms > threshold
+
+    def is_interrupt(self, frame: AudioFrame) -> bool:
+        """Whether a frame captured during playback is the user interrupting."""
+        return frame.rms > self.interrupt
+
+
+def analyze(
+    samples: np.ndarray,
+    pcm: bytes | None = None,
+    sample_rate: int = 16000,
+    features: bool = False,
+    captured_at: float | None = None,
+) -> AudioFrame:
+    """Analyse one int16 frame in a single vectorized pass.
+
+    Args:
+        samples: 1-D int16 samples
+        pcm: The same samples as bytes, if already available
+        sample_rate: Sample rate (Hz), for the spectral centroid
+        features: Also compute zero-crossing rate and spectral centroid
+        captured_at: Capture time (monotonic); default now
+
+    Returns:
+        The frame with its level attached
+    """
+    if pcm is None:
+        pcm = samples.tobytes()
+    if captured_at is None:
+        captured_at = time.monotonic()
+    count = len(samples)
+    if not count:
+        return AudioFrame(pcm=pcm, rms=0.0, peak=0, captured_at=captured_at)
+
+    values = samples.astype(np.float32)
+    rms = float(np.sqrt(np.dot(values, values) / count))
+    peak = int(np.max(np.abs(values)))
+    frame = AudioFrame(pcm=pcm, rms=rms, peak=peak, captured_at=captured_at)
+
+    if features and count > 1:
+        signs = np.signbit(samples)
+        frame.zero_crossing_rate = float(np.count_nonzero(signs[1:] != signs[:-1]) / (count - 1))
+        spectrum = np.abs(np.fft.rfft(values))
+        total = float(spectrum.sum())
+        if total > 0:
+            freqs = np.fft.rfftfreq(count, 1 / sample_rate)
+            frame.spectral_centroid = float(np.dot(freqs, spectrum) / total)
+    return frame
+
+
+def analyze_bytes(pcm: bytes, **kwargs) -> AudioFrame:
+    """Analyse a chunk of 16-bit little-endian PCM."""
+    usable = len(pcm) - len(pcm) % 2
+    return analyze(np.frombuffer(pcm, dtype=np.int16, count=usable // 2), pcm=pcm, **kwargs)
+
+
+async def audio_frames(voice) -> AsyncIterator[AudioFrame | bytes]:
+    """Analysed frames from any voice source.
+
+    Sources that analyse frames at capture time (LocalVoiceSource) provide
+    get_audio_frames(); for the rest each chunk is analysed here. Text
+    commands are passed through as bytes.
+    """
+    if hasattr(voice, "get_audio_frames"):
+        async for frame in voice.get_audio_frames():
+            yield frame
+        return
+
+    async for chunk in voice.get_audio_chunks():
+        if isinstance(chunk, bytes) and chunk.startswith(TEXT_PREFIX):
+            yield chunk
+        else:
+            yield analyze_bytes(chunk)
@@ -0,0 +1,175 @@
+"""Coalescing of streaming OpenCode updates before dashboard broadcast.
+
+OpenCode emits one message.part.updated per token. Broadcasting each one
+costs a json.dumps and a send per connected client. The coalescer buffers
+text deltas per message and tool states per part for a short window, then
+sends one combined update per message or part. Dashboard fan-out then
+scales with the number of messages rather than the number of tokens.
+Callers flush a session before sending its status or error events, so the
+dashboard never sees a session finish before its last text arrives.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .dashboard.websocket import ConnectionManager
+
+# Default window (seconds) over which part updates are merged
+DEFAULT_COALESCE_WINDOW = 0.05
+
+_window = DEFAULT_COALESCE_WINDOW
+
+
+def configure_coalescing(window: float) -> None:
+    """Set the window used by coalescers created from now on (0 = off)."""
+    global _window
+    _window = window
+
+
+@dataclass
+class _PendingChunk:
+    session_id: str
+    message_id: str
+    deltas: list[str] = field(default_factory=list)
+    source_event: str | None = None
+    updates: int = 0
+
+
+@dataclass
+class _PendingTool:
+    session_id: str
+    message_id: str
+    part: dict
+    updates: int = 0
+
+
+class BroadcastCoalescer:
+    """Merges per-message deltas and per-part tool states over a window."""
+
+    def __init__(self, ws_manager: "ConnectionManager", window: float | None = None):
+        """Initialize the coalescer.
+
+        Args:
+            ws_manager: Dashboard WebSocket manager to broadcast through
+            window: Seconds to merge updates for (0 sends every update at once;
+                default: window set by configure_coalescing)
+        """
+        self.ws_manager = ws_manager
+        self.window = _window if window is None else window
+        # Insertion-ordered so flushes keep first-arrival order
+        self._pending: dict[tuple, _PendingChunk | _PendingTool] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushing: asyncio.Task | None = None
+        self.updates_received = 0
+        self.broadcasts_sent = 0
+
+    async def chunk(
+        self,
+        session_id: str,
+        message_id: str,
+        delta: str,
+        is_complete: bool = False,
+        source_event: str | None = None,
+    ) -> None:
+        """Queue a text delta for a message.
+
+        A completing chunk flushes the message at once.
+        """
+        self.updates_received += 1
+        key = ("chunk", session_id, message_id)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _PendingChunk(session_id, message_id)
+        pending.deltas.append(delta)
+        pending.source_event = source_event
+        pending.updates += 1
+
+        if is_complete or self.window <= 0:
+            await self._send(key, is_complete=is_complete)
+        else:
+            self._arm()
+
+    async def tool(self, session_id: str, message_id: str, part: dict) -> None:
+        """Queue a tool part; only its latest state is sent."""
+        self.updates_received += 1
+        key = ("tool", session_id, message_id, part.get("id"))
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _PendingTool(session_id, message_id, part)
+        pending.part = part
+        pending.updates += 1
+
+        # Final tool states (and an unbuffered coalescer) go out immediately
+        status = (part.get("state") or {}).get("status")
+        if status in ("completed", "error") or self.window <= 0:
+            await self._send(key)
+        else:
+            self._arm()
+
+    async def flush(self, session_id: str | None = None) -> None:
+        """Send pending updates now.
+
+        Args:
+            session_id: Only flush this session (None = everything)
+        """
+        for key in list(self._pending):
+            if session_id is None or key[1] == session_id:
+                await self._send(key)
+
+    def close(self) -> None:
+        """Drop the timer (pending updates are discarded)."""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        self._pending.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """How many updates were merged into how many broadcasts."""
+        return {
+            "window_ms": round(self.window * 1000),
+            "updates_received": self.updates_received,
+            "broadcasts_sent": self.broadcasts_sent,
+            "pending": len(self._pending),
+        }
+
+    def _arm(self) -> None:
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._flushing = asyncio.create_task(self.flush())
+
+    async def _send(self, key: tuple, is_complete: bool = False) -> None:
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        self.broadcasts_sent += 1
+
+        if isinstance(pending, _PendingChunk):
+            payload = {
+                "session_id": pending.session_id,
+                "message_id": pending.message_id,
+                "content_delta": "".join(pending.deltas),
+                "is_complete": is_complete,
+                "coalesced": pending.updates,
+            }
+            if pending.source_event:
+                payload["source_event"] = pending.source_event
+            await self.ws_manager.broadcast("opencode_message_chunk", payload)
+            return
+
+        part = pending.part
+        await self.ws_manager.broadcast(
+            "opencode_tool_updated",
+            {
+                "session_id": pending.session_id,
+                "message_id": pending.message_id,
+                "tool": part.get("tool"),
+                "status": (part.get("state", {}) or {}).get("status"),
+                "part": part,
+                "coalesced": pending.updates,
+            },
+        )
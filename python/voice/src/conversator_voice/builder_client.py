@@ -4,29 +4,57 @@ import httpx
 from pathlib import Path
 from typing import Any
 
+from .message_cache import CachedMessage, SessionMessageCache
+from .opencode_transport import OpenCodeTransport, get_transport
+
+# Builder requests may wait on large sessions; the pool's connect timeout still applies
+BUILDER_READ_TIMEOUT = 600.0
+# Session statuses after which the task's cached messages are released
+FINISHED_STATUSES = ("completed", "failed", "error")
+
 
 class OpenCodeBuilder:
     """Client for dispatching tasks to OpenCode builder instances."""
 
-    def __init__(self, name: str, base_url: str, model: str):
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        model: str,
+        transport: OpenCodeTransport | None = None,
+    ):
         """Initialize builder client.
 
         Args:
             name: Builder name (e.g., 'opencode-fast')
             base_url: Base URL for the builder (e.g., 'http://localhost:4096')
             model: Model identifier for this builder
+            transport: Pooled HTTP transport (default: shared one for base_url)
         """
         self.name = name
         self.base_url = base_url
         self.model = model
-        self.client = httpx.AsyncClient(timeout=600)
+        self.transport = transport or get_transport(base_url)
+        self.client = self.transport.client
+        self.timeout = httpx.Timeout(
+            BUILDER_READ_TIMEOUT, connect=self.transport.settings.connect_timeout
+        )
         self.active_sessions: dict[str, str] = {}  # task_id -> session_id
         self.plan_sessions: dict[str, str] = {}  # task_id -> session_id (for plan mode)
         self.task_directories: dict[str, str] = {}  # task_id -> directory
+        # Session messages already downloaded; reads only fetch the new tail
+        self.message_cache = SessionMessageCache()
 
     async def close(self) -> None:
-        """Close the HTTP client."""
-        await self.client.aclose()
+        """Forget tracked tasks and cached session messages.
+
+        The pooled transport is shared with other components and is closed
+        by close_transports() at shutdown.
+        """
+        self.active_sessions.clear()
+        self.plan_sessions.clear()
+        self.task_directories.clear()
+        self.message_cache = SessionMessageCache()
 
     async def health_check(self) -> bool:
         """Check if builder is responding.
@@ -35,7 +63,7 @@ class OpenCodeBuilder:
             True if builder is healthy, False otherwise
         """
         try:
-            response = await self.client.get(f"{self.base_url}/agent")
+            response = await self.client.get(f"{self.base_url}/agent", timeout=5.0)
             return response.status_code == 200
         except Exception:
             return False
@@ -76,6 +104,7 @@ All file operations should be relative to this directory.
             f"{self.base_url}/session",
             params=params,
             json={"title": f"Task: {task_id[:8]}"},
+            timeout=self.timeout,
         )
 
         if response.status_code not in (200, 201):
@@ -93,6 +122,7 @@ All file operations should be relative to this directory.
             f"{self.base_url}/session/{session_id}/prompt_async",
             params=params,
             json={"agent": "build", "parts": [{"type": "text", "text": prompt_content}]},
+            timeout=self.timeout,
         )
 
         if prompt_response.status_code not in (200, 201, 202, 204):
@@ -118,7 +148,9 @@ All file operations should be relative to this directory.
             return None
 
         try:
-            response = await self.client.get(f"{self.base_url}/session/status")
+            response = await self.client.get(
+                f"{self.base_url}/session/status", timeout=self.timeout
+            )
             if response.status_code != 200:
                 return None
 
@@ -127,6 +159,9 @@ All file operations should be relative to this directory.
             if isinstance(status, dict):
                 status_type = status.get("type")
                 if isinstance(status_type, str):
+                    if status_type in FINISHED_STATUSES:
+                        # The monitor stops polling finished tasks; later reads refetch
+                        self.message_cache.drop(session_id)
                     return status_type
         except Exception:
             pass
@@ -146,19 +181,41 @@ All file operations should be relative to this directory.
             return []
 
         try:
-            directory = self.task_directories.get(task_id)
-            params = {"directory": directory} if directory else None
+            messages = await self._refresh_messages(task_id, session_id)
+            return [message.to_raw() for message in messages]
+        except Exception:
+            pass
+        return []
+
+    async def _refresh_messages(self, task_id: str, session_id: str) -> list[CachedMessage]:
+        """Bring the cached messages of a session up to date.
+
+        Args:
+            task_id: Task identifier (selects the project directory)
+            session_id: Builder session ID
+
+        Returns:
+            All messages of the session, oldest first
 
+        Raises:
+            httpx.HTTPStatusError: If the server rejects the request
+        """
+        directory = self.task_directories.get(task_id)
+
+        async def fetch_page(limit: int | None) -> list[dict]:
+            params: dict[str, Any] = {"directory": directory} if directory else {}
+            if limit:
+                params["limit"] = limit
             # OpenCode server v1.1+: messages are listed at /session/:id/message
             response = await self.client.get(
                 f"{self.base_url}/session/{session_id}/message",
-                params=params,
+                params=params or None,
+                timeout=self.timeout,
             )
-            if response.status_code == 200:
-                return response.json()
-        except Exception:
-            pass
-        return []
+            response.raise_for_status()
+            return response.json()
+
+        return await self.message_cache.refresh(session_id, fetch_page) or []
 
     async def cancel_session(self, task_id: str) -> bool:
         """Cancel an active builder session.
@@ -181,11 +238,13 @@ All file operations should be relative to this directory.
             response = await self.client.post(
                 f"{self.base_url}/session/{session_id}/abort",
                 params=params,
+                timeout=self.timeout,
             )
             if response.status_code in (200, 204):
                 self.active_sessions.pop(task_id, None)
                 self.plan_sessions.pop(task_id, None)
                 self.task_directories.pop(task_id, None)
+                self.message_cache.drop(session_id)
                 return True
         except Exception:
             pass
@@ -229,6 +288,7 @@ All file operations should be relative to this directory.
             f"{self.base_url}/session",
             params=params,
             json={"title": f"Plan: {task_id[:8]}"},
+            timeout=self.timeout,
         )
 
         if response.status_code not in (200, 201):
@@ -246,6 +306,7 @@ All file operations should be relative to this directory.
             f"{self.base_url}/session/{session_id}/prompt_async",
             params=params,
             json={"agent": "plan", "parts": [{"type": "text", "text": prompt_content}]},
+            timeout=self.timeout,
         )
 
         if prompt_response.status_code not in (200, 201, 202, 204):
@@ -269,33 +330,18 @@ All file operations should be relative to this directory.
             return {"error": "No session found"}
 
         try:
-            directory = self.task_directories.get(task_id)
-            params = {"directory": directory} if directory else None
-
-            # OpenCode server v1.1+: messages are listed at /session/:id/message
-            response = await self.client.get(
-                f"{self.base_url}/session/{session_id}/message",
-                params=params,
-            )
-            if response.status_code != 200:
-                return {"error": f"Failed to get messages: {response.status_code}"}
-
-            messages = response.json()
+            try:
+                messages = await self._refresh_messages(task_id, session_id)
+            except httpx.HTTPStatusError as e:
+                return {"error": f"Failed to get messages: {e.response.status_code}"}
 
             # Find the latest assistant response and extract its text parts.
             plan_content = ""
-            for msg in messages:
-                info = msg.get("info", msg)
-                if info.get("role") != "assistant":
-                    continue
-
-                parts = msg.get("parts", [])
-                content = ""
-                for part in parts:
-                    if isinstance(part, dict) and part.get("type") == "text":
-                        content += part.get("text", "")
+            for msg in reversed(messages):
+                content = msg.text() if msg.role == "assistant" else ""
                 if content:
                     plan_content = content
+                    break
 
             if plan_content:
                 return {
@@ -341,6 +387,7 @@ All file operations should be relative to this directory.
                     "agent": chosen_agent,
                     "parts": [{"type": "text", "text": message}],
                 },
+                timeout=self.timeout,
             )
             if response.status_code != 200:
                 return {
@@ -394,6 +441,7 @@ All file operations should be relative to this directory.
                 f"{self.base_url}/session/{session_id}/prompt_async",
                 params=params,
                 json={"agent": "build", "parts": [{"type": "text", "text": approval_msg}]},
+                timeout=self.timeout,
             )
 
 
@@ -403,9 +451,10 @@ All file operations should be relative to this directory.
                     "error": f"Failed to send approval: {response.status_code}",
                 }
 
-            # Move from plan_sessions to active_sessions
+            # Move from plan_sessions to active_sessions; the plan transcript is done with
             self.active_sessions[task_id] = session_id
             del self.plan_sessions[task_id]
+            self.message_cache.drop(session_id)
 
             return {"building": True, "session_id": session_id}
 
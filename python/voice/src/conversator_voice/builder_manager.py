@@ -14,7 +14,7 @@ import sys
 from pathlib import Path
 from typing import Optional
 
-import httpx
+from .opencode_transport import OpenCodeTransport, get_transport
 
 logger = logging.getLogger(__name__)
 
@@ -29,12 +29,18 @@ class BuilderManager:
     - Clean shutdown when switching projects or exiting
     """
 
-    def __init__(self, port: int = 4096, start_timeout: float = 30.0):
+    def __init__(
+        self,
+        port: int = 4096,
+        start_timeout: float = 30.0,
+        transport: OpenCodeTransport | None = None,
+    ):
         """Initialize builder manager.
 
         Args:
             port: Port for OpenCode HTTP server
             start_timeout: Timeout in seconds for OpenCode to become healthy
+            transport: Pooled HTTP transport (default: shared one for the port)
         """
         self.port = port
         self.start_timeout = start_timeout
@@ -42,6 +48,7 @@ class BuilderManager:
         self.process: Optional[subprocess.Popen] = None
         self._started_by_us = False
         self._base_url = f"http://localhost:{port}"
+        self.transport = transport or get_transport(self._base_url)
 
     async def start(self, project_dir: str) -> bool:
         """Start OpenCode builder in the specified project directory.
@@ -170,9 +177,8 @@ class BuilderManager:
             True if healthy
         """
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self._base_url}/agent")
-                return response.status_code == 200
+            response = await self.transport.client.get(f"{self._base_url}/agent", timeout=5.0)
+            return response.status_code == 200
         except Exception:
             return False
 
@@ -0,0 +1,230 @@
+"""Push-based feed of committed task events.
+
+The state store publishes every committed batch of events from its
+writer thread, in event_id order. Each subscriber owns a bounded asyncio
+queue on its own event loop. A subscriber that falls behind never blocks
+the writer: when its queue overflows, the queued events are dropped and
+it catches up by paging the event log from its last delivered event_id.
+The same path serves resumption, so a client that reconnects with a
+`last_event_id` sees every event it missed exactly once.
+"""
+
+import asyncio
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Iterable
+
+from .models import EventType, TaskEvent
+
+if TYPE_CHECKING:
+    from .state import StateStore
+
+# Events fetched per query while a subscriber catches up from the log
+BACKFILL_PAGE_SIZE = 200
+
+
+class Subscription:
+    """One consumer's view of the change feed.
+
+    Use as an async iterator, ideally inside `async with` so the
+    subscription is removed when the consumer stops.
+    """
+
+    def __init__(
+        self,
+        feed: "ChangeFeed",
+        loop: asyncio.AbstractEventLoop,
+        last_event_id: int | None,
+        task_id: str | None,
+        event_types: Iterable[EventType] | None,
+        queue_size: int
+    ):
+        """Initialize the subscription.
+
+        Args:
+            feed: Feed this subscription belongs to
+            loop: Event loop the consumer runs on
+            last_event_id: Resume after this event (None = live events only)
+            task_id: Only deliver events for this task
+            event_types: Only deliver these event types
+            queue_size: Maximum live events buffered before catching up
+        """
+        self._feed = feed
+        self._loop = loop
+        self.task_id = task_id
+        self.event_types = frozenset(event_types) if event_types else None
+        # Live-only subscribers start from the feed's published position so
+        # an overflow never pages the log from the beginning
+        self.last_event_id = (
+            feed.last_event_id if last_event_id is None else last_event_id
+        )
+        self.overflows = 0
+        self._queue: asyncio.Queue[TaskEvent | None] = asyncio.Queue(maxsize=queue_size)
+        self._backlog: deque[TaskEvent] = deque()
+        self._catching_up = last_event_id is not None
+        self._closed = False
+
+    def matches(self, event: TaskEvent) -> bool:
+        """Check whether an event passes this subscription's filters."""
+        if self.task_id and event.task_id != self.task_id:
+            return False
+        return self.event_types is None or event.type in self.event_types
+
+    def _offer(self, events: list[TaskEvent]) -> None:
+        """Queue published events (runs on the subscriber's loop)."""
+        if self._closed:
+            return
+        for event in events:
+            if not self.matches(event):
+                continue
+            try:
+                self._queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Drop the buffer; get() will page the log from last_event_id
+                self.overflows += 1
+                self._catching_up = True
+                self._drain()
+                return
+
+    def _drain(self) -> None:
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    async def _backfill(self) -> None:
+        """Load the next page of missed events from the event log."""
+        overflows = self.overflows
+        page = await self._feed.store.aio.get_events(
+            task_id=self.task_id,
+            after_id=self.last_event_id,
+            limit=BACKFILL_PAGE_SIZE
+        )
+        if len(page) < BACKFILL_PAGE_SIZE and overflows == self.overflows:
+            # Anything newer than this page is (or will be) in the live queue
+            self._catching_up = False
+        if page:
+            self.last_event_id = page[-1].event_id
+        self._backlog.extend(event for event in page if self.matches(event))
+
+    async def get(self) -> TaskEvent:
+        """Wait for the next event.
+
+        Returns:
+            The next committed event, in event_id order
+
+        Raises:
+            StopAsyncIteration: If the subscription was closed
+        """
+        while True:
+            if self._backlog:
+                return self._backlog.popleft()
+            if self._closed:
+                raise StopAsyncIteration
+            if self._catching_up:
+                await self._backfill()
+                continue
+
+            event = await self._queue.get()
+            if event is None:
+                raise StopAsyncIteration
+            # Live events overlapping a backfill page were already delivered
+            if event.event_id <= self.last_event_id:
+                continue
+            self.last_event_id = event.event_id
+            return event
+
+    def close(self) -> None:
+        """Stop the subscription and wake a waiting consumer."""
+        if self._closed:
+            return
+        self._closed = True
+        self._feed._remove(self)
+        self._drain()
+        self._queue.put_nowait(None)
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> TaskEvent:
+        return await self.get()
+
+    async def __aenter__(self) -> "Subscription":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ChangeFeed:
+    """Fan-out of committed events to asyncio subscribers."""
+
+    def __init__(self, store: "StateStore", queue_size: int = 256):
+        """Initialize the feed.
+
+        Args:
+            store: State store the feed reads missed events from
+            queue_size: Default per-subscriber live queue bound
+        """
+        self.store = store
+        self.queue_size = queue_size
+        # Highest event_id published so far (set by the store at startup)
+        self.last_event_id = 0
+        self._subscriptions: list[Subscription] = []
+        self._lock = threading.Lock()
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of open subscriptions."""
+        return len(self._subscriptions)
+
+    def subscribe(
+        self,
+        last_event_id: int | None = None,
+        task_id: str | None = None,
+        event_types: Iterable[EventType] | None = None,
+        queue_size: int | None = None
+    ) -> Subscription:
+        """Subscribe the running event loop to committed events.
+
+        Args:
+            last_event_id: Resume after this event ID; events already in the
+                           log are replayed first (None = live events only)
+            task_id: Only deliver events for this task
+            event_types: Only deliver these event types
+            queue_size: Override the live queue bound for this subscriber
+
+        Returns:
+            Subscription to iterate
+        """
+        subscription = Subscription(
+            self,
+            asyncio.get_running_loop(),
+            last_event_id,
+            task_id,
+            event_types,
+            queue_size or self.queue_size
+        )
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def _remove(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def publish(self, events: list[TaskEvent]) -> None:
+        """Hand committed events to every subscriber (called by the writer).
+
+        Args:
+            events: Newly committed events in event_id order
+        """
+        if events:
+            self.last_event_id = events[-1].event_id
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription._loop.call_soon_threadsafe(subscription._offer, events)
+            except RuntimeError:
+                # Subscriber's loop is closed
+                self._remove(subscription)
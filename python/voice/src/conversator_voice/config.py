@@ -7,6 +7,13 @@ from typing import Any
 import yaml
 
 
+def _yaml_setting(value: Any) -> str:
+    """Normalize an enum-like setting; YAML 1.1 reads a bare `off` as False."""
+    if value is False:
+        return "off"
+    return str(value).lower()
+
+
 @dataclass
 class BuilderConfig:
     """Builder agent configuration."""
@@ -44,6 +51,43 @@ class ConversatorConfig:
     # Voice config
     voice_system_prompt: str = ".conversator/prompts/conversator.md"
     voice_speech_threshold: float = 1500.0  # RMS threshold for local speech detection
+    voice_generating_factor: float = 3.0  # Speech threshold multiplier while the model talks
+    voice_interrupt_threshold: float = 10000.0  # RMS to count as barge-in during playback
+
+    # Local voice activity detection (end-of-turn signalling)
+    vad_engine: str = "energy"  # energy | webrtc (requires the optional "vad" extra)
+    vad_min_speech_ms: float = 100.0
+    vad_end_of_speech_ms: float = 500.0
+    vad_pre_roll_ms: float = 300.0
+    vad_margin_db: float = 6.0
+    vad_webrtc_aggressiveness: int = 2
+
+    # Upstream audio gating (see upstream_gate.py)
+    uplink_gating: str = "off"  # off | speech
+    uplink_keepalive_ms: float = 2000.0
+
+    # State store config (SQLite group commit)
+    state_journal_mode: str = "wal"
+    state_synchronous: str = "normal"
+    state_commit_window_ms: float = 0.0  # Extra wait to coalesce writes per commit
+    state_payload_encoding: str = "json"  # json | compact (interned types, binary payloads)
+
+    # Shared HTTP connection pool for OpenCode servers and builders
+    opencode_http_max_connections: int = 20
+    opencode_http_max_keepalive: int = 10
+    opencode_http_keepalive_expiry: float = 30.0
+    opencode_http_connect_timeout: float = 5.0
+    opencode_http_read_timeout: float = 30.0
+    opencode_http2: bool = False  # Requires the optional "http2" extra (h2)
+
+    # In-memory OpenCode session/message store (SSE listener)
+    sessions_max: int = 200
+    sessions_max_idle_seconds: float = 6 * 3600
+    sessions_max_part_bytes: int = 64 * 1024 * 1024
+    sessions_spill_dir: str | None = None  # Spill evicted sessions here (None = discard)
+
+    # Dashboard broadcasts of streaming OpenCode updates
+    dashboard_coalesce_window_ms: float = 50.0  # Merge part updates this long (0 = off)
 
     # OpenCode orchestration config (Layer 2)
     # Auto-start is now smart - does proper setup like scripts/start-conversator.sh
@@ -85,6 +129,24 @@ class ConversatorConfig:
         voice_system_prompt = voice_data.get("system_prompt", ".conversator/prompts/conversator.md")
         voice_speech_threshold = float(voice_data.get("speech_threshold", 1500.0))
 
+        # Parse voice activity detection config
+        vad_data = data.get("vad", {})
+
+        # Parse upstream audio gating config
+        uplink_data = data.get("uplink", {})
+
+        # Parse state store config
+        state_data = data.get("state", {})
+
+        # Parse shared HTTP pool config
+        http_data = data.get("http", {})
+
+        # Parse in-memory session store config
+        sessions_data = data.get("sessions", {})
+
+        # Parse dashboard broadcast config
+        dashboard_data = data.get("dashboard", {})
+
         # Parse OpenCode orchestration config from conversator section
         conversator_data = data.get("conversator", {})
 
@@ -95,6 +157,31 @@ class ConversatorConfig:
             builders=builders,
             voice_system_prompt=voice_system_prompt,
             voice_speech_threshold=voice_speech_threshold,
+            voice_generating_factor=float(voice_data.get("generating_factor", 3.0)),
+            voice_interrupt_threshold=float(voice_data.get("interrupt_threshold", 10000.0)),
+            vad_engine=vad_data.get("engine", "energy"),
+            vad_min_speech_ms=float(vad_data.get("min_speech_ms", 100.0)),
+            vad_end_of_speech_ms=float(vad_data.get("end_of_speech_ms", 500.0)),
+            vad_pre_roll_ms=float(vad_data.get("pre_roll_ms", 300.0)),
+            vad_margin_db=float(vad_data.get("margin_db", 6.0)),
+            vad_webrtc_aggressiveness=int(vad_data.get("webrtc_aggressiveness", 2)),
+            uplink_gating=_yaml_setting(uplink_data.get("gating", "off")),
+            uplink_keepalive_ms=float(uplink_data.get("keepalive_ms", 2000.0)),
+            state_journal_mode=state_data.get("journal_mode", "wal"),
+            state_synchronous=_yaml_setting(state_data.get("synchronous", "normal")),
+            state_commit_window_ms=float(state_data.get("commit_window_ms", 0.0)),
+            state_payload_encoding=state_data.get("payload_encoding", "json"),
+            opencode_http_max_connections=int(http_data.get("max_connections", 20)),
+            opencode_http_max_keepalive=int(http_data.get("max_keepalive_connections", 10)),
+            opencode_http_keepalive_expiry=float(http_data.get("keepalive_expiry", 30.0)),
+            opencode_http_connect_timeout=float(http_data.get("connect_timeout", 5.0)),
+            opencode_http_read_timeout=float(http_data.get("read_timeout", 30.0)),
+            opencode_http2=bool(http_data.get("http2", False)),
+            sessions_max=int(sessions_data.get("max_sessions", 200)),
+            sessions_max_idle_seconds=float(sessions_data.get("max_idle_seconds", 6 * 3600)),
+            sessions_max_part_bytes=int(sessions_data.get("max_part_mb", 64)) * 1024 * 1024,
+            sessions_spill_dir=sessions_data.get("spill_dir"),
+            dashboard_coalesce_window_ms=float(dashboard_data.get("coalesce_window_ms", 50.0)),
             # OpenCode settings from conversator section
             opencode_auto_start=conversator_data.get("auto_start", False),
             opencode_port=conversator_data.get("port", 4158),
@@ -1,6 +1,11 @@
 """Events and conversation log API endpoints."""
 
+import asyncio
+import json
+from datetime import datetime, timedelta
+
 from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
 from typing import Optional
 
 router = APIRouter()
@@ -26,10 +31,7 @@ async def get_recent_events(
     if not state:
         return {"events": [], "latest_id": after_id, "error": "State store not available"}
 
-    events = state.get_events(after_id=after_id)
-
-    # Limit results
-    events = events[:limit]
+    events = await state.aio.get_events(after_id=after_id, limit=limit)
 
     latest_id = events[-1].event_id if events and hasattr(events[-1], 'event_id') else after_id
 
@@ -40,6 +42,87 @@ async def get_recent_events(
     }
 
 
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    last_event_id: Optional[int] = None,
+    task_id: Optional[str] = None,
+    types: Optional[str] = None
+):
+    """Stream committed task events as Server-Sent Events.
+
+    Clients resume after a disconnect with `last_event_id` or the standard
+    Last-Event-ID header; missed events are replayed from the log first.
+
+    Args:
+        last_event_id: Resume after this event ID (default: live events only)
+        task_id: Only stream events for this task
+        types: Comma-separated event types to stream
+
+    Returns:
+        text/event-stream response of task_event messages
+    """
+    state = request.app.state.state_store
+
+    if not state:
+        return {"error": "State store not available"}
+
+    header_id = request.headers.get("last-event-id")
+    if last_event_id is None and header_id and header_id.isdigit():
+        last_event_id = int(header_id)
+
+    subscription = state.changes.subscribe(
+        last_event_id=last_event_id,
+        task_id=task_id,
+        event_types=types.split(",") if types else None
+    )
+
+    async def generate():
+        async with subscription:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscription.get(), timeout=15.0)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                except StopAsyncIteration:
+                    return
+                data = json.dumps(event.to_dict())
+                yield f"id: {event.event_id}\nevent: task_event\ndata: {data}\n\n"
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+@router.get("/hourly")
+async def get_hourly_event_counts(
+    request: Request,
+    hours: int = 24,
+    event_type: Optional[str] = None
+):
+    """Get task event counts per type per hour.
+
+    Args:
+        hours: How many hours back to count
+        event_type: Only count this event type
+
+    Returns:
+        Hourly buckets of event counts by type
+    """
+    state = request.app.state.state_store
+
+    if not state:
+        return {"buckets": [], "error": "State store not available"}
+
+    since = datetime.utcnow() - timedelta(hours=hours)
+    buckets = await state.aio.count_events_by_hour(since=since, event_type=event_type)
+
+    return {"buckets": buckets, "hours": hours}
+
+
 @router.get("/conversation")
 async def get_conversation_log(
     request: Request,
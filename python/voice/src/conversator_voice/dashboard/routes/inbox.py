@@ -34,13 +34,13 @@ async def get_inbox(
     if not state:
         return {"items": [], "unread_count": 0, "total": 0, "error": "State store not available"}
 
-    items = state.get_inbox(
+    items = await state.aio.get_inbox(
         unread_only=unread_only,
         severity=severity,
         limit=limit
     )
 
-    unread_count = len(state.get_inbox(unread_only=True))
+    unread_count = sum((await state.aio.count_inbox_by_severity(unread_only=True)).values())
 
     return {
         "items": [i.to_dict() if hasattr(i, 'to_dict') else i for i in items],
@@ -61,8 +61,8 @@ async def get_unread_count(request: Request):
     if not state:
         return {"count": 0, "error": "State store not available"}
 
-    items = state.get_inbox(unread_only=True)
-    return {"count": len(items)}
+    counts = await state.aio.count_inbox_by_severity(unread_only=True)
+    return {"count": sum(counts.values())}
 
 
 @router.post("/acknowledge")
@@ -83,10 +83,10 @@ async def acknowledge(request: Request, body: AcknowledgeRequest):
     if body.inbox_ids:
         count = 0
         for inbox_id in body.inbox_ids:
-            state.acknowledge_inbox(inbox_id)
+            await state.aio.acknowledge_inbox(inbox_id)
             count += 1
     else:
-        count = state.acknowledge_all_inbox()
+        count = await state.aio.acknowledge_all_inbox()
 
     return {"acknowledged": count}
 
@@ -107,7 +107,7 @@ async def get_inbox_item(request: Request, inbox_id: str):
         return {"error": "State store not available"}
 
     # Get all items and find the one we want
-    items = state.get_inbox()
+    items = await state.aio.get_inbox()
     for item in items:
         item_dict = item.to_dict() if hasattr(item, 'to_dict') else item
         if item_dict.get("inbox_id") == inbox_id:
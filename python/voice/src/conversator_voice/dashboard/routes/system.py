@@ -2,6 +2,8 @@
 
 from fastapi import APIRouter, Request
 
+from ...opencode_transport import transport_stats
+
 router = APIRouter()
 
 
@@ -33,6 +35,8 @@ async def health_check(request: Request):
                 "managed": opencode_manager.is_managed if opencode_manager else False,
                 "running": opencode_manager.is_running if opencode_manager else False,
             }
+            if hasattr(opencode_client, "health"):
+                components["opencode_orchestration"]["health"] = opencode_client.health.to_dict()
             if not healthy:
                 overall_status = "degraded"
         except Exception as e:
@@ -61,7 +65,7 @@ async def health_check(request: Request):
     if state:
         try:
             # Try a simple query to verify DB is working
-            state.get_active_tasks()
+            await state.aio.get_active_tasks()
             components["state_store"] = {
                 "status": "healthy",
                 "path": str(state.db_path) if hasattr(state, 'db_path') else "unknown"
@@ -166,36 +170,40 @@ async def get_stats(request: Request):
     stats = {}
 
     if state:
-        # Task stats
-        all_tasks = state.get_tasks(limit=1000)
-        active_tasks = state.get_active_tasks()
-
-        status_counts = {}
-        for task in all_tasks:
-            status = task.status if hasattr(task, 'status') else "unknown"
-            status_counts[status] = status_counts.get(status, 0) + 1
+        # Task stats (aggregated in SQL)
+        status_counts = await state.aio.count_tasks_by_status()
+        terminal = ("done", "failed", "canceled")
 
         stats["tasks"] = {
-            "total": len(all_tasks),
-            "active": len(active_tasks),
+            "total": sum(status_counts.values()),
+            "active": sum(n for s, n in status_counts.items() if s not in terminal),
             "by_status": status_counts
         }
 
         # Inbox stats
-        all_inbox = state.get_inbox()
-        unread_inbox = state.get_inbox(unread_only=True)
-
-        severity_counts = {}
-        for item in all_inbox:
-            severity = item.severity if hasattr(item, 'severity') else "unknown"
-            severity_counts[severity] = severity_counts.get(severity, 0) + 1
+        severity_counts = await state.aio.count_inbox_by_severity()
+        unread_counts = await state.aio.count_inbox_by_severity(unread_only=True)
 
         stats["inbox"] = {
-            "total": len(all_inbox),
-            "unread": len(unread_inbox),
+            "total": sum(severity_counts.values()),
+            "unread": sum(unread_counts.values()),
             "by_severity": severity_counts
         }
 
+        # Group-commit stats for tuning the writer
+        if hasattr(state, "commit_stats"):
+            stats["state_store"] = state.commit_stats
+        if hasattr(state, "cache_stats"):
+            stats["state_cache"] = state.cache_stats
+
+    # Per-endpoint latency of the shared OpenCode connection pools
+    stats["opencode_http"] = transport_stats()
+
+    # Microphone audio sent to Gemini vs. dropped by upstream gating
+    conversator_session = request.app.state.conversator_session
+    if conversator_session and hasattr(conversator_session, "audio_gate"):
+        stats["audio_uplink"] = conversator_session.audio_gate.stats()
+
     if logger:
         # Conversation stats
         entries = logger.get_entries(limit=1000)
@@ -217,7 +225,8 @@ async def websocket_status(request: Request):
 
     return {
         "active_connections": ws_manager.connection_count if ws_manager else 0,
-        "endpoint": "/ws/events"
+        "endpoint": "/ws/events",
+        "clients": ws_manager.client_stats() if ws_manager else [],
     }
 
 
@@ -248,8 +257,8 @@ async def get_event_timeline(
     # Get task events from state store
     if state:
         try:
-            events = state.get_events(after_id=after_id)
-            for event in events[:limit]:
+            events = await state.aio.get_events(after_id=after_id, limit=limit)
+            for event in events:
                 timeline.append({
                     "id": f"task-{event.event_id}",
                     "timestamp": event.time.isoformat(),
@@ -27,9 +27,9 @@ async def list_tasks(
         return {"tasks": [], "total": 0, "error": "State store not available"}
 
     if status:
-        tasks = state.get_tasks(status=status, limit=limit)
+        tasks = await state.aio.get_tasks(status=status, limit=limit)
     else:
-        tasks = state.get_tasks(limit=limit)
+        tasks = await state.aio.get_tasks(limit=limit)
 
     return {
         "tasks": [t.to_dict() if hasattr(t, 'to_dict') else t for t in tasks],
@@ -49,7 +49,7 @@ async def get_active_tasks(request: Request):
     if not state:
         return {"tasks": [], "count": 0, "error": "State store not available"}
 
-    tasks = state.get_active_tasks()
+    tasks = await state.aio.get_active_tasks()
 
     return {
         "tasks": [t.to_dict() if hasattr(t, 'to_dict') else t for t in tasks],
@@ -72,13 +72,13 @@ async def get_task(request: Request, task_id: str):
     if not state:
         return {"error": "State store not available"}
 
-    task = state.get_task(task_id)
+    task = await state.aio.get_task(task_id)
 
     if not task:
         return {"error": "Task not found", "task_id": task_id}
 
     # Also get events for this task
-    events = state.get_events(task_id=task_id)
+    events = await state.aio.get_events(task_id=task_id, include_archived=True)
 
     return {
         "task": task.to_dict() if hasattr(task, 'to_dict') else task,
@@ -108,10 +108,9 @@ async def get_task_events(
     if not state:
         return {"events": [], "error": "State store not available"}
 
-    events = state.get_events(task_id=task_id, after_id=after_id)
-
-    # Apply limit
-    events = events[:limit]
+    events = await state.aio.get_events(
+        task_id=task_id, after_id=after_id, include_archived=True, limit=limit
+    )
 
     return {
         "events": [e.to_dict() if hasattr(e, 'to_dict') else e for e in events],
@@ -1,5 +1,7 @@
 """Dashboard FastAPI server integrated with Conversator voice app."""
 
+import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -75,26 +77,35 @@ def create_dashboard_app(
 
     app.state.logger.add_listener(broadcast_entry)
 
-    # Wire up state store to broadcast task events
-    if state:
-        import asyncio
-
-        def broadcast_task_event(event):
-            """Broadcast task events via WebSocket."""
-            try:
-                asyncio.create_task(
-                    app.state.ws_manager.broadcast("task_event", {
+    # Relay committed task events from the state store's change feed
+    async def relay_task_events():
+        """Broadcast task events via WebSocket, in commit order."""
+        async with state.changes.subscribe() as subscription:
+            async for event in subscription:
+                try:
+                    await app.state.ws_manager.broadcast("task_event", {
                         "event_id": event.event_id,
                         "type": event.type,
                         "task_id": event.task_id,
                         "timestamp": event.time.isoformat(),
                         "payload": event.payload
                     })
-                )
-            except Exception:
+                except Exception as e:
+                    print(f"[Dashboard] Task event broadcast failed: {e}")
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        relay = asyncio.create_task(relay_task_events()) if state else None
+        yield
+        await app.state.ws_manager.close()
+        if relay:
+            relay.cancel()
+            try:
+                await relay
+            except asyncio.CancelledError:
                 pass
 
-        state.add_event_listener(broadcast_task_event)
+    app.router.lifespan_context = lifespan
 
     # Import and include routers
     from .routes import tasks, inbox, builders, events, system
@@ -112,9 +123,9 @@ def create_dashboard_app(
         await app.state.ws_manager.connect(websocket)
         try:
             while True:
-                # Keep connection alive, receive any client messages
+                # Keep connection alive; clients send topic/session subscriptions
                 data = await websocket.receive_text()
-                # Could handle client messages here (e.g., subscriptions)
+                await app.state.ws_manager.handle_client_message(websocket, data)
         except WebSocketDisconnect:
             app.state.ws_manager.disconnect(websocket)
 
@@ -157,6 +168,7 @@ def create_dashboard_app(
                 <li><a href="/docs">/docs</a> - OpenAPI documentation</li>
             </ul>
             <p>WebSocket: <code>ws://localhost:8080/ws/events</code></p>
+            <p>Task event stream (SSE, resumable): <code>/api/events/stream</code></p>
             <h2>To build the frontend:</h2>
             <pre>cd dashboard-ui && npm install && npm run build</pre>
         </body>
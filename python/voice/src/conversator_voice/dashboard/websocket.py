@@ -1,18 +1,172 @@
-"""WebSocket connection manager for real-time dashboard updates."""
+"""WebSocket connection manager for real-time dashboard updates.
 
+Each connection gets its own bounded outbound queue drained by its own
+writer task. broadcast() serializes an event once and only enqueues it, so
+a slow or stalled browser tab never delays other clients or the SSE
+handler that produced the event. When a client falls a full queue behind,
+its backlog is dropped and replaced by a single "resync" event telling it
+to reload state over the REST API. Each event is encoded once per wire
+format in use (see ws_protocol), not once per client.
+
+Clients choose what they receive by sending subscription messages:
+
+    {"action": "subscribe", "topics": ["tasks", "inbox"], "sessions": ["ses_1"]}
+    {"action": "unsubscribe", "topics": ["messages"]}
+    {"action": "subscribe_all"}
+
+A client that never subscribes receives every topic. Session IDs narrow
+events that carry a session_id (OpenCode sessions and message parts) to
+the sessions being viewed. Events are filtered before serialization, so an
+event nobody wants is never encoded.
+"""
+
+import asyncio
 import json
+import time
+from collections import deque
 from datetime import datetime, UTC
 from typing import Any
 
 from fastapi import WebSocket
 
+from .ws_protocol import JSON_TEXT, WireFormat, negotiate
+
+# Messages buffered per client before it is considered too slow and resynced
+OUTBOUND_QUEUE_SIZE = 512
+
+# Topic of each event type; unlisted types are their own topic
+EVENT_TOPICS = {
+    "conversation_entry": "conversation",
+    "gemini_transcript": "conversation",
+    "activity": "conversation",
+    "task_update": "tasks",
+    "task_event": "tasks",
+    "inbox_item": "inbox",
+    "builder_status": "builders",
+    "system_health": "system",
+    "source_registered": "sessions",
+    "source_deregistered": "sessions",
+    "opencode_session_created": "sessions",
+    "opencode_session_updated": "sessions",
+    "opencode_permission_updated": "sessions",
+    "opencode_message_chunk": "messages",
+    "opencode_tool_updated": "messages",
+}
+
+# Always delivered, whatever a client subscribed to
+_CONTROL_EVENTS = {"resync", "subscribed"}
+
+
+def event_topic(event_type: str) -> str:
+    """Topic a broadcast event type belongs to."""
+    return EVENT_TOPICS.get(event_type, event_type)
+
+
+class _Client:
+    """Outbound queue, writer task and lag counters for one connection."""
+
+    def __init__(self, websocket: WebSocket, max_queue: int, wire: WireFormat = JSON_TEXT):
+        self.websocket = websocket
+        self.wire = wire
+        # Bounded by the manager; enqueued_at holds each pending message's enqueue time, in order
+        self.queue: asyncio.Queue[str | bytes] = asyncio.Queue(maxsize=max_queue)
+        self.enqueued_at: deque[float] = deque()
+        self.writer: asyncio.Task | None = None
+        # None = everything (clients that never subscribe keep the old behaviour)
+        self.topics: set[str] | None = None
+        self.sessions: set[str] | None = None
+        self.filtered = 0
+        self.connected_at = time.time()
+        self.sent = 0
+        self.bytes_sent = 0
+        self.dropped = 0
+        self.resyncs = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def wants(self, event_type: str, topic: str, session_id: str | None) -> bool:
+        """Whether this client subscribed to an event."""
+        if event_type in _CONTROL_EVENTS:
+            return True
+        if self.topics is not None and topic not in self.topics:
+            return False
+        if session_id and self.sessions is not None and session_id not in self.sessions:
+            return False
+        return True
+
+    def enqueue(self, message: str | bytes) -> bool:
+        """Queue a message; resync instead if the client is too far behind.
+
+        Returns:
+            False if the backlog was dropped
+        """
+        try:
+            self.queue.put_nowait(message)
+            self.enqueued_at.append(time.monotonic())
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.enqueued_at.clear()
+        self.resyncs += 1
+        resync = self.wire.encode("resync", {"dropped": self.dropped}, datetime.now(UTC))
+        self.queue.put_nowait(resync)
+        self.enqueued_at.append(time.monotonic())
+        return False
+
+    def stats(self) -> dict[str, Any]:
+        oldest = self.enqueued_at[0] if self.enqueued_at else None
+        return {
+            "client": _describe(self.websocket),
+            "protocol": self.wire.name,
+            "connected_at": datetime.fromtimestamp(self.connected_at, UTC).isoformat(),
+            "queue_depth": self.queue.qsize(),
+            "queue_age_ms": round((time.monotonic() - oldest) * 1000, 1) if oldest else 0.0,
+            "last_lag_ms": round(self.last_lag * 1000, 1),
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "sent": self.sent,
+            "bytes_sent": self.bytes_sent,
+            "dropped": self.dropped,
+            "resyncs": self.resyncs,
+            "filtered": self.filtered,
+            "topics": sorted(self.topics) if self.topics is not None else None,
+            "sessions": sorted(self.sessions) if self.sessions is not None else None,
+        }
+
+
+def _all_topics() -> set[str]:
+    return set(EVENT_TOPICS.values())
+
+
+def _is_name_list(value: Any) -> bool:
+    """Whether a subscription field is absent or a list of strings."""
+    return value is None or (isinstance(value, list) and all(isinstance(v, str) for v in value))
+
+
+def _describe(websocket: WebSocket) -> str:
+    client = getattr(websocket, "client", None)
+    return f"{client.host}:{client.port}" if client else "unknown"
+
 
 class ConnectionManager:
     """Manages WebSocket connections and broadcasts events to clients."""
 
-    def __init__(self):
-        """Initialize the connection manager."""
-        self.active_connections: list[WebSocket] = []
+    def __init__(self, max_queue: int = OUTBOUND_QUEUE_SIZE):
+        """Initialize the connection manager.
+
+        Args:
+            max_queue: Messages buffered per client before it is resynced
+        """
+        self.max_queue = max_queue
+        self._clients: dict[WebSocket, _Client] = {}
+
+    @property
+    def active_connections(self) -> list[WebSocket]:
+        """Currently tracked connections."""
+        return list(self._clients)
 
     async def connect(self, websocket: WebSocket) -> None:
         """Accept and track a new WebSocket connection.
@@ -20,8 +174,12 @@ class ConnectionManager:
         Args:
             websocket: The WebSocket connection to accept
         """
-        await websocket.accept()
-        self.active_connections.append(websocket)
+        offered = websocket.scope.get("subprotocols") or []
+        wire, subprotocol = negotiate(offered)
+        await websocket.accept(subprotocol=subprotocol)
+        client = _Client(websocket, self.max_queue, wire)
+        client.writer = asyncio.create_task(self._write_loop(client))
+        self._clients[websocket] = client
 
     def disconnect(self, websocket: WebSocket) -> None:
         """Remove a WebSocket connection from tracking.
@@ -29,43 +187,74 @@ class ConnectionManager:
         Args:
             websocket: The WebSocket connection to remove
         """
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        client = self._clients.pop(websocket, None)
+        if client and client.writer and client.writer is not asyncio.current_task():
+            client.writer.cancel()
+
+    async def close(self) -> None:
+        """Stop all writer tasks (pending messages are discarded)."""
+        writers = [client.writer for client in self._clients.values() if client.writer]
+        self._clients.clear()
+        for writer in writers:
+            writer.cancel()
+        await asyncio.gather(*writers, return_exceptions=True)
 
     @property
     def connection_count(self) -> int:
         """Get the number of active connections."""
-        return len(self.active_connections)
+        return len(self._clients)
+
+    def client_stats(self) -> list[dict[str, Any]]:
+        """Queue depth, lag and drop counters for each connection."""
+        return [client.stats() for client in self._clients.values()]
+
+    async def _write_loop(self, client: _Client) -> None:
+        """Drain one client's queue; a failed send drops the connection."""
+        while True:
+            message = await client.queue.get()
+            enqueued_at = client.enqueued_at.popleft()
+            try:
+                if isinstance(message, bytes):
+                    await client.websocket.send_bytes(message)
+                else:
+                    await client.websocket.send_text(message)
+            except Exception:
+                # Connection closed or failed
+                self.disconnect(client.websocket)
+                return
+            client.sent += 1
+            client.bytes_sent += len(message)
+            client.last_lag = time.monotonic() - enqueued_at
+            client.max_lag = max(client.max_lag, client.last_lag)
 
     async def broadcast(self, event_type: str, data: dict[str, Any]) -> None:
         """Broadcast an event to all connected clients.
 
+        Only enqueues; each client's writer task does the sending.
+
         Args:
             event_type: Type of event (e.g., 'conversation_entry', 'task_update')
             data: Event payload data
         """
-        if not self.active_connections:
+        if not self._clients:
             return
 
-        message = json.dumps({
-            "type": event_type,
-            "data": data,
-            "timestamp": datetime.now(UTC).isoformat()
-        })
-
-        # Track connections to remove (failed sends)
-        dead_connections = []
-
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except Exception:
-                # Connection closed or failed
-                dead_connections.append(connection)
-
-        # Clean up dead connections
-        for conn in dead_connections:
-            self.disconnect(conn)
+        topic = event_topic(event_type)
+        session_id = data.get("session_id") if isinstance(data, dict) else None
+        now = datetime.now(UTC)
+        encoded: dict[str, str | bytes] = {}
+        for client in list(self._clients.values()):
+            if not client.wants(event_type, topic, session_id):
+                client.filtered += 1
+                continue
+            message = encoded.get(client.wire.name)
+            if message is None:
+                message = encoded[client.wire.name] = client.wire.encode(event_type, data, now)
+            if not client.enqueue(message):
+                print(
+                    f"[Dashboard] Client {_describe(client.websocket)} fell behind, "
+                    f"dropped {client.dropped} messages so far"
+                )
 
     async def send_to_one(
         self,
@@ -81,20 +270,55 @@ class ConnectionManager:
             data: Event payload data
 
         Returns:
-            True if send succeeded, False otherwise
+            True if the event was queued behind the client's earlier messages
         """
-        message = json.dumps({
-            "type": event_type,
-            "data": data,
-            "timestamp": datetime.now(UTC).isoformat()
-        })
+        client = self._clients.get(websocket)
+        if client is None:
+            return False
+        return client.enqueue(client.wire.encode(event_type, data, datetime.now(UTC)))
 
+    async def handle_client_message(self, websocket: WebSocket, text: str) -> None:
+        """Apply a subscribe/unsubscribe message sent by a client.
+
+        Args:
+            websocket: The connection the message arrived on
+            text: Raw message text
+        """
+        client = self._clients.get(websocket)
+        if client is None:
+            return
         try:
-            await websocket.send_text(message)
-            return True
-        except Exception:
-            self.disconnect(websocket)
-            return False
+            request = json.loads(text)
+        except ValueError:
+            return
+        if not isinstance(request, dict):
+            return
+
+        action = request.get("action")
+        topics = request.get("topics")
+        sessions = request.get("sessions")
+        if not (_is_name_list(topics) and _is_name_list(sessions)):
+            return  # A bare string would otherwise subscribe to its characters
+        if action == "subscribe":
+            if topics is not None:
+                client.topics = (client.topics or set()) | set(topics)
+            if sessions is not None:
+                client.sessions = (client.sessions or set()) | set(sessions)
+        elif action == "unsubscribe":
+            if topics is not None:
+                client.topics = (client.topics or set(_all_topics())) - set(topics)
+            if sessions is not None and client.sessions is not None:
+                client.sessions -= set(sessions)
+        elif action == "subscribe_all":
+            client.topics = None
+            client.sessions = None
+        else:
+            return
+
+        await self.send_to_one(websocket, "subscribed", {
+            "topics": sorted(client.topics) if client.topics is not None else None,
+            "sessions": sorted(client.sessions) if client.sessions is not None else None,
+        })
 
     async def broadcast_conversation_entry(self, entry_dict: dict[str, Any]) -> None:
         """Broadcast a conversation entry to all clients.
@@ -0,0 +1,124 @@
+"""Wire formats for dashboard WebSocket events.
+
+Clients pick a format by offering WebSocket subprotocols, most preferred
+first. The server accepts the first one it supports:
+
+- "conversator.json" (and clients offering nothing): JSON text frames
+  {"type", "data", "timestamp"} with an ISO timestamp, as before.
+- "conversator.binary": binary frames holding compact JSON
+  {"type", "data", "ts"} with a millisecond epoch timestamp.
+- "conversator.msgpack": the same envelope packed with msgpack. This is
+  only offered by the server when the optional `msgpack` package is
+  installed (the "compact" extra).
+
+Binary frames start with one flag byte. Bit 0 set means the rest of the
+frame is raw DEFLATE (RFC 1951, what browsers decode with
+DecompressionStream("deflate-raw")); bit 1 set means msgpack rather than
+JSON. Payloads under COMPRESS_MIN_BYTES are sent uncompressed. Frames are
+compressed once per broadcast and shared by every client using the same
+format, unlike permessage-deflate which compresses per connection.
+"""
+
+import json
+import zlib
+from datetime import datetime
+from typing import Any
+
+# Smaller payloads are not worth a deflate pass
+COMPRESS_MIN_BYTES = 256
+
+_DEFLATED = 0x01
+_MSGPACK = 0x02
+
+
+def _msgpack_available() -> bool:
+    try:
+        import msgpack  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class WireFormat:
+    """Encodes event envelopes for one negotiated subprotocol."""
+
+    def __init__(self, name: str, binary: bool = False, packer: str = "json"):
+        self.name = name
+        self.binary = binary
+        self.packer = packer
+
+    def encode(self, event_type: str, data: Any, now: datetime) -> str | bytes:
+        """Encode one event.
+
+        Args:
+            event_type: Type of event
+            data: Event payload data
+            now: Broadcast time
+
+        Returns:
+            Text for text formats, a flagged frame for binary ones
+        """
+        if not self.binary:
+            return json.dumps({
+                "type": event_type,
+                "data": data,
+                "timestamp": now.isoformat()
+            })
+
+        envelope = {"type": event_type, "data": data, "ts": int(now.timestamp() * 1000)}
+        flags = 0
+        if self.packer == "msgpack":
+            import msgpack
+
+            body = msgpack.packb(envelope, use_bin_type=True, default=str)
+            flags |= _MSGPACK
+        else:
+            body = json.dumps(envelope, separators=(",", ":"), default=str).encode()
+
+        if len(body) >= COMPRESS_MIN_BYTES:
+            compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+            body = compressor.compress(body) + compressor.flush()
+            flags |= _DEFLATED
+        return bytes((flags,)) + body
+
+
+JSON_TEXT = WireFormat("conversator.json")
+
+WIRE_FORMATS: dict[str, WireFormat] = {
+    "conversator.json": JSON_TEXT,
+    "conversator.binary": WireFormat("conversator.binary", binary=True),
+}
+if _msgpack_available():
+    WIRE_FORMATS["conversator.msgpack"] = WireFormat(
+        "conversator.msgpack", binary=True, packer="msgpack"
+    )
+
+
+def negotiate(offered: list[str]) -> tuple[WireFormat, str | None]:
+    """Pick the wire format for a connection.
+
+    Args:
+        offered: Subprotocols sent by the client, most preferred first
+
+    Returns:
+        The format, and the subprotocol to accept (None if none was offered)
+    """
+    for name in offered:
+        if name in WIRE_FORMATS:
+            return WIRE_FORMATS[name], name
+    return JSON_TEXT, None
+
+
+def decode(frame: str | bytes) -> dict[str, Any]:
+    """Decode a frame produced by WireFormat.encode (for tests and tools)."""
+    if isinstance(frame, str):
+        return json.loads(frame)
+    flags, body = frame[0], frame[1:]
+    if flags & _DEFLATED:
+        body = zlib.decompress(body, -15)
+    if flags & _MSGPACK:
+        import msgpack
+
+        return msgpack.unpackb(body, raw=False)
+    return json.loads(body)
+
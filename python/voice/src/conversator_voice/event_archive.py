@@ -0,0 +1,98 @@
+"""Compressed JSONL archive segments for compacted task events.
+
+Each segment is one file holding raw `events` rows as JSON lines,
+compressed with zstd when the optional `zstandard` package is installed
+and gzip otherwise. The codec is inferred from the file suffix on read.
+"""
+
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Iterator
+
+CODEC_SUFFIXES = {"zstd": ".jsonl.zst", "gzip": ".jsonl.gz"}
+
+
+def default_codec() -> str:
+    """Return zstd if the optional zstandard package is available, else gzip."""
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return "gzip"
+    return "zstd"
+
+
+def write_segment(directory: Path, rows: list[dict], codec: str | None = None) -> Path:
+    """Write event rows to a new compressed segment.
+
+    Args:
+        directory: Archive directory (created if missing)
+        rows: Event rows ordered by event_id
+        codec: "zstd" or "gzip" (default: best available)
+
+    Returns:
+        Path of the written segment
+    """
+    codec = codec or default_codec()
+    if codec not in CODEC_SUFFIXES:
+        raise ValueError(f"Unsupported archive codec: {codec}")
+
+    directory.mkdir(parents=True, exist_ok=True)
+    first, last = rows[0]["event_id"], rows[-1]["event_id"]
+    path = directory / f"events-{first:010d}-{last:010d}{CODEC_SUFFIXES[codec]}"
+
+    data = "".join(json.dumps(row) + "\n" for row in rows).encode()
+    if codec == "zstd":
+        import zstandard
+
+        data = zstandard.ZstdCompressor().compress(data)
+    else:
+        data = gzip.compress(data)
+
+    # Write to a temp name first so a crash never leaves a truncated segment,
+    # and sync it so the segment is durable before its events are deleted
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    tmp_path.replace(path)
+    _fsync_directory(directory)
+    return path
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Persist a rename in the directory (not supported on Windows)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def read_segment(path: Path) -> Iterator[dict]:
+    """Yield event rows from a segment.
+
+    Args:
+        path: Segment path
+
+    Returns:
+        Iterator of event row dicts
+    """
+    data = path.read_bytes()
+    if path.name.endswith(CODEC_SUFFIXES["zstd"]):
+        import zstandard
+
+        data = zstandard.ZstdDecompressor().decompress(data)
+    else:
+        data = gzip.decompress(data)
+
+    for line in data.decode().splitlines():
+        if line:
+            yield json.loads(line)
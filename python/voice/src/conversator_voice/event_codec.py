@@ -0,0 +1,134 @@
+"""Compact on-disk encoding for event types and payloads.
+
+The "json" encoding stores the type name and a JSON object per event.
+The "compact" encoding stores an interned integer code for the type and
+a binary payload record laid out by a per-type field schema, so repeated
+keys are never written:
+
+    [present_mask, value_for_each_present_field..., {extra keys}?]
+
+Records are packed with msgpack when the optional `msgpack` package is
+installed and as positional JSON otherwise; the first byte of the blob
+says which, so every row is self-describing and mixed databases decode.
+"""
+
+import json
+from typing import Any
+
+from .models import EventType
+
+PAYLOAD_ENCODINGS = ("json", "compact")
+
+# Stable codes: append new types, never renumber
+EVENT_TYPE_CODES: dict[str, int] = {
+    "TaskCreated": 1,
+    "WorkingPromptUpdated": 2,
+    "QuestionsRaised": 3,
+    "UserAnswered": 4,
+    "HandoffFrozen": 5,
+    "BeadsTaskLinked": 6,
+    "BuilderDispatched": 7,
+    "BuilderStatusChanged": 8,
+    "GateRequested": 9,
+    "GateApproved": 10,
+    "GateDenied": 11,
+    "BuildCompleted": 12,
+    "BuildFailed": 13,
+    "TaskCanceled": 14,
+    "TaskCompacted": 15,
+}
+EVENT_TYPE_NAMES: dict[str, str] = {str(code): name for name, code in EVENT_TYPE_CODES.items()}
+
+# Field order per event type, matching the payload helpers in models.py.
+# Keys outside the schema are kept in a trailing dict.
+PAYLOAD_FIELDS: dict[str, tuple[str, ...]] = {
+    "TaskCreated": ("title", "working_prompt_path", "project_root"),
+    "WorkingPromptUpdated": ("path", "summary"),
+    "QuestionsRaised": ("questions",),
+    "UserAnswered": ("answers",),
+    "HandoffFrozen": ("handoff_md_path", "handoff_json_path"),
+    "BeadsTaskLinked": ("beads_id",),
+    "BuilderDispatched": ("session_id", "provider"),
+    "BuilderStatusChanged": ("session_id", "old_status", "new_status"),
+    "GateRequested": ("gate_type", "description"),
+    "BuildCompleted": ("session_id", "artifacts"),
+    "BuildFailed": ("session_id", "error"),
+    "TaskCanceled": ("reason",),
+    "TaskCompacted": (
+        "title", "final_status", "priority", "project_root", "created_at", "updated_at",
+        "beads_id", "working_prompt_path", "handoff_prompt_path", "builder_session_id",
+        "session_id", "event_count", "first_event_id", "last_event_id", "archive_path",
+    ),
+}
+
+_MSGPACK = b"\x01"
+_JSON_RECORD = b"\x02"
+
+
+def encode_type(event_type: EventType, encoding: str) -> str:
+    """Encode an event type for the `type` column."""
+    if encoding == "compact" and event_type in EVENT_TYPE_CODES:
+        return str(EVENT_TYPE_CODES[event_type])
+    return event_type
+
+
+def decode_type(value: str) -> str:
+    """Decode a `type` column value (name or interned code) to the type name."""
+    return EVENT_TYPE_NAMES.get(value, value)
+
+
+def type_column_values(event_type: EventType) -> tuple[str, str]:
+    """Both stored forms of a type, for filters that must match either."""
+    return event_type, str(EVENT_TYPE_CODES.get(event_type, event_type))
+
+
+def encode_payload(event_type: EventType, payload: dict, encoding: str) -> str | bytes:
+    """Encode a payload for the `payload` column.
+
+    Returns:
+        JSON text for the "json" encoding, a binary record for "compact"
+    """
+    if encoding != "compact":
+        return json.dumps(payload)
+
+    fields = PAYLOAD_FIELDS.get(event_type, ())
+    mask = 0
+    record: list[Any] = [0]
+    for bit, name in enumerate(fields):
+        if name in payload:
+            mask |= 1 << bit
+            record.append(payload[name])
+    record[0] = mask
+    extras = {k: v for k, v in payload.items() if k not in fields}
+    if extras:
+        record.append(extras)
+
+    try:
+        import msgpack
+    except ImportError:
+        return _JSON_RECORD + json.dumps(record, separators=(",", ":")).encode()
+    return _MSGPACK + msgpack.packb(record, use_bin_type=True)
+
+
+def decode_payload(event_type: str, value: str | bytes | dict) -> dict:
+    """Decode a stored payload in any supported encoding."""
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str):
+        return json.loads(value)
+
+    if value[:1] == _MSGPACK:
+        import msgpack
+
+        record = msgpack.unpackb(value[1:], raw=False)
+    else:
+        record = json.loads(value[1:])
+
+    fields = PAYLOAD_FIELDS.get(event_type, ())
+    mask, values = record[0], iter(record[1:])
+    payload = {}
+    for bit, name in enumerate(fields):
+        if mask & (1 << bit):
+            payload[name] = next(values)
+    payload.update(next(values, {}))
+    return payload
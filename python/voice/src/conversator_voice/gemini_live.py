@@ -15,6 +15,7 @@ from .handlers import ToolHandler
 from .models import ConversatorTask, ToolResponse
 from .prompt_manager import PromptManager
 from .state import StateStore
+from .upstream_gate import GateSettings, UpstreamGate
 
 if TYPE_CHECKING:
     from .ambient_audio import AmbientAudioController
@@ -1247,7 +1248,13 @@ class ConversatorSession:
         self.opencode = OpenCodeClient(opencode_url)
 
         # Initialize state store first
-        self.state = StateStore(self.workspace_path / "state.sqlite")
+        self.state = StateStore(
+            self.workspace_path / "state.sqlite",
+            journal_mode=self.config.state_journal_mode,
+            synchronous=self.config.state_synchronous,
+            commit_window=self.config.state_commit_window_ms / 1000,
+            payload_encoding=self.config.state_payload_encoding,
+        )
         self.current_task: ConversatorTask | None = None
 
         # Initialize prompt manager
@@ -1274,12 +1281,21 @@ class ConversatorSession:
         )
         self.tools = CONVERSATOR_TOOLS
 
+        # Decides which mic frames the audio send loop forwards to Gemini
+        self.audio_gate = UpstreamGate(GateSettings(
+            mode=self.config.uplink_gating,
+            keepalive_ms=self.config.uplink_keepalive_ms,
+        ))
+
     async def start(self) -> None:
         """Start the session and create initial task."""
         await self.conversator.connect(self.tools, self.tool_handler)
 
+        # Follow subagent replies on the OpenCode event bus instead of polling
+        await self.opencode.start_event_stream()
+
         # Create a new task for this session
-        self.current_task = self.state.create_task(
+        self.current_task = await self.state.aio.create_task(
             title="Voice Session",
             working_prompt_path=str(self.workspace_path / "prompts" / "current" / "working.md"),
         )
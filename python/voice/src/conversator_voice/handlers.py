@@ -14,12 +14,16 @@ from .builder_client import BuilderRegistry, OpenCodeBuilder
 from .builder_manager import BuilderManager
 from .opencode_client import OpenCodeClient
 from .session_state import SessionState
+from .subagent_threads import SubagentThread
 
 if TYPE_CHECKING:
     from .config import ConversatorConfig
     from .prompt_manager import PromptManager
     from .state import StateStore
 
+# Shortest streamed opening worth speaking before a reply finishes
+VOICE_PREVIEW_MIN_CHARS = 40
+
 
 class ToolHandler:
     """Handles tool calls from Gemini Live, dispatching to subagents and Beads."""
@@ -603,7 +607,7 @@ class ToolHandler:
 
         # Get status from local state store (primary source)
         if self.state:
-            active_tasks = self.state.get_active_tasks()
+            active_tasks = await self.state.aio.get_active_tasks()
             status["tasks"] = [
                 {"task_id": t.task_id[:8], "title": t.title, "status": t.status}
                 for t in active_tasks
@@ -611,7 +615,7 @@ class ToolHandler:
             status["active_count"] = len(active_tasks)
 
             # Get unread inbox count
-            unread = self.state.get_inbox(unread_only=True)
+            unread = await self.state.aio.get_inbox(unread_only=True)
             status["unread_notifications"] = len(unread)
 
             # Voice-friendly summary
@@ -665,7 +669,7 @@ class ToolHandler:
         # Get project_root from current task
         project_root = None
         if self.current_task_id and self.state:
-            task = self.state.get_task(self.current_task_id)
+            task = await self.state.aio.get_task(self.current_task_id)
             if task:
                 project_root = task.project_root
 
@@ -718,7 +722,7 @@ class ToolHandler:
 
                         session_id = result.get("session_id")
                         if isinstance(session_id, str) and session_id:
-                            self.state.update_task_status(
+                            await self.state.aio.update_task_status(
                                 self.current_task_id,
                                 "BuilderDispatched",
                                 create_builder_dispatched_payload(session_id, agent),
@@ -874,7 +878,7 @@ class ToolHandler:
         if not self.state:
             return {"summary": "Inbox not available.", "count": 0}
 
-        items = self.state.get_inbox(unread_only=not include_read)
+        items = await self.state.aio.get_inbox(unread_only=not include_read)
 
         if not items:
             return {
@@ -929,11 +933,11 @@ class ToolHandler:
         if inbox_ids:
             count = 0
             for inbox_id in inbox_ids:
-                self.state.acknowledge_inbox(inbox_id)
+                await self.state.aio.acknowledge_inbox(inbox_id)
                 count += 1
             return {"acknowledged": count, "summary": f"Acknowledged {count} notifications."}
         else:
-            count = self.state.acknowledge_all_inbox()
+            count = await self.state.aio.acknowledge_all_inbox()
             return {
                 "acknowledged": count,
                 "summary": f"Cleared all {count} notifications."
@@ -1098,8 +1102,20 @@ class ToolHandler:
             return match.group(1)
         return "unknown.md"
 
-    def _summarize_for_voice(self, text: str, max_lines: int = 2, max_chars: int = 220) -> str:
-        """Return a short, voice-friendly snippet from a longer reply."""
+    def _summarize_for_voice(
+        self, text: str, max_lines: int = 2, max_chars: int = 220, partial: bool = False
+    ) -> str:
+        """Return a short, voice-friendly snippet from a longer reply.
+
+        Args:
+            text: Reply text
+            max_lines: Maximum lines to include
+            max_chars: Maximum snippet length
+            partial: Text is still streaming; only use finished sentences
+        """
+        if partial:
+            ends = list(re.finditer(r"[.!?](?=\s)|\n", text))
+            text = text[: ends[-1].end()] if ends else ""
         if not text.strip():
             return ""
 
@@ -1499,7 +1515,7 @@ class ToolHandler:
             }
 
         if self.state:
-            task = self.state.get_task(resolved_task_id)
+            task = await self.state.aio.get_task(resolved_task_id)
             if task and task.builder_session_id:
                 for builder in self.builders.builders.values():
                     builder.plan_sessions.setdefault(resolved_task_id, task.builder_session_id)
@@ -1550,7 +1566,7 @@ class ToolHandler:
             Plan content and summary
         """
         if self.state:
-            task = self.state.get_task(task_id)
+            task = await self.state.aio.get_task(task_id)
             if task and task.builder_session_id:
                 for builder in self.builders.builders.values():
                     builder.plan_sessions.setdefault(task_id, task.builder_session_id)
@@ -1594,7 +1610,7 @@ class ToolHandler:
             Confirmation that building has started
         """
         if self.state:
-            task = self.state.get_task(task_id)
+            task = await self.state.aio.get_task(task_id)
             if task and task.builder_session_id:
                 for builder in self.builders.builders.values():
                     builder.plan_sessions.setdefault(task_id, task.builder_session_id)
@@ -1754,6 +1770,12 @@ class ToolHandler:
             "say": f"Okay. Sending that to the {thread.subagent}.",
         }
 
+    def _should_auto_relay(self, thread: SubagentThread) -> bool:
+        """Replies are spoken directly for the focused (or only) thread."""
+        is_focused = self.session_state.focused_thread_id == thread.thread_id
+        is_only_thread = len(self.session_state.threads) == 1
+        return is_focused or is_only_thread
+
     async def _run_thread_request(self, thread_id: str, message: str) -> None:
         thread = self.session_state.get_thread(thread_id)
         if not thread:
@@ -1762,11 +1784,26 @@ class ToolHandler:
         try:
             responses: list[str] = []
             errors: list[str] = []
+            streamed = ""
+            preview = ""
 
             async for event in self.opencode.send_to_session(
-                thread.opencode_session_id, thread.subagent, message
+                thread.opencode_session_id, thread.subagent, message, stream=True
             ):
-                if event.get("type") == "message":
+                if event.get("type") == "delta":
+                    streamed += event.get("content", "")
+                    # Speak the opening sentences while the subagent keeps going
+                    if not preview and self._should_auto_relay(thread):
+                        preview = self._summarize_for_voice(streamed, max_lines=1, partial=True)
+                        if len(preview) < VOICE_PREVIEW_MIN_CHARS:
+                            preview = ""
+                        else:
+                            self.session_state.enqueue_announcement(
+                                f"The {thread.subagent} says: {preview}",
+                                kind="response_preview",
+                                thread_id=thread.thread_id,
+                            )
+                elif event.get("type") == "message":
                     responses.append(event.get("content", ""))
                 elif event.get("type") == "error":
                     errors.append(event.get("content", ""))
@@ -1796,9 +1833,7 @@ class ToolHandler:
             self.session_state.set_thread_waiting(thread.thread_id, False)
 
             inbox_available = self.state is not None
-            is_focused = self.session_state.focused_thread_id == thread.thread_id
-            is_only_thread = len(self.session_state.threads) == 1
-            auto_relay = is_focused or is_only_thread
+            auto_relay = self._should_auto_relay(thread)
 
             if self.state:
                 from .models import InboxItem
@@ -1807,7 +1842,7 @@ class ToolHandler:
                 if thread.topic:
                     summary += f" about {thread.topic}"
 
-                self.state.add_inbox_item(
+                await self.state.aio.add_inbox_item(
                     InboxItem(
                         summary=summary,
                         severity="info",
@@ -1824,7 +1859,10 @@ class ToolHandler:
             inbox_suffix = " It's in your inbox." if inbox_available and not auto_relay else ""
             snippet = self._summarize_for_voice(full_response)
 
-            if auto_relay and snippet:
+            if preview:
+                # The opening was already spoken from the stream
+                announce = f"The {thread.subagent} finished.{inbox_suffix}"
+            elif auto_relay and snippet:
                 announce = f"The {thread.subagent} replied: {snippet}."
             elif auto_relay:
                 announce = f"The {thread.subagent} replied."
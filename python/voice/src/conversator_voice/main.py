@@ -6,10 +6,15 @@ import os
 import sys
 from urllib.parse import urlparse
 
+from .audio_analysis import AudioFrame, SpeechLevels, audio_frames
+from .broadcast_coalescer import configure_coalescing
 from .config import ConversatorConfig
 from .gemini_live import ConversatorSession
 from .monitor import BuilderMonitor
 from .opencode_manager import OpenCodeManager
+from .opencode_transport import TransportSettings, close_transports, configure_transports
+from .session_store import SessionStoreLimits, configure_session_store
+from .vad import VADSettings, VoiceActivityDetector, create_vad
 from .voice_sources import create_voice_source
 from .dashboard import ConversationLogger, create_dashboard_app
 from .ambient_audio import AmbientAudioController
@@ -81,6 +86,23 @@ async def run_conversator(
         opencode_url = config.opencode_base_url
         opencode_port = config.conversator_port
 
+    # Every OpenCode client and builder shares pooled connections per server
+    configure_transports(TransportSettings(
+        max_connections=config.opencode_http_max_connections,
+        max_keepalive_connections=config.opencode_http_max_keepalive,
+        keepalive_expiry=config.opencode_http_keepalive_expiry,
+        connect_timeout=config.opencode_http_connect_timeout,
+        read_timeout=config.opencode_http_read_timeout,
+        http2=config.opencode_http2,
+    ))
+    configure_session_store(SessionStoreLimits(
+        max_sessions=config.sessions_max,
+        max_idle_seconds=config.sessions_max_idle_seconds,
+        max_part_bytes=config.sessions_max_part_bytes,
+        spill_dir=config.sessions_spill_dir,
+    ))
+    configure_coalescing(config.dashboard_coalesce_window_ms / 1000)
+
     # Create OpenCode manager with proper isolation
     # Working dir is the conversator project root (where .conversator/ and conversator/agents/ are)
     opencode_manager = OpenCodeManager(
@@ -120,6 +142,22 @@ async def run_conversator(
 
     # Create voice source
     voice = create_voice_source(source_type, **source_kwargs)
+    speech_levels = SpeechLevels(
+        speech=config.voice_speech_threshold,
+        generating_factor=config.voice_generating_factor,
+        interrupt=config.voice_interrupt_threshold,
+    )
+    if hasattr(voice, "speech_levels"):
+        # Echo gating at capture uses the same thresholds as the send loop
+        voice.speech_levels = speech_levels
+    vad = create_vad(VADSettings(
+        engine=config.vad_engine,
+        min_speech_ms=config.vad_min_speech_ms,
+        end_of_speech_ms=config.vad_end_of_speech_ms,
+        pre_roll_ms=config.vad_pre_roll_ms,
+        margin_db=config.vad_margin_db,
+        webrtc_aggressiveness=config.vad_webrtc_aggressiveness,
+    ), speech_levels)
 
     # Create conversation logger for dashboard
     conversation_logger = ConversationLogger()
@@ -266,7 +304,7 @@ async def run_conversator(
 
             tasks = [
                 asyncio.create_task(
-                    _audio_send_loop(voice, session, config),
+                    _audio_send_loop(voice, session, vad),
                     name="audio_send_loop",
                 ),
                 asyncio.create_task(
@@ -308,12 +346,16 @@ async def run_conversator(
     except KeyboardInterrupt:
         print("\nShutting down...")
     finally:
-        # Stop ambient audio
-        if ambient_audio:
-            ambient_audio.stop()
-        await session.stop()
-        await voice.stop()
-        await opencode_manager.stop()
+        try:
+            # Stop ambient audio
+            if ambient_audio:
+                ambient_audio.stop()
+            await session.stop()
+            await voice.stop()
+            await opencode_manager.stop()
+        finally:
+            # The pooled OpenCode clients are shared by every component above
+            await close_transports()
 
 
 async def _cleanup_port(port: int) -> None:
@@ -356,65 +398,62 @@ async def _cleanup_port(port: int) -> None:
         print(f"Port cleanup check failed (non-critical): {e}")
 
 
-async def _audio_send_loop(voice, session: ConversatorSession, config: ConversatorConfig) -> None:
+async def _audio_send_loop(
+    voice, session: ConversatorSession, vad: VoiceActivityDetector
+) -> None:
     """Send audio from voice source to Gemini.
 
-    Includes silence detection to help Gemini's VAD by calling send_audio_end()
-    after extended silence following speech.
+    Includes end-of-speech detection to help Gemini's VAD: the local voice
+    activity detector calls send_audio_end() as soon as a speech segment's
+    hangover runs out, rather than after a fixed count of quiet chunks.
+    The session's upstream gate then decides which frames are sent (all of
+    them, or only speech with its pre-roll and hangover).
 
     Args:
         voice: Voice source
         session: Conversator session
-        config: Conversator configuration
+        vad: Voice activity detector (frame levels come from audio_analysis)
     """
-    import numpy as np
-
     chunk_count = 0
     last_speech_chunk = 0  # Track when we last detected speech
     consecutive_errors = 0
-    audio_end_sent = False  # Track if we've sent audio_end since last speech
-    SILENCE_CHUNKS_THRESHOLD = 10  # ~1 second at 100ms chunks
-    speech_threshold = config.voice_speech_threshold
+    gate = session.audio_gate
 
-    print(f"[Audio send loop starting (speech threshold: {speech_threshold})...]")
+    print(
+        f"[Audio send loop starting (VAD: {vad.stats()['engine']}, "
+        f"gating: {gate.settings.mode})...]"
+    )
     try:
-        async for chunk in voice.get_audio_chunks():
+        async for frame in audio_frames(voice):
             try:
                 # Check for text command (from Telegram)
-                if isinstance(chunk, bytes) and chunk.startswith(b"TEXT:"):
-                    text = chunk[5:].decode()
+                if not isinstance(frame, AudioFrame):
+                    text = frame[5:].decode()
                     await session.conversator.send_text(text)
                 else:
-                    # Check audio level (threshold from config)
-                    # Use higher threshold when model is generating to reduce false positives from echo
-                    audio_array = np.frombuffer(chunk, dtype=np.int16)
-                    rms = np.sqrt(np.mean(audio_array.astype(np.float32) ** 2))
+                    # The detector raises its threshold while the model is generating
+                    # to reduce false positives from echo
                     is_generating = session.conversator._is_generating
-                    effective_threshold = (
-                        speech_threshold * 3 if is_generating else speech_threshold
-                    )
-                    is_speech = rms > effective_threshold
+                    result = vad.process(frame, generating=is_generating)
+                    is_speech = result.is_speech
 
-                    await session.conversator.send_audio(chunk)
+                    for out in gate.admit(frame, result):
+                        await session.conversator.send_audio(out.pcm)
                     chunk_count += 1
                     consecutive_errors = 0  # Reset on success
 
-                    if is_speech:
+                    if result.voiced:
                         last_speech_chunk = chunk_count
-                        audio_end_sent = False  # Reset - new speech detected
-                    else:
-                        # Check for extended silence after speech - signal end of speech to Gemini
-                        if last_speech_chunk > 0 and not audio_end_sent:
-                            chunks_since_speech = chunk_count - last_speech_chunk
-                            if chunks_since_speech == SILENCE_CHUNKS_THRESHOLD:
-                                try:
-                                    await session.conversator.send_audio_end()
-                                    audio_end_sent = True
-                                    print(
-                                        f"[Audio] Sent audio_end signal after {SILENCE_CHUNKS_THRESHOLD} silent chunks"
-                                    )
-                                except Exception as e:
-                                    print(f"[Audio] Failed to send audio_end: {e}")
+                    if result.ended:
+                        # End of the user's turn - signal end of speech to Gemini
+                        try:
+                            await session.conversator.send_audio_end()
+                            print(
+                                f"[Audio] Sent audio_end signal after "
+                                f"{vad.settings.end_of_speech_ms:.0f} ms of silence"
+                            )
+                        except Exception as e:
+                            print(f"[Audio] Failed to send audio_end: {e}")
 
                     # Log every 50 chunks with audio level (more frequent when speech detected)
                     # Also log first 5 chunks for debugging startup
@@ -425,8 +464,13 @@ async def _audio_send_loop(voice, session: ConversatorSession, config: Conversat
                             chunk_count - last_speech_chunk if last_speech_chunk > 0 else "never"
                         )
                         gen_state = "GEN" if session.conversator._is_generating else "idle"
+                        floor = vad.stats()["noise_floor_rms"]
+                        saved = gate.stats()["seconds_saved"]
                         print(
-                            f"[Audio #{chunk_count}: {level} (rms={rms:.0f}), last speech: {chunks_since_speech}, state: {gen_state}]"
+                            f"[Audio #{chunk_count}: {level} "
+                            f"(rms={frame.rms:.0f}, floor={floor:.0f}), "
+                            f"last speech: {chunks_since_speech}, state: {gen_state}, "
+                            f"saved: {saved:.1f}s]"
                         )
             except Exception as e:
                 consecutive_errors += 1
@@ -461,7 +505,12 @@ async def _audio_send_loop(voice, session: ConversatorSession, config: Conversat
 
         traceback.print_exc()
     finally:
-        print(f"[Audio loop] Ended after {chunk_count} chunks")
+        stats = gate.stats()
+        print(
+            f"[Audio loop] Ended after {chunk_count} chunks; sent {stats['seconds_sent']}s, "
+            f"saved {stats['seconds_saved']}s ({stats['bytes_saved']} bytes, "
+            f"{stats['keepalives']} keep-alives)"
+        )
 
 
 async def _relay_safe_point_loop(voice, session: ConversatorSession) -> None:
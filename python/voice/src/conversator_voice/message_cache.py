@@ -0,0 +1,336 @@
+"""Per-session cache of OpenCode messages with part-level versions.
+
+Long builder sessions hold megabytes of messages, and the dashboard and
+plan checks read them over and over. This cache keeps every message seen
+for a session, keyed by message ID. Each message stores its parts by part
+ID, and each part is stamped with the cache sequence number of its last
+change. The cache is fed in two ways:
+
+- SSE deltas (`message.updated` / `message.part.updated`) through
+  apply_info() and apply_part(). A connected listener can then serve
+  reads without any HTTP request.
+- Incremental refreshes through refresh(). These fetch only a tail window
+  of the session (`?limit=N`) and widen it until it overlaps the messages
+  already cached. A fetched snapshot never overwrites a part that an SSE
+  delta changed after the fetch started.
+
+OpenCode message IDs sort chronologically, so "newer than the last seen
+ID" is a plain string comparison.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+# First tail window requested by refresh(); doubled until it overlaps the cache
+TAIL_WINDOW = 20
+
+# Fetches one page of raw messages: the newest `limit` (None = all), or
+# None when the server could not be read
+PageFetcher = Callable[[int | None], Awaitable[list[dict] | None]]
+
+
+def raw_message_id(raw: dict) -> str | None:
+    """Message ID of a raw /session/:id/message entry."""
+    info = raw.get("info", raw)
+    return info.get("id") or info.get("messageID")
+
+
+def _part_key(part: dict, index: int) -> str:
+    return part.get("id") or f"#{index}"
+
+
+def approx_size(value: Any) -> int:
+    """Rough in-memory footprint of a decoded JSON value, in bytes."""
+    if isinstance(value, str):
+        return len(value) + 48
+    if isinstance(value, dict):
+        return 64 + sum(len(k) + approx_size(v) for k, v in value.items())
+    if isinstance(value, list):
+        return 56 + sum(approx_size(v) for v in value)
+    return 24
+
+
+@dataclass
+class CachedMessage:
+    """One message with its parts keyed by part ID."""
+
+    message_id: str
+    info: dict = field(default_factory=dict)
+    parts: dict[str, dict] = field(default_factory=dict)
+    info_seq: int = 0
+    part_seqs: dict[str, int] = field(default_factory=dict)
+    part_sizes: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        """Approximate bytes held by this message's parts."""
+        return sum(self.part_sizes.values())
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the latest change to this message."""
+        return max(self.info_seq, *self.part_seqs.values(), 0)
+
+    @property
+    def role(self) -> str:
+        return self.info.get("role", "unknown")
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether the server has finished writing this message."""
+        if self.role != "assistant":
+            return True
+        timing = self.info.get("time") or {}
+        return bool(timing.get("completed") or self.info.get("error"))
+
+    def text(self) -> str:
+        """Concatenated text parts."""
+        return "".join(
+            part.get("text", "") for part in self.parts.values() if part.get("type") == "text"
+        )
+
+    def to_raw(self) -> dict[str, Any]:
+        """Same shape as an entry of GET /session/:id/message."""
+        # Messages seen only through part events have no info yet; keep their id
+        return {"info": {"id": self.message_id, **self.info}, "parts": list(self.parts.values())}
+
+
+class _SessionMessages:
+    def __init__(self):
+        self.messages: dict[str, CachedMessage] = {}
+        self.ordered = True
+        self.bytes = 0
+        # Whether the full history has been fetched once (SSE alone only
+        # sees messages written while it is connected)
+        self.loaded = False
+        self.synced_epoch: int | None = None
+
+    def get_or_create(self, message_id: str) -> CachedMessage:
+        message = self.messages.get(message_id)
+        if message is None:
+            if self.messages and message_id < next(reversed(self.messages)):
+                self.ordered = False
+            message = CachedMessage(message_id=message_id)
+            self.messages[message_id] = message
+        return message
+
+    def in_order(self) -> list[CachedMessage]:
+        if not self.ordered:
+            self.messages = dict(sorted(self.messages.items()))
+            self.ordered = True
+        return list(self.messages.values())
+
+
+class SessionMessageCache:
+    """Messages of many sessions, updated from SSE deltas and HTTP tails."""
+
+    def __init__(self):
+        self.seq = 0
+        self._sessions: dict[str, _SessionMessages] = {}
+        self.fetches = 0
+        self.messages_fetched = 0
+        self.cache_reads = 0
+        self.total_bytes = 0
+
+    def _next_seq(self) -> int:
+        self.seq += 1
+        return self.seq
+
+    def _resize(self, entry: _SessionMessages, message: CachedMessage, key: str, part: dict | None):
+        # Keep per-session and total part byte counts in step with the parts
+        old = message.part_sizes.pop(key, 0)
+        new = approx_size(part) if part is not None else 0
+        if part is not None:
+            message.part_sizes[key] = new
+        entry.bytes += new - old
+        self.total_bytes += new - old
+
+    def _session(self, session_id: str) -> _SessionMessages:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            entry = self._sessions[session_id] = _SessionMessages()
+        return entry
+
+    def apply_info(self, session_id: str, info: dict) -> CachedMessage | None:
+        """Apply a message.updated payload.
+
+        Args:
+            session_id: Session the message belongs to
+            info: Message info (must carry an ID)
+
+        Returns:
+            The cached message, or None if the info has no ID
+        """
+        message_id = info.get("id") or info.get("messageID")
+        if not message_id:
+            return None
+        message = self._session(session_id).get_or_create(message_id)
+        if message.info != info:
+            message.info = dict(info)
+            message.info_seq = self._next_seq()
+        return message
+
+    def apply_part(self, session_id: str, message_id: str, part: dict) -> CachedMessage:
+        """Apply a message.part.updated payload, replacing the part by ID.
+
+        Args:
+            session_id: Session the message belongs to
+            message_id: Message the part belongs to
+            part: Full part as sent by the server
+
+        Returns:
+            The cached message
+        """
+        entry = self._session(session_id)
+        message = entry.get_or_create(message_id)
+        key = _part_key(part, len(message.parts))
+        if message.parts.get(key) != part:
+            message.parts[key] = part
+            message.part_seqs[key] = self._next_seq()
+            self._resize(entry, message, key, part)
+        return message
+
+    def merge(self, session_id: str, page: list[dict], since_seq: int, complete: bool) -> None:
+        """Merge a fetched page of raw messages.
+
+        Parts and infos changed after `since_seq` came from SSE while the
+        page was in flight and are newer than the page, so they are kept.
+
+        Args:
+            session_id: Session the page belongs to
+            page: Raw messages, oldest first
+            since_seq: Cache sequence number taken before the fetch started
+            complete: Whether the page holds the whole session (not just a tail)
+        """
+        entry = self._session(session_id)
+        fetched: set[str] = set()
+
+        for raw in page:
+            message_id = raw_message_id(raw)
+            if not message_id:
+                continue
+            fetched.add(message_id)
+            message = entry.get_or_create(message_id)
+
+            info = raw.get("info", raw)
+            if message.info_seq <= since_seq and message.info != info:
+                message.info = dict(info)
+                message.info_seq = self._next_seq()
+
+            parts: dict[str, dict] = {}
+            for index, part in enumerate(raw.get("parts") or []):
+                if not isinstance(part, dict):
+                    continue
+                key = _part_key(part, index)
+                if message.part_seqs.get(key, 0) > since_seq:
+                    parts[key] = message.parts[key]
+                    continue
+                if message.parts.get(key) != part:
+                    message.part_seqs[key] = self._next_seq()
+                    self._resize(entry, message, key, part)
+                parts[key] = part
+            # Parts that only SSE has seen so far
+            for key, part in message.parts.items():
+                if key in parts:
+                    continue
+                if message.part_seqs.get(key, 0) > since_seq:
+                    parts[key] = part
+                else:
+                    self._resize(entry, message, key, None)
+            message.parts = parts
+            message.part_seqs = {key: message.part_seqs.get(key, 0) for key in parts}
+
+        # Messages inside the fetched range but missing from it were reverted
+        oldest = min(fetched) if fetched else None
+        for message_id in list(entry.messages):
+            message = entry.messages[message_id]
+            in_range = complete or (oldest is not None and message_id >= oldest)
+            if in_range and message_id not in fetched and message.seq <= since_seq:
+                del entry.messages[message_id]
+                entry.bytes -= message.size
+                self.total_bytes -= message.size
+        entry.loaded = entry.loaded or complete
+
+    async def refresh(self, session_id: str, fetch_page: PageFetcher) -> list[CachedMessage] | None:
+        """Bring a session up to date, fetching only its new tail.
+
+        Args:
+            session_id: Session to refresh
+            fetch_page: Fetches the newest `limit` raw messages (None = all)
+
+        Returns:
+            All cached messages in order, or None if the fetch failed
+        """
+        entry = self._sessions.get(session_id)
+        known = self.last_message_id(session_id) if entry and entry.loaded else None
+        started = self.seq
+        limit = TAIL_WINDOW if known else None
+
+        while True:
+            page = await fetch_page(limit)
+            if page is None:
+                return None
+            self.fetches += 1
+            self.messages_fetched += len(page)
+
+            ids = [message_id for message_id in map(raw_message_id, page) if message_id]
+            if limit is None or len(page) < limit or (ids and min(ids) <= known):
+                break
+            # Gap between the cache and this window; widen it
+            limit *= 2
+
+        complete = limit is None or len(page) < limit
+        self.merge(session_id, page, since_seq=started, complete=complete)
+        return self.messages(session_id)
+
+    def messages(self, session_id: str) -> list[CachedMessage]:
+        """Cached messages of a session, oldest first."""
+        entry = self._sessions.get(session_id)
+        return entry.in_order() if entry else []
+
+    def changed_since(self, session_id: str, seq: int) -> list[CachedMessage]:
+        """Messages of a session changed after the given sequence number."""
+        return [message for message in self.messages(session_id) if message.seq > seq]
+
+    def last_message_id(self, session_id: str) -> str | None:
+        """Newest cached message ID of a session."""
+        entry = self._sessions.get(session_id)
+        if not entry or not entry.messages:
+            return None
+        return max(entry.messages) if not entry.ordered else next(reversed(entry.messages))
+
+    def synced_epoch(self, session_id: str) -> int | None:
+        """Event stream epoch the session was last fully synced in."""
+        entry = self._sessions.get(session_id)
+        return entry.synced_epoch if entry else None
+
+    def mark_synced(self, session_id: str, epoch: int | None) -> None:
+        """Record that SSE deltas keep this session current from now on."""
+        self._session(session_id).synced_epoch = epoch
+
+    def is_loaded(self, session_id: str) -> bool:
+        """Whether the session's full history has been fetched."""
+        entry = self._sessions.get(session_id)
+        return bool(entry and entry.loaded)
+
+    def session_bytes(self, session_id: str) -> int:
+        """Approximate bytes held by a session's message parts."""
+        entry = self._sessions.get(session_id)
+        return entry.bytes if entry else 0
+
+    def drop(self, session_id: str) -> None:
+        """Forget a session."""
+        entry = self._sessions.pop(session_id, None)
+        if entry:
+            self.total_bytes -= entry.bytes
+
+    def stats(self) -> dict[str, Any]:
+        """Counters for confirming reads are served incrementally."""
+        return {
+            "sessions": len(self._sessions),
+            "messages": sum(len(entry.messages) for entry in self._sessions.values()),
+            "part_bytes": self.total_bytes,
+            "fetches": self.fetches,
+            "messages_fetched": self.messages_fetched,
+            "cache_reads": self.cache_reads,
+        }
@@ -2,7 +2,7 @@
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Literal
+from typing import Any, Callable, Literal
 from uuid import uuid4
 import json
 
@@ -63,6 +63,7 @@ EventType = Literal[
     "BuildCompleted",
     "BuildFailed",
     "TaskCanceled",
+    "TaskCompacted",
 ]
 
 InboxSeverity = Literal["info", "success", "warning", "error", "blocking"]
@@ -72,13 +73,45 @@ BuilderStatus = Literal[
 ]
 
 
+class DeferredPayload:
+    """A payload that is decoded only when first read."""
+
+    __slots__ = ("decode",)
+
+    def __init__(self, decode: Callable[[], dict]):
+        self.decode = decode
+
+
+class _LazyPayloadField:
+    """Dataclass field descriptor that resolves a DeferredPayload on first access.
+
+    Lets the state store hand out events whose payload is never parsed
+    unless a caller actually looks at it.
+    """
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.attr = f"_{name}"
+
+    def __get__(self, obj: Any, objtype: type | None = None) -> Any:
+        if obj is None:
+            return None  # Dataclass default; replaced with a fresh dict on set
+        value = obj.__dict__[self.attr]
+        if isinstance(value, DeferredPayload):
+            value = value.decode()
+            obj.__dict__[self.attr] = value
+        return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        obj.__dict__[self.attr] = {} if value is None else value
+
+
 @dataclass
 class TaskEvent:
     """An append-only event in the task lifecycle."""
 
     type: EventType
     task_id: str
-    payload: dict = field(default_factory=dict)
+    payload: dict = _LazyPayloadField()
     time: datetime = field(default_factory=datetime.utcnow)
     event_id: int | None = None  # Set by database on insert
 
@@ -320,3 +353,35 @@ def create_build_failed_payload(session_id: str, error: str) -> dict:
 def create_task_canceled_payload(reason: str) -> dict:
     """Create payload for TaskCanceled event."""
     return {"reason": reason}
+
+
+def create_task_compacted_payload(
+    task: "ConversatorTask",
+    event_count: int,
+    first_event_id: int,
+    last_event_id: int,
+    archive_path: str | None = None,
+    session_id: str | None = None,
+) -> dict:
+    """Create payload for TaskCompacted event.
+
+    Carries the final derived state of the task so replay can rebuild it
+    without the folded history.
+    """
+    return {
+        "title": task.title,
+        "final_status": task.status,
+        "priority": task.priority,
+        "project_root": task.project_root,
+        "created_at": task.created_at.isoformat(),
+        "updated_at": task.updated_at.isoformat(),
+        "beads_id": task.beads_id,
+        "working_prompt_path": task.working_prompt_path,
+        "handoff_prompt_path": task.handoff_prompt_path,
+        "builder_session_id": task.builder_session_id,
+        "session_id": session_id,
+        "event_count": event_count,
+        "first_event_id": first_event_id,
+        "last_event_id": last_event_id,
+        "archive_path": archive_path,
+    }
@@ -6,9 +6,14 @@ from typing import Callable, TYPE_CHECKING, Any
 from .models import InboxItem, create_build_completed_payload, create_build_failed_payload
 
 if TYPE_CHECKING:
+    from .change_feed import Subscription
+    from .models import ConversatorTask
     from .state import StateStore
     from .builder_client import BuilderRegistry
 
+# Task statuses whose builders are polled for completion
+RUNNING_STATUSES = ("running", "handed_off", "dispatched")
+
 
 class BuilderMonitor:
     """Monitors builder tasks and emits completion events."""
@@ -24,7 +29,7 @@ class BuilderMonitor:
         Args:
             state: State store for task tracking
             builders: Registry of builder clients
-            interval: Polling interval in seconds
+            interval: Builder polling interval in seconds
         """
         self.state = state
         self.builders = builders
@@ -32,6 +37,10 @@ class BuilderMonitor:
         self._running = False
         self._completion_callback: Callable[[str, str, dict], Any] | None = None
         self._task: asyncio.Task | None = None
+        # Running tasks (task_id -> title), kept current from the change feed
+        self._running_tasks: dict[str, str] = {}
+        self._subscription: "Subscription | None" = None
+        self._watch_task: asyncio.Task | None = None
 
     async def start(
         self,
@@ -45,18 +54,47 @@ class BuilderMonitor:
         """
         self._running = True
         self._completion_callback = on_completion
+
+        # Subscribe before loading so no status change slips in between
+        self._subscription = self.state.changes.subscribe()
+        for task in await self.state.aio.get_active_tasks():
+            self._track(task)
+
+        self._watch_task = asyncio.create_task(self._watch_changes())
         self._task = asyncio.create_task(self._monitor_loop())
 
     async def stop(self) -> None:
         """Stop the monitoring loop."""
         self._running = False
-        if self._task:
-            self._task.cancel()
+        if self._subscription:
+            self._subscription.close()
+            self._subscription = None
+        for task in (self._watch_task, self._task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._watch_task = None
+        self._task = None
+
+    def _track(self, task: "ConversatorTask | None") -> None:
+        """Add or drop a task from the running set based on its status."""
+        if task is None:
+            return
+        if task.status in RUNNING_STATUSES:
+            self._running_tasks[task.task_id] = task.title
+        else:
+            self._running_tasks.pop(task.task_id, None)
+
+    async def _watch_changes(self) -> None:
+        """Keep the running set current from committed task events."""
+        async for event in self._subscription:
             try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
-            self._task = None
+                self._track(await self.state.aio.get_task(event.task_id))
+            except Exception as e:
+                print(f"[Monitor] Error tracking task {event.task_id[:8]}: {e}")
 
     async def _monitor_loop(self) -> None:
         """Main monitoring loop."""
@@ -69,15 +107,11 @@ class BuilderMonitor:
 
     async def _check_running_tasks(self) -> None:
         """Check all running tasks for completion."""
-        running_tasks = [
-            t for t in self.state.get_active_tasks()
-            if t.status in ("running", "handed_off", "dispatched")
-        ]
-
-        for task in running_tasks:
-            status = await self._check_task_status(task.task_id)
+        for task_id, title in list(self._running_tasks.items()):
+            status = await self._check_task_status(task_id)
             if status in ("completed", "failed"):
-                await self._handle_completion(task.task_id, task.title, status)
+                self._running_tasks.pop(task_id, None)
+                await self._handle_completion(task_id, title, status)
 
     async def _check_task_status(self, task_id: str) -> str | None:
         """Check builder status for a task.
@@ -111,13 +145,13 @@ class BuilderMonitor:
         """
         # Emit event to update task state
         if status == "completed":
-            self.state.update_task_status(
+            await self.state.aio.update_task_status(
                 task_id,
                 "BuildCompleted",
                 create_build_completed_payload(task_id, {})
             )
         else:
-            self.state.update_task_status(
+            await self.state.aio.update_task_status(
                 task_id,
                 "BuildFailed",
                 create_build_failed_payload(task_id, "Build failed")
@@ -127,7 +161,7 @@ class BuilderMonitor:
         severity = "success" if status == "completed" else "error"
         summary = f"Task '{title}' {status}"
 
-        self.state.add_inbox_item(InboxItem(
+        await self.state.aio.add_inbox_item(InboxItem(
             severity=severity,
             summary=summary,
             refs={"task_id": task_id}
@@ -156,7 +190,7 @@ async def create_monitor(
     Args:
         state: State store
         builders: Builder registry
-        interval: Polling interval
+        interval: Builder polling interval
         on_completion: Completion callback
 
     Returns:
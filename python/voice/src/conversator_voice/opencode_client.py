@@ -6,7 +6,9 @@ Uses the OpenCode HTTP server API (v1.1+):
 - GET  /session/:id/message
 - GET  /agent
 
-Note: /event is a global SSE bus and is not relied on for message content here.
+When the /event SSE bus is connected, replies are assembled from its
+message.updated / message.part.updated events and resolve as soon as the
+assistant message completes; the message list is polled only as a fallback.
 """
 
 from __future__ import annotations
@@ -20,35 +22,155 @@ from typing import Any, AsyncIterator, Awaitable, Callable
 import aiofiles
 import httpx
 
+from .opencode_sse_client import OpenCodeSSEClient
+from .opencode_transport import OpenCodeTransport, get_transport
+
+# Answers that mean a wrong base_url or missing credentials, not a live OpenCode API
+_UNREACHABLE_STATUSES = (401, 403, 404)
+
+
+class ConnectionHealth:
+    """Cached liveness of an OpenCode server.
+
+    Every request outcome updates the cache, so on the healthy path no
+    separate probe is needed. A success is trusted for `ttl` seconds; a
+    failure only for `failure_ttl` seconds, so recovery is noticed quickly.
+    """
+
+    def __init__(self, ttl: float = 30.0, failure_ttl: float = 2.0):
+        """Initialize the tracker.
+
+        Args:
+            ttl: Seconds a success is trusted without re-probing
+            failure_ttl: Seconds a failure is trusted without re-probing
+        """
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.healthy: bool | None = None
+        self.checked_at = 0.0
+        self.consecutive_failures = 0
+        self.last_error: str | None = None
+        self.probes = 0
+
+    def record_success(self) -> None:
+        """Record a successful request."""
+        self.healthy = True
+        self.checked_at = time.monotonic()
+        self.consecutive_failures = 0
+
+    def record_failure(self, error: str) -> None:
+        """Record a failed request."""
+        self.healthy = False
+        self.checked_at = time.monotonic()
+        self.consecutive_failures += 1
+        self.last_error = error
+
+    def is_fresh(self) -> bool:
+        """Whether the cached result can be used without probing."""
+        if self.healthy is None:
+            return False
+        ttl = self.ttl if self.healthy else self.failure_ttl
+        return time.monotonic() - self.checked_at < ttl
+
+    def to_dict(self) -> dict[str, Any]:
+        """Cached state for diagnostics."""
+        return {
+            "healthy": self.healthy,
+            "age_s": round(time.monotonic() - self.checked_at, 1) if self.checked_at else None,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+            "probes": self.probes,
+        }
+
 
 class OpenCodeClient:
     """Client for communicating with OpenCode agents via HTTP API."""
 
-    def __init__(self, base_url: str = "http://localhost:4158"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:4158",
+        event_stream: OpenCodeSSEClient | None = None,
+        transport: OpenCodeTransport | None = None,
+    ):
+        """Initialize the client.
+
+        Args:
+            base_url: OpenCode server URL
+            event_stream: Shared /event bus client; replies are awaited on it
+                          while it is connected (see start_event_stream)
+            transport: Pooled HTTP transport (default: shared one for base_url)
+        """
         self.base_url = base_url.rstrip("/")
-        # Message polling can run for a while; keep per-request timeouts modest but not tiny.
-        self.client = httpx.AsyncClient(timeout=httpx.Timeout(30.0, read=30.0))
+        self._event_stream = event_stream
+        self._owns_event_stream = False
+        # Keep-alive connections are shared with the SSE listener and builders;
+        # the transport's default read timeout (30s) applies per request
+        self.transport = transport or get_transport(self.base_url)
+        self.client = self.transport.client
         self.active_sessions: dict[str, str] = {}
+        self.health = ConnectionHealth()
         self._activity_callback: Callable[[str, str, str, str | None], Awaitable[None]] | None = (
             None
         )
 
+    async def start_event_stream(self) -> None:
+        """Connect to the /event bus so replies complete without polling."""
+        if self._event_stream is None:
+            self._event_stream = OpenCodeSSEClient(self.base_url, transport=self.transport)
+            self._owns_event_stream = True
+        await self._event_stream.start()
+
     async def close(self) -> None:
-        """Close the HTTP client."""
-        await self.client.aclose()
+        """Stop the owned event stream.
+
+        The pooled transport is shared and closed at shutdown by
+        opencode_transport.close_transports().
+        """
+        if self._event_stream and self._owns_event_stream:
+            await self._event_stream.stop()
 
-    async def health_check(self) -> bool:
-        """Check if OpenCode server is healthy."""
+    async def health_check(self, force: bool = False) -> bool:
+        """Check if OpenCode server is healthy.
+
+        Served from the health tracker while a recent request succeeded or
+        the event stream is connected; the server is only probed after a
+        failure or once the cached result expires.
+
+        Args:
+            force: Probe the server even if a cached result is available
+        """
+        if not force:
+            if self._event_stream and self._event_stream.connected:
+                return True
+            if self.health.is_fresh():
+                return bool(self.health.healthy)
+
+        self.health.probes += 1
         try:
-            response = await self.client.get(f"{self.base_url}/agent")
+            response = await self._request("GET", "/agent")
             return response.status_code == 200
         except httpx.RequestError:
             return False
 
+    async def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        """Send a request and record the outcome in the health tracker."""
+        try:
+            response = await self.client.request(method, f"{self.base_url}{path}", **kwargs)
+        except httpx.RequestError as e:
+            self.health.record_failure(str(e))
+            raise
+        status = response.status_code
+        if status >= 500 or status in _UNREACHABLE_STATUSES:
+            self.health.record_failure(f"HTTP {status} from {path}")
+        elif status < 400:
+            self.health.record_success()
+        # Other 4xx answers reject one request and say nothing about the server
+        return response
+
     async def list_agents(self) -> list[dict[str, Any]]:
         """List available agents from OpenCode."""
         try:
-            response = await self.client.get(f"{self.base_url}/agent")
+            response = await self._request("GET", "/agent")
             response.raise_for_status()
             return response.json()
         except httpx.RequestError:
@@ -76,8 +198,14 @@ class OpenCodeClient:
             # Never let telemetry crash the client.
             return
 
-    async def engage_subagent(self, agent: str, message: str) -> AsyncIterator[dict[str, Any]]:
-        """Create a new session and send a message to a specific agent."""
+    async def engage_subagent(
+        self, agent: str, message: str, stream: bool = False
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Create a new session and send a message to a specific agent.
+
+        With stream=True, "delta" events carry reply text as it is generated,
+        ahead of the final "message" and "complete" events.
+        """
         if not await self.health_check():
             yield {
                 "type": "error",
@@ -98,14 +226,18 @@ class OpenCodeClient:
             f"Engaging {agent}",
             message[:200] + "..." if len(message) > 200 else message,
         )
-        async for event in self._send_and_poll(session_id=session_id, agent=agent, message=message):
+        async for event in self._send_and_poll(
+            session_id=session_id, agent=agent, message=message, stream=stream
+        ):
             yield event
 
-    async def continue_session(self, agent: str, message: str) -> AsyncIterator[dict[str, Any]]:
-        """Continue an existing agent session."""
+    async def continue_session(
+        self, agent: str, message: str, stream: bool = False
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Continue an existing agent session (see engage_subagent for stream)."""
         session_id = self.active_sessions.get(agent)
         if not session_id:
-            async for event in self.engage_subagent(agent, message):
+            async for event in self.engage_subagent(agent, message, stream=stream):
                 yield event
             return
 
@@ -116,7 +248,9 @@ class OpenCodeClient:
             message[:200] + "..." if len(message) > 200 else message,
         )
 
-        async for event in self._send_and_poll(session_id=session_id, agent=agent, message=message):
+        async for event in self._send_and_poll(
+            session_id=session_id, agent=agent, message=message, stream=stream
+        ):
             yield event
 
     async def create_session(self, title: str) -> str:
@@ -132,9 +266,17 @@ class OpenCodeClient:
         return await self._create_session(title=title)
 
     async def send_to_session(
-        self, session_id: str, agent: str, message: str
+        self, session_id: str, agent: str, message: str, stream: bool = False
     ) -> AsyncIterator[dict[str, Any]]:
-        """Send a prompt to an existing session and poll for the response."""
+        """Send a prompt to an existing session and wait for the response.
+
+        Args:
+            session_id: OpenCode session ID
+            agent: Agent to address
+            message: Prompt text
+            stream: Also yield {"type": "delta", "content": text} events as the
+                    reply is generated, before the final message/complete pair
+        """
         if not await self.health_check():
             yield {
                 "type": "error",
@@ -151,11 +293,13 @@ class OpenCodeClient:
             message[:200] + "..." if len(message) > 200 else message,
         )
 
-        async for event in self._send_and_poll(session_id=session_id, agent=agent, message=message):
+        async for event in self._send_and_poll(
+            session_id=session_id, agent=agent, message=message, stream=stream
+        ):
             yield event
 
     async def _create_session(self, title: str) -> str:
-        response = await self.client.post(f"{self.base_url}/session", json={"title": title})
+        response = await self._request("POST", "/session", json={"title": title})
         response.raise_for_status()
         session = response.json()
         session_id = session.get("id") or session.get("session_id")
@@ -164,41 +308,147 @@ class OpenCodeClient:
         return session_id
 
     async def _list_messages(self, session_id: str) -> list[dict[str, Any]]:
-        response = await self.client.get(f"{self.base_url}/session/{session_id}/message")
+        response = await self._request("GET", f"/session/{session_id}/message")
         response.raise_for_status()
         return response.json()
 
-    async def _send_and_poll(
-        self, session_id: str, agent: str, message: str
-    ) -> AsyncIterator[dict[str, Any]]:
-        # Baseline assistant messages so we don't accidentally pick up an older response
-        baseline_assistant_ids: set[str] = set()
+    async def _baseline_assistant_ids(
+        self, session_id: str, before_ms: float | None = None
+    ) -> set[str]:
+        """Collect existing assistant message ids so older replies are ignored.
+
+        Args:
+            session_id: Session to inspect
+            before_ms: Only count messages created before this epoch-ms time
+        """
+        baseline: set[str] = set()
         try:
             for msg in await self._list_messages(session_id):
                 info = msg.get("info", msg)
-                if info.get("role") == "assistant":
-                    msg_id = info.get("id") or info.get("messageID")
-                    if msg_id:
-                        baseline_assistant_ids.add(msg_id)
+                if info.get("role") != "assistant":
+                    continue
+                created = (info.get("time") or {}).get("created")
+                if before_ms is not None and (created is None or created >= before_ms):
+                    continue
+                msg_id = info.get("id") or info.get("messageID")
+                if msg_id:
+                    baseline.add(msg_id)
         except Exception:
-            baseline_assistant_ids = set()
+            return set()
+        return baseline
 
-        # Send the message asynchronously
-        response = await self.client.post(
-            f"{self.base_url}/session/{session_id}/prompt_async",
-            json={"agent": agent, "parts": [{"type": "text", "text": message}]},
-        )
-        response.raise_for_status()
+    async def _send_and_poll(
+        self, session_id: str, agent: str, message: str, stream: bool = False
+    ) -> AsyncIterator[dict[str, Any]]:
+        # Follow the reply on the /event bus when it is connected; otherwise
+        # (or if the stream drops mid-reply) poll the message list.
+        bus = self._event_stream
+        events = bus.subscribe_session(session_id) if bus and bus.connected else None
+        try:
+            baseline = set() if events is not None else await self._baseline_assistant_ids(session_id)
+
+            # Send the message asynchronously
+            sent_ms = time.time() * 1000
+            response = await self._request(
+                "POST",
+                f"/session/{session_id}/prompt_async",
+                json={"agent": agent, "parts": [{"type": "text", "text": message}]},
+            )
+            response.raise_for_status()
+            await self._emit_activity(
+                agent, "request_sent", f"Request sent to {agent}", f"Session: {session_id[:8]}..."
+            )
+
+            start_time = time.time()
+            reply = _ReplyTracker(sent_ms)
+            if events is not None:
+                async for event in self._await_reply_events(
+                    agent, events, reply, start_time, stream
+                ):
+                    yield event
+                if reply.finished:
+                    return
+                baseline = await self._baseline_assistant_ids(session_id, before_ms=sent_ms)
+
+            async for event in self._poll_for_reply(
+                session_id, agent, baseline, start_time, reply.message_id,
+                streamed_chars=reply.streamed_chars if stream else None,
+            ):
+                yield event
+        finally:
+            if events is not None:
+                bus.unsubscribe_session(session_id, events)
+
+    async def _await_reply_events(
+        self,
+        agent: str,
+        events: asyncio.Queue,
+        reply: "_ReplyTracker",
+        start_time: float,
+        stream: bool = False,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Resolve a request from /event bus events as soon as the reply completes.
+
+        Returns without setting reply.finished if the stream disconnects, so
+        the caller can fall back to polling.
+        """
+        timeout_s = 120.0
+        while (remaining := timeout_s - (time.time() - start_time)) > 0:
+            try:
+                event_type, data = await asyncio.wait_for(events.get(), timeout=min(remaining, 2.0))
+            except asyncio.TimeoutError:
+                if not self._event_stream.connected:
+                    print(f"[OpenCode] Event stream lost while waiting for {agent}; polling")
+                    return
+                continue
+
+            reply.feed(event_type, data)
+            if stream and (delta := reply.take_delta()):
+                yield {"type": "delta", "content": delta}
+            if reply.error:
+                reply.finished = True
+                yield {"type": "error", "content": f"OpenCode error: {reply.error}"}
+                return
+            if reply.complete:
+                reply.finished = True
+                async for event in self._finish_reply(agent, reply.content, start_time):
+                    yield event
+                return
+
+        reply.finished = True
+        await self._emit_activity(agent, "error", f"{agent} timed out", None)
+        yield {"type": "error", "content": f"Timeout waiting for {agent} response"}
+
+    async def _finish_reply(
+        self, agent: str, content: str, start_time: float
+    ) -> AsyncIterator[dict[str, Any]]:
+        duration_ms = (time.time() - start_time) * 1000
         await self._emit_activity(
-            agent, "request_sent", f"Request sent to {agent}", f"Session: {session_id[:8]}..."
+            agent,
+            "completed",
+            f"{agent} finished ({duration_ms / 1000:.1f}s)",
+            content[:500] + "..." if len(content) > 500 else content,
         )
+        yield {"type": "message", "content": content}
+        yield {"type": "complete", "content": content, "duration_ms": duration_ms}
 
-        # Poll for a new assistant message
-        start_time = time.time()
+    async def _poll_for_reply(
+        self,
+        session_id: str,
+        agent: str,
+        baseline_assistant_ids: set[str],
+        start_time: float,
+        active_message_id: str | None = None,
+        streamed_chars: int | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Poll the message list until a new assistant reply completes.
+
+        streamed_chars enables delta events; it is the length of the reply
+        text already streamed to the caller (0 for a fresh request).
+        """
         timeout_s = 120.0
         poll_interval = 0.5
-        active_message_id: str | None = None
-        last_content_length = 0
+        last_content_length = streamed_chars or 0
         stable_polls = 0  # Fallback completion when status is missing
 
         while time.time() - start_time < timeout_s:
@@ -213,9 +463,7 @@ class OpenCodeClient:
                 info = msg.get("info", msg)
                 error = info.get("error")
                 if error:
-                    error_data = error.get("data", {}) if isinstance(error, dict) else {}
-                    error_msg = error_data.get("message") or str(error)
-                    yield {"type": "error", "content": f"OpenCode error: {error_msg}"}
+                    yield {"type": "error", "content": f"OpenCode error: {_error_message(error)}"}
                     return
 
             # Find candidate assistant messages not in baseline
@@ -257,14 +505,11 @@ class OpenCodeClient:
                     content += part.get("text", "")
 
             msg_status = chosen_info.get("status", "")
-            is_complete = (
-                msg_status in ("done", "complete", "finished", "success")
-                or chosen_info.get("complete") is True
-                or chosen_info.get("finished") is True
-                or chosen_info.get("finish") is not None
-            )
+            is_complete = _is_complete(chosen_info)
 
             if content and len(content) > last_content_length:
+                if streamed_chars is not None:
+                    yield {"type": "delta", "content": content[last_content_length:]}
                 last_content_length = len(content)
                 stable_polls = 0
             elif content and len(content) == last_content_length:
@@ -277,15 +522,8 @@ class OpenCodeClient:
                 is_complete = True
 
             if is_complete:
-                duration_ms = (time.time() - start_time) * 1000
-                await self._emit_activity(
-                    agent,
-                    "completed",
-                    f"{agent} finished ({duration_ms / 1000:.1f}s)",
-                    content[:500] + "..." if len(content) > 500 else content,
-                )
-                yield {"type": "message", "content": content}
-                yield {"type": "complete", "content": content, "duration_ms": duration_ms}
+                async for event in self._finish_reply(agent, content, start_time):
+                    yield event
                 return
 
             await asyncio.sleep(poll_interval)
@@ -326,3 +564,94 @@ class OpenCodeClient:
     def clear_session(self, agent: str) -> None:
         """Clear cached session for an agent."""
         self.active_sessions.pop(agent, None)
+
+
+def _is_complete(info: dict[str, Any]) -> bool:
+    """Check the completion signals different OpenCode builds put on a message."""
+    return (
+        info.get("status") in ("done", "complete", "finished", "success")
+        or info.get("complete") is True
+        or info.get("finished") is True
+        or info.get("finish") is not None
+        or (info.get("time") or {}).get("completed") is not None
+    )
+
+
+def _error_message(error: Any) -> str:
+    error_data = error.get("data", {}) if isinstance(error, dict) else {}
+    return error_data.get("message") or str(error)
+
+
+class _ReplyTracker:
+    """Assembles one assistant reply for a session from /event bus events.
+
+    The reply is the first assistant message that answers the prompt: its
+    parentID is a user message posted at or after sent_ms, or it was itself
+    created then. Older assistant messages still streaming or re-emitted on
+    the bus are ignored. The reply's text is rebuilt from
+    message.part.updated events keyed by part id.
+    """
+
+    def __init__(self, sent_ms: float = 0.0) -> None:
+        self.sent_ms = sent_ms
+        self._prompt_ids: set[str] = set()  # User messages posted since sent_ms
+        self.message_id: str | None = None
+        self.complete = False
+        self.finished = False
+        self.error: str | None = None
+        self.streamed_chars = 0
+        self._texts: dict[str, dict[str, str]] = {}  # message id -> part id -> text
+
+    @property
+    def content(self) -> str:
+        return "".join(self._texts.get(self.message_id or "", {}).values())
+
+    def take_delta(self) -> str:
+        """Return reply text added since the last call."""
+        content = self.content
+        if len(content) <= self.streamed_chars:
+            return ""
+        delta = content[self.streamed_chars:]
+        self.streamed_chars = len(content)
+        return delta
+
+    def feed(self, event_type: str, data: dict[str, Any]) -> None:
+        """Apply one event for the session."""
+        properties = data.get("properties", data)
+
+        if event_type in ("session.error", "session.status.error"):
+            self.error = _error_message(properties.get("error", "Unknown error"))
+        elif event_type == "message.updated":
+            info = properties.get("info", properties)
+            msg_id = info.get("id") or info.get("messageID")
+            created = (info.get("time") or {}).get("created")
+            is_new = created is not None and created >= self.sent_ms
+            if info.get("role") == "user":
+                if is_new and msg_id:
+                    self._prompt_ids.add(msg_id)
+                return
+            if info.get("role") != "assistant":
+                return
+            if self.message_id is None:
+                if not (is_new or info.get("parentID") in self._prompt_ids):
+                    return
+                self.message_id = msg_id
+            elif msg_id != self.message_id:
+                return
+            if info.get("error"):
+                self.error = _error_message(info["error"])
+            elif _is_complete(info):
+                self.complete = True
+        elif event_type in ("message.part.updated", "message.part", "message.delta"):
+            part = properties.get("part") or {}
+            if not isinstance(part, dict) or part.get("type", "text") != "text":
+                return
+            msg_id = part.get("messageID") or properties.get("messageID")
+            part_id = part.get("id") or "text"
+            texts = self._texts.setdefault(msg_id, {})
+            if "text" in part:
+                texts[part_id] = part.get("text") or ""
+            else:
+                texts[part_id] = texts.get(part_id, "") + (properties.get("delta") or "")
+        elif event_type == "session.idle" and self.message_id:
+            self.complete = True
@@ -19,7 +19,7 @@ import sys
 from pathlib import Path
 from typing import Optional
 
-import httpx
+from .opencode_transport import OpenCodeTransport, get_transport
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +42,7 @@ class OpenCodeManager:
         start_timeout: float = 30.0,
         config_dir: str = ".conversator/opencode",
         agents_source: str = "conversator/agents",
+        transport: OpenCodeTransport | None = None,
     ):
         """Initialize OpenCode manager.
 
@@ -51,6 +52,7 @@ class OpenCodeManager:
             start_timeout: Timeout in seconds for OpenCode to become healthy
             config_dir: Isolated OpenCode config directory (relative to working_dir)
             agents_source: Path to versioned agents (relative to working_dir)
+            transport: Pooled HTTP transport (default: shared one for the port)
         """
         self.port = port
         self.working_dir = Path(working_dir or Path.cwd())
@@ -60,6 +62,7 @@ class OpenCodeManager:
         self.process: Optional[subprocess.Popen] = None
         self._started_by_us = False
         self._base_url = f"http://localhost:{port}"
+        self.transport = transport or get_transport(self._base_url)
 
     async def start(self) -> bool:
         """Start OpenCode with proper setup if not already running.
@@ -248,9 +251,8 @@ class OpenCodeManager:
             True if healthy
         """
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self._base_url}/agent")
-                return response.status_code == 200
+            response = await self.transport.client.get(f"{self._base_url}/agent", timeout=5.0)
+            return response.status_code == 200
         except Exception:
             return False
 
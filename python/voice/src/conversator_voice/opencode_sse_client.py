@@ -20,11 +20,23 @@ from uuid import uuid4
 
 import httpx
 
+from .broadcast_coalescer import BroadcastCoalescer
+from .message_cache import CachedMessage, SessionMessageCache
+from .opencode_transport import OpenCodeTransport, get_transport
+from .session_store import SessionStore, SessionStoreLimits
+from .sse_parser import SSEDecoder, SSEEvent, loads_event_data
+
 if TYPE_CHECKING:
     from .dashboard.websocket import ConnectionManager
 
 logger = logging.getLogger(__name__)
 
+# Decoded events buffered between the socket reader and the handlers
+EVENT_QUEUE_SIZE = 1024
+
+# Event payloads at least this large are JSON-decoded in a worker thread
+LARGE_EVENT_BYTES = 256 * 1024
+
 
 @dataclass
 class OpenCodeSession:
@@ -52,6 +64,20 @@ class OpenCodeSession:
             "source": self.source,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "OpenCodeSession":
+        """Rebuild a session from to_dict() output."""
+        return cls(
+            session_id=data["session_id"],
+            agent_name=data.get("agent_name", "unknown"),
+            status=data.get("status", "active"),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            updated_at=datetime.fromisoformat(data["updated_at"]),
+            task_id=data.get("task_id"),
+            message_count=data.get("message_count", 0),
+            source=data.get("source", "unknown"),
+        )
+
 
 @dataclass
 class OpenCodeMessage:
@@ -81,6 +107,23 @@ class OpenCodeMessage:
 # Type for session callback: (session_id, event_type, data) -> None
 SessionCallback = Callable[[str, str, dict], Awaitable[None]]
 
+# Type for index callback: (session_id, tracked) -> None; tracked is False once
+# the client no longer knows the session
+IndexCallback = Callable[[str, bool], None]
+
+
+def event_session_id(data: dict) -> str | None:
+    """Find the session ID in an event payload, wherever this build puts it."""
+    properties = data.get("properties", data)
+    info = properties.get("info") if isinstance(properties.get("info"), dict) else {}
+    part = properties.get("part") if isinstance(properties.get("part"), dict) else {}
+    return (
+        properties.get("sessionID")
+        or properties.get("session_id")
+        or info.get("sessionID")
+        or part.get("sessionID")
+    )
+
 
 class OpenCodeSSEClient:
     """SSE client for real-time OpenCode event streaming.
@@ -93,22 +136,52 @@ class OpenCodeSSEClient:
         self,
         base_url: str,
         ws_manager: "ConnectionManager | None" = None,
+        transport: OpenCodeTransport | None = None,
+        limits: SessionStoreLimits | None = None,
+        coalesce_window: float | None = None,
     ):
         """Initialize SSE client.
 
         Args:
             base_url: OpenCode server URL
             ws_manager: Dashboard WebSocket manager for broadcasting
+            transport: Pooled HTTP transport (default: shared one for base_url)
+            limits: Memory bounds for tracked sessions (default: configured limits)
+            coalesce_window: Seconds to merge streaming updates for before
+                broadcasting (default: configured window)
         """
         self.base_url = base_url
+        self.transport = transport or get_transport(base_url)
         self.ws_manager = ws_manager
+        # Merges per-token chunk and tool updates into one broadcast per window
+        self.coalescer = BroadcastCoalescer(ws_manager, coalesce_window) if ws_manager else None
         self._sessions: dict[str, OpenCodeSession] = {}
-        self._messages: dict[str, dict[str, OpenCodeMessage]] = {}  # session_id -> msg_id -> msg
+        # session_id -> msg_id -> msg, kept in message ID (= creation) order
+        self._messages: dict[str, dict[str, OpenCodeMessage]] = {}
+        # Sessions whose message dict received an out-of-order ID
+        self._unordered: set[str] = set()
+        self._index_callbacks: list[IndexCallback] = []
+        # Raw messages with part versions; fed by SSE, topped up by tail fetches
+        self.message_cache = SessionMessageCache()
+        # Evicts inactive sessions from all of the above
+        self.store = SessionStore(limits)
         self._running = False
         self._task: asyncio.Task | None = None
         self._reconnect_delay = 1.0
         self._max_reconnect_delay = 30.0
         self._session_callbacks: list[SessionCallback] = []
+        # Raw event queues for callers awaiting a specific session
+        self._session_queues: dict[str, list[asyncio.Queue]] = {}
+        self._connected = False
+        # Resume point and server-requested reconnect delay (SSE id:/retry:)
+        self._last_event_id: str | None = None
+        self._retry_delay = 1.0
+        self._event_queue: asyncio.Queue | None = None
+        self._events_received = 0
+        self._bytes_received = 0
+        # Bumped on every (re)connect; sessions synced in an older epoch may
+        # have missed deltas while the stream was down
+        self._stream_epoch = 0
         # Fallback polling state
         self._sse_failures = 0
         self._max_sse_failures = 3
@@ -123,6 +196,41 @@ class OpenCodeSSEClient:
         """
         self._session_callbacks.append(callback)
 
+    def add_index_callback(self, callback: IndexCallback) -> None:
+        """Add callback notified when a session starts or stops being tracked.
+
+        Args:
+            callback: Function(session_id, tracked)
+        """
+        self._index_callbacks.append(callback)
+
+    def _notify_index(self, session_id: str, tracked: bool) -> None:
+        for callback in self._index_callbacks:
+            callback(session_id, tracked)
+
+    def _track_session(self, session: OpenCodeSession) -> None:
+        """Store a session, announcing it to index callbacks if new."""
+        known = session.session_id in self._sessions or session.session_id in self._messages
+        self._sessions[session.session_id] = session
+        if not known:
+            self._notify_index(session.session_id, True)
+
+    def _session_messages(self, session_id: str) -> dict[str, OpenCodeMessage]:
+        """Message dict of a session, created (and announced) on first use."""
+        session_msgs = self._messages.get(session_id)
+        if session_msgs is None:
+            session_msgs = self._messages[session_id] = {}
+            if session_id not in self._sessions:
+                self._notify_index(session_id, True)
+        return session_msgs
+
+    def _add_message(self, msg: OpenCodeMessage) -> None:
+        """Insert a message, noting when it arrives out of ID order."""
+        session_msgs = self._session_messages(msg.session_id)
+        if session_msgs and msg.message_id < next(reversed(session_msgs)):
+            self._unordered.add(msg.session_id)
+        session_msgs[msg.message_id] = msg
+
     async def _emit_session_event(self, session_id: str, event_type: str, data: dict) -> None:
         """Emit session event to callbacks."""
         for callback in self._session_callbacks:
@@ -131,6 +239,32 @@ class OpenCodeSSEClient:
             except Exception as e:
                 logger.error(f"Session callback error: {e}")
 
+    def subscribe_session(self, session_id: str) -> asyncio.Queue:
+        """Receive raw (event_type, data) tuples for one session.
+
+        Args:
+            session_id: Session to follow
+
+        Returns:
+            Queue fed with every event for the session until unsubscribed
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._session_queues.setdefault(session_id, []).append(queue)
+        return queue
+
+    def unsubscribe_session(self, session_id: str, queue: asyncio.Queue) -> None:
+        """Stop feeding a queue returned by subscribe_session."""
+        queues = self._session_queues.get(session_id, [])
+        if queue in queues:
+            queues.remove(queue)
+        if not queues:
+            self._session_queues.pop(session_id, None)
+
+    @property
+    def connected(self) -> bool:
+        """Whether the SSE stream is currently connected."""
+        return self._connected
+
     @property
     def sessions(self) -> dict[str, OpenCodeSession]:
         """Get all tracked sessions."""
@@ -142,20 +276,110 @@ class OpenCodeSSEClient:
         return {
             "running": self._running,
             "mode": "polling" if self._polling_mode else "sse",
+            "connected": self._connected,
             "sse_failures": self._sse_failures,
             "max_sse_failures": self._max_sse_failures,
             "session_count": len(self._sessions),
             "base_url": self.base_url,
+            "events_received": self._events_received,
+            "bytes_received": self._bytes_received,
+            "event_queue_depth": self._event_queue.qsize() if self._event_queue else 0,
+            "last_event_id": self._last_event_id,
+            "message_cache": self.message_cache.stats(),
+            "memory": self.memory_usage(),
+            "broadcast": self.coalescer.stats() if self.coalescer else None,
+        }
+
+    def memory_usage(self) -> dict:
+        """Sessions, messages and part bytes held, with eviction counters."""
+        return {
+            **self.store.stats(),
+            "sessions": len(self._sessions),
+            "messages": sum(len(msgs) for msgs in self._messages.values()),
+            "part_bytes": self.message_cache.total_bytes,
         }
 
+    async def _touch_session(self, session_id: str) -> None:
+        """Record activity on a session and evict others if over budget.
+
+        A session spilled to disk is restored first, so new events extend its
+        history and metadata instead of starting over (and orphaning the file).
+        """
+        if (
+            session_id not in self._sessions
+            and session_id not in self._messages
+            and self.store.has_spilled(session_id)
+        ):
+            await self._restore_session(session_id)
+        self.store.touch(session_id)
+        await self._enforce_limits()
+
+    async def _enforce_limits(self) -> None:
+        """Evict idle or least recently active sessions beyond the limits."""
+        cache = self.message_cache
+        if not self.store.needs_eviction(cache.total_bytes):
+            return
+        victims = self.store.select_evictions(
+            cache.total_bytes,
+            cache.session_bytes,
+            # Never evict a session a caller is awaiting a reply on
+            pinned=lambda session_id: session_id in self._session_queues,
+        )
+        for session_id in victims:
+            await self._evict_session(session_id)
+
+    async def _evict_session(self, session_id: str) -> None:
+        session = self._sessions.pop(session_id, None)
+        messages = self.message_cache.messages(session_id)
+        if messages:
+            await self.store.spill(session_id, {
+                "session": session.to_dict() if session else None,
+                "messages": [message.to_raw() for message in messages],
+                "loaded": self.message_cache.is_loaded(session_id),
+            })
+        self._messages.pop(session_id, None)
+        self._unordered.discard(session_id)
+        self.message_cache.drop(session_id)
+        self.store.forget(session_id)
+        self.store.evictions += 1
+        # A spilled session can still be found (and restored) through the index
+        if not messages or not self.store.has_spilled(session_id):
+            self._notify_index(session_id, False)
+        logger.debug(f"Evicted session {session_id[:8]}... from memory")
+
+    async def _restore_session(self, session_id: str) -> None:
+        """Reload a spilled session so only its new tail is fetched."""
+        record = await self.store.restore(session_id)
+        if not record:
+            return
+        if record.get("session"):
+            self._track_session(OpenCodeSession.from_dict(record["session"]))
+        cache = self.message_cache
+        cache.merge(
+            session_id,
+            record.get("messages", []),
+            since_seq=cache.seq,
+            complete=record.get("loaded", False),
+        )
+        restored = [self._to_message(session_id, message) for message in cache.messages(session_id)]
+        if restored:
+            self._session_messages(session_id)
+            self._messages[session_id] = {msg.message_id: msg for msg in restored}
+
     def get_session(self, session_id: str) -> OpenCodeSession | None:
         """Get session by ID."""
         return self._sessions.get(session_id)
 
     def get_session_messages(self, session_id: str) -> list[OpenCodeMessage]:
-        """Get messages for a session."""
-        session_msgs = self._messages.get(session_id, {})
-        return sorted(session_msgs.values(), key=lambda m: m.created_at)
+        """Get messages for a session, oldest first."""
+        session_msgs = self._messages.get(session_id)
+        if not session_msgs:
+            return []
+        if session_id in self._unordered:
+            # Rare (e.g. history fetched after live messages); re-sort once
+            session_msgs = self._messages[session_id] = dict(sorted(session_msgs.items()))
+            self._unordered.discard(session_id)
+        return list(session_msgs.values())
 
     async def start(self) -> None:
         """Start SSE listener in background.
@@ -189,6 +413,9 @@ class OpenCodeSSEClient:
             except asyncio.CancelledError:
                 pass
             self._task = None
+        if self.coalescer:
+            await self.coalescer.flush()
+            self.coalescer.close()
         logger.info("OpenCode SSE client stopped")
 
     async def _listen_loop(self) -> None:
@@ -234,7 +461,7 @@ class OpenCodeSSEClient:
             if self._sse_failures == 0:
                 logger.info("Retrying SSE connection...")
                 self._polling_mode = False
-                self._reconnect_delay = 1.0
+                self._reconnect_delay = self._retry_delay
 
         except Exception as e:
             logger.debug(f"Polling error: {e}")
@@ -256,75 +483,107 @@ class OpenCodeSSEClient:
             f"{self.base_url}/api/event/subscribe",
         )
 
-        async with httpx.AsyncClient(timeout=None, trust_env=False) as client:
-            last_error: Exception | None = None
+        # Reconnects reuse the pooled transport; only reads are unbounded
+        client = self.transport.client
+        stream_timeout = httpx.Timeout(None, connect=self.transport.settings.connect_timeout)
+        last_error: Exception | None = None
 
-            for url in candidates:
-                try:
-                    async with client.stream(
-                        "GET",
-                        url,
-                        headers={"Accept": "text/event-stream"},
-                    ) as response:
-                        if response.status_code != 200:
-                            logger.debug(f"SSE candidate {url} returned {response.status_code}")
-                            continue
-
-                        content_type = response.headers.get("content-type", "")
-                        if "text/event-stream" not in content_type:
-                            logger.debug(
-                                f"SSE candidate {url} returned non-SSE content-type: {content_type}"
-                            )
-                            continue
-
-                        logger.info("Connected to OpenCode SSE stream")
-                        print(f"[SSE] Connected to {url} - listening for events")
-                        self._reconnect_delay = 1.0  # Reset on successful connection
-
-                        event_type = ""
-                        event_data = ""
-
-                        async for line in response.aiter_lines():
-                            if not self._running:
-                                return
-
-                            line = line.strip()
-
-                            if line.startswith("event:"):
-                                event_type = line[6:].strip()
-                                continue
-
-                            if line.startswith("data:"):
-                                chunk = line[5:].strip()
-                                # Some servers may send multi-line data; concatenate.
-                                event_data = (
-                                    (event_data + "\n" + chunk).strip() if event_data else chunk
-                                )
-                                continue
-
-                            if line == "" and event_data:
-                                try:
-                                    data = json.loads(event_data)
-                                    resolved_type = data.get("type") or event_type
-                                    await self._handle_event(resolved_type, data)
-                                except json.JSONDecodeError as e:
-                                    logger.warning(f"Failed to parse SSE data: {e}")
-                                except Exception as e:
-                                    logger.error(f"Error handling SSE event: {e}")
-
-                                event_type = ""
-                                event_data = ""
-
-                        # Stream ended; try next candidate / reconnect loop.
-                        last_error = RuntimeError("SSE stream ended")
+        for url in candidates:
+            try:
+                headers = {"Accept": "text/event-stream"}
+                if self._last_event_id:
+                    headers["Last-Event-ID"] = self._last_event_id
+                async with client.stream(
+                    "GET", url, headers=headers, timeout=stream_timeout
+                ) as response:
+                    if response.status_code != 200:
+                        logger.debug(f"SSE candidate {url} returned {response.status_code}")
+                        continue
 
-                except asyncio.CancelledError:
-                    raise
-                except Exception as e:
-                    last_error = e
-                    continue
+                    content_type = response.headers.get("content-type", "")
+                    if "text/event-stream" not in content_type:
+                        logger.debug(
+                            f"SSE candidate {url} returned non-SSE content-type: {content_type}"
+                        )
+                        continue
+
+                    logger.info("Connected to OpenCode SSE stream")
+                    print(f"[SSE] Connected to {url} - listening for events")
+                    self._reconnect_delay = self._retry_delay  # Reset on successful connection
+                    self._stream_epoch += 1
+                    self._connected = True
+
+                    if not await self._consume_stream(response):
+                        self._connected = False
+                        return
+
+                    # Stream ended; try next candidate / reconnect loop.
+                    self._connected = False
+                    last_error = RuntimeError("SSE stream ended")
+
+            except asyncio.CancelledError:
+                self._connected = False
+                raise
+            except Exception as e:
+                self._connected = False
+                last_error = e
+                continue
+
+        raise RuntimeError(f"No OpenCode SSE endpoint available: {last_error}")
+
+    async def _consume_stream(self, response: httpx.Response) -> bool:
+        """Decode a connected stream and hand its events to the dispatcher.
 
-            raise RuntimeError(f"No OpenCode SSE endpoint available: {last_error}")
+        The socket is read as raw bytes and split into events here; JSON
+        decoding and handlers run in a separate task fed through a bounded
+        queue, so a slow handler delays reads only once the queue is full.
+
+        Returns:
+            False if the client was stopped, True when the stream ended
+        """
+        decoder = SSEDecoder(last_event_id=self._last_event_id)
+        queue: asyncio.Queue[SSEEvent | None] = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+        self._event_queue = queue
+        dispatcher = asyncio.create_task(self._dispatch_events(queue))
+        try:
+            async for chunk in response.aiter_bytes():
+                if not self._running:
+                    break
+                for event in decoder.feed(chunk):
+                    await queue.put(event)
+                self._last_event_id = decoder.last_event_id
+                if decoder.retry is not None:
+                    self._retry_delay = decoder.retry / 1000
+        except asyncio.CancelledError:
+            dispatcher.cancel()
+            raise
+        finally:
+            self._bytes_received += decoder.bytes
+            if not dispatcher.cancelled() and not dispatcher.cancelling():
+                # Handle everything already received, even if the read failed
+                await queue.put(None)
+                await dispatcher
+        return self._running
+
+    async def _dispatch_events(self, queue: "asyncio.Queue[SSEEvent | None]") -> None:
+        """Decode queued events and run their handlers, in stream order."""
+        while True:
+            event = await queue.get()
+            if event is None:
+                return
+            self._events_received += 1
+            try:
+                if len(event.data) >= LARGE_EVENT_BYTES:
+                    # Big tool outputs would stall the loop while decoding
+                    data = await asyncio.to_thread(loads_event_data, event.data)
+                else:
+                    data = loads_event_data(event.data)
+                event_type = event.event if event.event != "message" else ""
+                await self._handle_event(data.get("type") or event_type, data)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Failed to parse SSE data: {e}")
+            except Exception as e:
+                logger.error(f"Error handling SSE event: {e}")
 
     async def _handle_event(self, event_type: str, data: dict) -> None:
         """Route SSE events to appropriate handlers.
@@ -340,6 +599,11 @@ class OpenCodeSSEClient:
         if not event_type:
             return
 
+        if self._session_queues:
+            session_id = event_session_id(data)
+            for queue in self._session_queues.get(session_id, ()):
+                queue.put_nowait((event_type, data))
+
         # Map event types to handlers
         if event_type in ("session.updated", "session.status"):
             await self._on_session_updated(data)
@@ -372,6 +636,7 @@ class OpenCodeSSEClient:
         )
         if not session_id:
             return
+        await self._touch_session(session_id)
 
         # Determine agent name from title or agent field
         title = info.get("title") or properties.get("title") or ""
@@ -405,8 +670,8 @@ class OpenCodeSSEClient:
             )
             if status_type:
                 session.status = status_type
-            self._sessions[session_id] = session
-            self._messages[session_id] = {}
+            self._track_session(session)
+            self._session_messages(session_id)
 
             # Broadcast new session to dashboard
             if self.ws_manager:
@@ -423,8 +688,9 @@ class OpenCodeSSEClient:
             if status_type:
                 session.status = status_type
 
-            # Broadcast update to dashboard
-            if self.ws_manager:
+            # Broadcast update to dashboard, after any text still being merged
+            if self.coalescer:
+                await self.coalescer.flush(session_id)
                 await self.ws_manager.broadcast(
                     "opencode_session_updated",
                     {
@@ -461,11 +727,12 @@ class OpenCodeSSEClient:
         if not session_id or not message_id:
             return
 
-        # Get or create message tracking
-        if session_id not in self._messages:
-            self._messages[session_id] = {}
+        await self._touch_session(session_id)
+        if info.get("id"):
+            self.message_cache.apply_info(session_id, info)
 
-        session_msgs = self._messages[session_id]
+        # Get or create message tracking
+        session_msgs = self._session_messages(session_id)
         role = info.get("role") or info.get("sender") or properties.get("role") or "unknown"
 
         # Extract content from parts
@@ -497,7 +764,7 @@ class OpenCodeSSEClient:
                 parts=parts,
                 is_complete=is_complete,
             )
-            session_msgs[message_id] = msg
+            self._add_message(msg)
 
             # Update session message count
             if session_id in self._sessions:
@@ -506,7 +773,9 @@ class OpenCodeSSEClient:
             # Update existing message
             msg = session_msgs[message_id]
             old_content_len = sum(len(p.get("text", "")) for p in msg.parts if isinstance(p, dict))
-            msg.parts = parts
+            # Newer servers send parts separately (message.part.updated)
+            if "parts" in properties:
+                msg.parts = parts
             msg.is_complete = is_complete
 
             # Calculate content delta
@@ -515,15 +784,9 @@ class OpenCodeSSEClient:
                 content_delta = content[old_content_len:]
 
                 # Broadcast content chunk to dashboard
-                if self.ws_manager and content_delta:
-                    await self.ws_manager.broadcast(
-                        "opencode_message_chunk",
-                        {
-                            "session_id": session_id,
-                            "message_id": message_id,
-                            "content_delta": content_delta,
-                            "is_complete": is_complete,
-                        },
+                if self.coalescer and content_delta:
+                    await self.coalescer.chunk(
+                        session_id, message_id, content_delta, is_complete=is_complete
                     )
 
         # Mark session as completed if message is complete
@@ -537,27 +800,26 @@ class OpenCodeSSEClient:
         """Handle message.part.updated events (streaming deltas + tool state)."""
         properties = data.get("properties", data)
 
-        session_id = properties.get("sessionID") or properties.get("session_id")
+        part = properties.get("part") or {}
+
+        session_id = event_session_id(data)
         message_id = (
             properties.get("messageID")
             or properties.get("message_id")
+            or part.get("messageID")
             or properties.get("id")
             or properties.get("info", {}).get("id")
         )
-
-        part = properties.get("part") or {}
         delta = properties.get("delta") or part.get("delta")
 
         if not session_id:
             return
-
-        # Ensure tracking structures exist
-        self._messages.setdefault(session_id, {})
+        await self._touch_session(session_id)
 
         if not message_id:
             message_id = f"part_{uuid4().hex[:8]}"
 
-        msg = self._messages[session_id].get(message_id)
+        msg = self._session_messages(session_id).get(message_id)
         if not msg:
             msg = OpenCodeMessage(
                 message_id=message_id,
@@ -565,37 +827,30 @@ class OpenCodeSSEClient:
                 role=properties.get("role", "assistant"),
                 parts=[],
             )
-            self._messages[session_id][message_id] = msg
-
-        # Track parts
-        msg.parts.append(part)
-
-        # Broadcast streaming delta to dashboard
-        if delta and self.ws_manager:
-            await self.ws_manager.broadcast(
-                "opencode_message_chunk",
-                {
-                    "session_id": session_id,
-                    "message_id": message_id,
-                    "content_delta": delta,
-                    "is_complete": False,
-                    "source_event": "message.part.updated",
-                },
+            self._add_message(msg)
+
+        # Track parts; streaming updates resend the whole part, so replace by ID
+        if isinstance(part, dict) and part:
+            self.message_cache.apply_part(session_id, message_id, part)
+            part_id = part.get("id")
+            index = next(
+                (i for i, p in enumerate(msg.parts) if part_id and p.get("id") == part_id), None
             )
+            if index is None:
+                msg.parts.append(part)
+            else:
+                msg.parts[index] = part
 
-        # Broadcast tool updates for visibility
-        if self.ws_manager and isinstance(part, dict) and part.get("type") == "tool":
-            await self.ws_manager.broadcast(
-                "opencode_tool_updated",
-                {
-                    "session_id": session_id,
-                    "message_id": message_id,
-                    "tool": part.get("tool"),
-                    "status": (part.get("state", {}) or {}).get("status"),
-                    "part": part,
-                },
+        # Broadcast streaming delta to dashboard (merged per message)
+        if delta and self.coalescer:
+            await self.coalescer.chunk(
+                session_id, message_id, delta, source_event="message.part.updated"
             )
 
+        # Broadcast tool updates for visibility (latest state per part)
+        if self.coalescer and isinstance(part, dict) and part.get("type") == "tool":
+            await self.coalescer.tool(session_id, message_id, part)
+
     async def _on_permission_updated(self, data: dict) -> None:
         """Handle permission.updated (surfaced in dashboard)."""
         if not self.ws_manager:
@@ -625,8 +880,9 @@ class OpenCodeSSEClient:
             session.status = "error"
             session.updated_at = datetime.now(UTC)
 
-            # Broadcast error to dashboard
-            if self.ws_manager:
+            # Broadcast error to dashboard, after any text still being merged
+            if self.coalescer:
+                await self.coalescer.flush(session_id)
                 await self.ws_manager.broadcast(
                     "opencode_session_updated",
                     {
@@ -647,42 +903,45 @@ class OpenCodeSSEClient:
             List of OpenCodeSession objects
         """
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self.base_url}/session")
-                if response.status_code != 200:
-                    return []
-
-                sessions_data = response.json()
-                result = []
-
-                for s in sessions_data:
-                    info = s.get("info", s)
-                    session_id = info.get("id") or info.get("session_id")
-                    if not session_id:
-                        continue
+            response = await self.transport.client.get(
+                f"{self.base_url}/session", timeout=10.0
+            )
+            if response.status_code != 200:
+                return []
 
-                    title = info.get("title", "")
-                    agent_name = info.get("agent", "unknown")
-                    if title.startswith("Conversator:"):
-                        agent_name = title.replace("Conversator:", "").strip()
-
-                    source = "external"
-                    if agent_name.startswith("cvtr-"):
-                        source = "conversator"
-                    elif agent_name in ("build", "builder"):
-                        source = "builder"
-
-                    session = OpenCodeSession(
-                        session_id=session_id,
-                        agent_name=agent_name,
-                        source=source,
-                    )
+            sessions_data = response.json()
+            result = []
 
-                    # Track it
-                    self._sessions[session_id] = session
-                    result.append(session)
+            for s in sessions_data:
+                info = s.get("info", s)
+                session_id = info.get("id") or info.get("session_id")
+                if not session_id:
+                    continue
 
-                return result
+                title = info.get("title", "")
+                agent_name = info.get("agent", "unknown")
+                if title.startswith("Conversator:"):
+                    agent_name = title.replace("Conversator:", "").strip()
+
+                source = "external"
+                if agent_name.startswith("cvtr-"):
+                    source = "conversator"
+                elif agent_name in ("build", "builder"):
+                    source = "builder"
+
+                session = OpenCodeSession(
+                    session_id=session_id,
+                    agent_name=agent_name,
+                    source=source,
+                )
+
+                # Track it
+                self._track_session(session)
+                self.store.touch(session_id)
+                result.append(session)
+
+            await self._enforce_limits()
+            return result
 
         except Exception as e:
             logger.error(f"Failed to fetch sessions: {e}")
@@ -691,46 +950,65 @@ class OpenCodeSSEClient:
     async def fetch_session_messages(self, session_id: str) -> list[OpenCodeMessage]:
         """Fetch messages for a session from OpenCode API.
 
+        While the event stream has stayed connected since the session was
+        last synced, SSE deltas keep the message cache current and no
+        request is made. Otherwise only the session's new tail is fetched.
+
         Args:
             session_id: Session ID
 
         Returns:
             List of OpenCodeMessage objects
         """
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self.base_url}/session/{session_id}/message")
-                if response.status_code != 200:
-                    return []
-
-                messages_data = response.json()
-                result = []
-
-                for m in messages_data:
-                    info = m.get("info", m)
-                    message_id = info.get("id") or info.get("messageID")
-                    if not message_id:
-                        continue
-
-                    msg = OpenCodeMessage(
-                        message_id=message_id,
-                        session_id=session_id,
-                        role=info.get("role", "unknown"),
-                        parts=m.get("parts", []),
-                        is_complete=True,  # Historical messages are complete
-                    )
-                    result.append(msg)
-
-                    # Track it
-                    if session_id not in self._messages:
-                        self._messages[session_id] = {}
-                    self._messages[session_id][message_id] = msg
+        cache = self.message_cache
+        epoch = self._stream_epoch if self._connected else None
+        if session_id not in self._sessions and not cache.messages(session_id):
+            await self._restore_session(session_id)
+        self.store.touch(session_id)
+
+        if epoch is not None and cache.synced_epoch(session_id) == epoch:
+            cache.cache_reads += 1
+            cached = cache.messages(session_id)
+        else:
+            async def fetch_page(limit: int | None) -> list[dict] | None:
+                response = await self.transport.client.get(
+                    f"{self.base_url}/session/{session_id}/message",
+                    params={"limit": limit} if limit else None,
+                    timeout=10.0,
+                )
+                return response.json() if response.status_code == 200 else None
 
-                return result
+            try:
+                cached = await cache.refresh(session_id, fetch_page)
+            except Exception as e:
+                logger.error(f"Failed to fetch messages for {session_id}: {e}")
+                return []
+            if cached is None:
+                return []
+            if epoch is not None and self._connected and self._stream_epoch == epoch:
+                cache.mark_synced(session_id, epoch)
+
+        # The cache returns messages in ID order, so the index stays sorted
+        result = [self._to_message(session_id, message) for message in cached]
+        self._session_messages(session_id)
+        self._messages[session_id] = {msg.message_id: msg for msg in result}
+        self._unordered.discard(session_id)
+        await self._enforce_limits()
+        return result
 
-        except Exception as e:
-            logger.error(f"Failed to fetch messages for {session_id}: {e}")
-            return []
+    @staticmethod
+    def _to_message(session_id: str, message: CachedMessage) -> OpenCodeMessage:
+        created_ms = (message.info.get("time") or {}).get("created")
+        msg = OpenCodeMessage(
+            message_id=message.message_id,
+            session_id=session_id,
+            role=message.role,
+            parts=list(message.parts.values()),
+            is_complete=message.is_complete,
+        )
+        if isinstance(created_ms, (int, float)):
+            msg.created_at = datetime.fromtimestamp(created_ms / 1000, UTC)
+        return msg
 
 
 class MultiSourceSSEManager:
@@ -748,8 +1026,21 @@ class MultiSourceSSEManager:
         """
         self.ws_manager = ws_manager
         self._sources: dict[str, OpenCodeSSEClient] = {}
+        # session_id -> source name, maintained by each source's index callback
+        self._session_sources: dict[str, str] = {}
         self._running = False
 
+    def _index_source(self, name: str) -> IndexCallback:
+        """Build the index callback for one source."""
+
+        def update(session_id: str, tracked: bool) -> None:
+            if tracked:
+                self._session_sources[session_id] = name
+            elif self._session_sources.get(session_id) == name:
+                del self._session_sources[session_id]
+
+        return update
+
     async def add_source(
         self,
         name: str,
@@ -771,6 +1062,7 @@ class MultiSourceSSEManager:
             await self.remove_source(name)
 
         client = OpenCodeSSEClient(base_url=base_url, ws_manager=self.ws_manager)
+        client.add_index_callback(self._index_source(name))
         self._sources[name] = client
 
         if start:
@@ -791,6 +1083,11 @@ class MultiSourceSSEManager:
 
         client = self._sources.pop(name)
         await client.stop()
+        self._session_sources = {
+            session_id: source
+            for session_id, source in self._session_sources.items()
+            if source != name
+        }
         logger.info(f"Removed OpenCode source: {name}")
 
     async def start_all(self) -> None:
@@ -837,7 +1134,7 @@ class MultiSourceSSEManager:
         return result
 
     def get_session(self, session_id: str) -> tuple[str | None, OpenCodeSession | None]:
-        """Find a session across all sources.
+        """Find a session across all sources (O(1) via the session index).
 
         Args:
             session_id: Session ID to find
@@ -845,11 +1142,9 @@ class MultiSourceSSEManager:
         Returns:
             Tuple of (source_name, session) or (None, None) if not found
         """
-        for name, client in self._sources.items():
-            session = client.get_session(session_id)
-            if session:
-                return name, session
-        return None, None
+        name = self._session_sources.get(session_id)
+        session = self._sources[name].get_session(session_id) if name else None
+        return (name, session) if session else (None, None)
 
     def get_session_messages(self, session_id: str) -> list[OpenCodeMessage]:
         """Get messages for a session from any source.
@@ -860,11 +1155,8 @@ class MultiSourceSSEManager:
         Returns:
             List of messages
         """
-        for client in self._sources.values():
-            messages = client.get_session_messages(session_id)
-            if messages:
-                return messages
-        return []
+        name = self._session_sources.get(session_id)
+        return self._sources[name].get_session_messages(session_id) if name else []
 
     async def fetch_session_messages(self, session_id: str) -> list[OpenCodeMessage]:
         """Fetch messages for a session from the appropriate source.
@@ -875,8 +1167,9 @@ class MultiSourceSSEManager:
         Returns:
             List of messages
         """
-        source_name, _ = self.get_session(session_id)
-        if source_name and source_name in self._sources:
+        # Spilled sessions stay indexed, so this also finds evicted sessions
+        source_name = self._session_sources.get(session_id)
+        if source_name:
             return await self._sources[source_name].fetch_session_messages(session_id)
         return []
 
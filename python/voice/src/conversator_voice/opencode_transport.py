@@ -0,0 +1,190 @@
+"""Shared, pooled HTTP transport for OpenCode servers.
+
+One `OpenCodeTransport` exists per OpenCode base URL. The orchestration
+client, SSE listener, builders and process managers all borrow its
+`httpx.AsyncClient`, so keep-alive connections are reused across
+components instead of every component (and every SSE reconnect) opening
+its own pool. Response latency is recorded per endpoint.
+"""
+
+import re
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Path segments that are object IDs (ses_..., msg_..., UUIDs, long hex)
+_ID_SEGMENT = re.compile(r"^(?:[a-z]{3}_[A-Za-z0-9]+|[0-9a-f-]{16,})$")
+
+
+@dataclass
+class TransportSettings:
+    """Connection pool and timeout settings for OpenCode transports."""
+
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    http2: bool = False
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram for one endpoint."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.errors = 0
+
+    def record(self, ms: float, error: bool = False) -> None:
+        """Record one response time."""
+        index = next(
+            (i for i, bound in enumerate(LATENCY_BUCKETS_MS) if ms <= bound),
+            len(LATENCY_BUCKETS_MS),
+        )
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        if error:
+            self.errors += 1
+
+    def percentile(self, fraction: float) -> float | None:
+        """Bucket upper bound containing the given percentile."""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and index < len(LATENCY_BUCKETS_MS):
+                return float(LATENCY_BUCKETS_MS[index])
+        return round(self.max_ms, 1)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Summary for diagnostics."""
+        labels = [f"le_{bound}" for bound in LATENCY_BUCKETS_MS] + ["inf"]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max_ms, 1),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+def endpoint_key(method: str, path: str) -> str:
+    """Normalize a request to a histogram key, e.g. "GET /session/{id}/message"."""
+    segments = ["{id}" if _ID_SEGMENT.match(s) else s for s in path.split("/")]
+    return f"{method} {'/'.join(segments)}"
+
+
+class OpenCodeTransport:
+    """Pooled keep-alive HTTP client for one OpenCode base URL."""
+
+    def __init__(self, base_url: str, settings: TransportSettings | None = None):
+        """Create the client.
+
+        Args:
+            base_url: OpenCode server URL
+            settings: Pool and timeout settings (default: TransportSettings())
+        """
+        self.base_url = base_url.rstrip("/")
+        self.settings = settings or TransportSettings()
+        self.latency: dict[str, LatencyHistogram] = {}
+
+        http2 = self.settings.http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                print("[Transport] HTTP/2 requested but 'h2' is not installed; using HTTP/1.1")
+                http2 = False
+
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.settings.max_connections,
+                max_keepalive_connections=self.settings.max_keepalive_connections,
+                keepalive_expiry=self.settings.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(
+                self.settings.read_timeout, connect=self.settings.connect_timeout
+            ),
+            http2=http2,
+            # OpenCode servers are local; never route them through env proxies
+            trust_env=False,
+            event_hooks={"request": [self._on_request], "response": [self._on_response]},
+        )
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        request.extensions["conversator_started"] = time.perf_counter()
+
+    async def _on_response(self, response: httpx.Response) -> None:
+        # Time to response headers, so long-lived SSE streams count once
+        started = response.request.extensions.get("conversator_started")
+        if started is None:
+            return
+        key = endpoint_key(response.request.method, response.request.url.path)
+        histogram = self.latency.setdefault(key, LatencyHistogram())
+        histogram.record((time.perf_counter() - started) * 1000, response.status_code >= 500)
+
+    @property
+    def is_closed(self) -> bool:
+        """Whether the underlying client has been closed."""
+        return self.client.is_closed
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self.client.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        """Per-endpoint latency summaries."""
+        return {key: histogram.to_dict() for key, histogram in sorted(self.latency.items())}
+
+
+_settings = TransportSettings()
+_transports: dict[str, OpenCodeTransport] = {}
+
+
+def configure_transports(settings: TransportSettings) -> None:
+    """Set the settings used for transports created from now on."""
+    global _settings
+    _settings = settings
+
+
+def get_transport(base_url: str) -> OpenCodeTransport:
+    """Return the shared transport for a base URL, creating it if needed.
+
+    Args:
+        base_url: OpenCode server URL
+
+    Returns:
+        Transport shared by every component talking to that server
+    """
+    key = base_url.rstrip("/")
+    transport = _transports.get(key)
+    if transport is None or transport.is_closed:
+        transport = OpenCodeTransport(key, _settings)
+        _transports[key] = transport
+    return transport
+
+
+async def close_transports() -> None:
+    """Close every shared transport (at shutdown)."""
+    for transport in list(_transports.values()):
+        await transport.aclose()
+    _transports.clear()
+
+
+def transport_stats() -> dict[str, Any]:
+    """Latency histograms for every shared transport, keyed by base URL."""
+    return {url: transport.stats() for url, transport in _transports.items()}
@@ -247,7 +247,7 @@ class PromptManager:
 
         # Emit event if state is available
         if self.state:
-            self.state.update_task_status(
+            await self.state.aio.update_task_status(
                 task_id,
                 "WorkingPromptUpdated",
                 {"path": str(path), "summary": data.title}
@@ -284,7 +284,7 @@ class PromptManager:
 
         # Emit event if state is available
         if self.state:
-            self.state.update_task_status(
+            await self.state.aio.update_task_status(
                 task_id,
                 "HandoffFrozen",
                 {
@@ -0,0 +1,190 @@
+"""Eviction bookkeeping for OpenCode sessions held in memory.
+
+An OpenCodeSSEClient tracks every session and message it sees. Without a
+bound, a dashboard left open against a busy server keeps all of them in
+RAM. SessionStore orders sessions by last activity and picks which ones
+to evict. A session is evicted when it has been idle for too long, or
+when the session count or the message-part byte budget is exceeded;
+least recently active sessions go first. Evicted sessions can be spilled
+to disk as JSON and restored when they are read again.
+"""
+
+import asyncio
+import json
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+# Idle sessions are looked for at most this often (seconds)
+SWEEP_INTERVAL = 60.0
+
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+@dataclass
+class SessionStoreLimits:
+    """Bounds on sessions and message parts kept in memory."""
+
+    max_sessions: int = 200
+    max_idle_seconds: float = 6 * 3600
+    max_part_bytes: int = 64 * 1024 * 1024
+    spill_dir: str | None = None  # Write evicted sessions here (None = discard)
+
+
+_limits = SessionStoreLimits()
+
+
+def configure_session_store(limits: SessionStoreLimits) -> None:
+    """Set the limits used by session stores created from now on."""
+    global _limits
+    _limits = limits
+
+
+class SessionStore:
+    """Activity order, eviction choice and spill files for one SSE client."""
+
+    def __init__(self, limits: SessionStoreLimits | None = None):
+        """Initialize the store.
+
+        Args:
+            limits: Bounds to enforce (default: limits set by configure_session_store)
+        """
+        self.limits = limits or _limits
+        self._last_active: OrderedDict[str, float] = OrderedDict()
+        self._last_sweep = time.monotonic()
+        self.evictions = 0
+        self.spilled = 0
+        self.restored = 0
+
+    def __len__(self) -> int:
+        return len(self._last_active)
+
+    def touch(self, session_id: str) -> None:
+        """Mark a session as just active."""
+        self._last_active[session_id] = time.monotonic()
+        self._last_active.move_to_end(session_id)
+
+    def forget(self, session_id: str) -> None:
+        """Stop tracking a session."""
+        self._last_active.pop(session_id, None)
+
+    def needs_eviction(self, part_bytes: int) -> bool:
+        """Cheap check run after every update.
+
+        Args:
+            part_bytes: Bytes currently held by message parts
+        """
+        if len(self._last_active) > self.limits.max_sessions:
+            return True
+        if part_bytes > self.limits.max_part_bytes:
+            return True
+        return time.monotonic() - self._last_sweep >= SWEEP_INTERVAL
+
+    def select_evictions(
+        self,
+        part_bytes: int,
+        session_bytes: Callable[[str], int],
+        pinned: Callable[[str], bool],
+    ) -> list[str]:
+        """Choose sessions to evict, least recently active first.
+
+        Args:
+            part_bytes: Bytes currently held by message parts
+            session_bytes: Bytes held by one session's parts
+            pinned: Whether a session must stay (e.g. a caller awaits it)
+
+        Returns:
+            Session IDs to evict
+        """
+        now = time.monotonic()
+        self._last_sweep = now
+        limits = self.limits
+        count = len(self._last_active)
+        victims = []
+
+        for session_id, last_active in self._last_active.items():
+            if (
+                count <= limits.max_sessions
+                and part_bytes <= limits.max_part_bytes
+                and now - last_active <= limits.max_idle_seconds
+            ):
+                break
+            if pinned(session_id):
+                continue
+            victims.append(session_id)
+            count -= 1
+            part_bytes -= session_bytes(session_id)
+
+        return victims
+
+    def _spill_path(self, session_id: str) -> Path | None:
+        if not self.limits.spill_dir:
+            return None
+        return Path(self.limits.spill_dir) / f"{_UNSAFE_FILENAME.sub('_', session_id)}.json"
+
+    def has_spilled(self, session_id: str) -> bool:
+        """Whether an evicted session is waiting on disk."""
+        path = self._spill_path(session_id)
+        return path is not None and path.exists()
+
+    async def spill(self, session_id: str, record: dict[str, Any]) -> None:
+        """Write an evicted session to disk (no-op without spill_dir).
+
+        Args:
+            session_id: Evicted session
+            record: JSON-serializable session and messages
+        """
+        path = self._spill_path(session_id)
+        if path is None:
+            return
+
+        def write() -> None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(record))
+
+        try:
+            await asyncio.to_thread(write)
+            self.spilled += 1
+        except OSError as e:
+            print(f"[SessionStore] Failed to spill {session_id}: {e}")
+
+    async def restore(self, session_id: str) -> dict[str, Any] | None:
+        """Load and remove a spilled session.
+
+        Returns:
+            The record passed to spill(), or None if nothing was spilled
+        """
+        path = self._spill_path(session_id)
+        if path is None:
+            return None
+
+        def read() -> dict[str, Any] | None:
+            if not path.exists():
+                return None
+            record = json.loads(path.read_text())
+            path.unlink()
+            return record
+
+        try:
+            record = await asyncio.to_thread(read)
+        except (OSError, ValueError) as e:
+            print(f"[SessionStore] Failed to restore {session_id}: {e}")
+            return None
+        if record is not None:
+            self.restored += 1
+        return record
+
+    def stats(self) -> dict[str, Any]:
+        """Eviction counters and limits."""
+        return {
+            "tracked_sessions": len(self._last_active),
+            "max_sessions": self.limits.max_sessions,
+            "max_part_bytes": self.limits.max_part_bytes,
+            "max_idle_seconds": self.limits.max_idle_seconds,
+            "evictions": self.evictions,
+            "spilled": self.spilled,
+            "restored": self.restored,
+        }
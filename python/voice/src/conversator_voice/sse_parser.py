@@ -0,0 +1,147 @@
+"""Incremental decoder for text/event-stream bodies.
+
+Works directly on the raw byte chunks of the response rather than on
+decoded, stripped lines. Complete lines are cut out of each chunk with a
+single splitlines() pass, and only the `data:` payload of an event is
+decoded to text, once, when the event is dispatched. The decoder follows
+the WHATWG event-stream rules:
+
+- lines end in CRLF, LF or CR;
+- comment lines start with ":";
+- multi-line data is joined with "\\n";
+- `id:` sets the last event ID, which persists across events and is sent
+  back as Last-Event-ID when reconnecting;
+- `retry:` sets the reconnection delay.
+
+Event payloads are parsed with orjson when the optional `orjson` package
+is installed (the "fast-json" extra) and with the json module otherwise.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable
+
+_BOM = b"\xef\xbb\xbf"
+
+
+def _select_json_loads() -> Callable[[str], Any]:
+    try:
+        import orjson
+    except ImportError:
+        return json.loads
+    return orjson.loads
+
+
+# Raises a json.JSONDecodeError subclass on bad input with either backend
+loads_event_data = _select_json_loads()
+
+
+@dataclass(slots=True)
+class SSEEvent:
+    """One dispatched server-sent event."""
+
+    event: str
+    data: str
+    id: str | None = None
+
+
+class SSEDecoder:
+    """Feed response bytes, get complete SSEEvents back."""
+
+    def __init__(self, last_event_id: str | None = None):
+        """Initialize the decoder.
+
+        Args:
+            last_event_id: ID to resume from (e.g. kept across reconnects)
+        """
+        self.last_event_id = last_event_id
+        self.retry: int | None = None  # Reconnection delay in ms, if the server set one
+        self.events = 0
+        self.bytes = 0
+        self._pending: list[bytes] = []
+        self._data: list[bytes | memoryview] = []
+        self._event = b""
+        self._started = False
+
+    def feed(self, chunk: bytes) -> list[SSEEvent]:
+        """Decode a chunk of the stream.
+
+        Args:
+            chunk: Raw bytes as received (any split is fine)
+
+        Returns:
+            Events completed by this chunk, in stream order
+        """
+        self.bytes += len(chunk)
+        if not self._started:
+            chunk = b"".join(self._pending) + chunk
+            if len(chunk) < len(_BOM) and _BOM.startswith(chunk):
+                self._pending = [chunk]
+                return []
+            self._started = True
+            self._pending = []
+            if chunk.startswith(_BOM):
+                chunk = chunk[len(_BOM):]
+
+        # A trailing CR may be the first half of CRLF; keep it for the next chunk
+        end = len(chunk) - 1 if chunk.endswith(b"\r") else len(chunk)
+        if chunk.find(b"\n", 0, end) < 0 and chunk.find(b"\r", 0, end) < 0:
+            # Still inside a line: join once it completes instead of re-copying
+            self._pending.append(chunk)
+            return []
+        if self._pending:
+            self._pending.append(chunk)
+            chunk = b"".join(self._pending)
+            end = len(chunk) - 1 if chunk.endswith(b"\r") else len(chunk)
+
+        lines = chunk.splitlines()
+        cut = max(chunk.rfind(b"\n", 0, end), chunk.rfind(b"\r", 0, end))
+        if cut < len(chunk) - 1:
+            # The last line is incomplete
+            self._pending = [chunk[cut + 1:]]
+            lines.pop()
+        else:
+            self._pending = []
+
+        events: list[SSEEvent] = []
+        data = self._data
+        for line in lines:
+            if line.startswith(b"data:"):
+                # Hot path: most lines are single-line JSON payloads; a view
+                # avoids copying the payload before it is decoded
+                data.append(memoryview(line)[6 if line[5:6] == b" " else 5:])
+            elif not line:
+                if data:
+                    events.append(self._dispatch())
+                    data = self._data
+                else:
+                    self._event = b""
+            elif line[0] != 0x3A:  # ":" starts a comment
+                self._field(line)
+        self.events += len(events)
+        return events
+
+    def _field(self, line: bytes) -> None:
+        name, _, value = line.partition(b":")
+        if value[:1] == b" ":
+            value = value[1:]
+
+        if name == b"data":
+            self._data.append(value)
+        elif name == b"event":
+            self._event = value
+        elif name == b"id":
+            if b"\x00" not in value:
+                self.last_event_id = value.decode("utf-8", "replace")
+        elif name == b"retry":
+            if value.isdigit():
+                self.retry = int(value)
+
+    def _dispatch(self) -> SSEEvent:
+        data = self._data[0] if len(self._data) == 1 else b"\n".join(self._data)
+        event_type, self._event, self._data = self._event, b"", []
+        return SSEEvent(
+            event=event_type.decode("utf-8", "replace") if event_type else "message",
+            data=str(data, "utf-8", "replace"),
+            id=self.last_event_id,
+        )
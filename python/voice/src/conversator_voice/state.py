@@ -4,21 +4,43 @@ Uses SQLite for persistence with an append-only event log
 and derived state tables that can be rebuilt from events.
 """
 
+import asyncio
 import json
+import queue
 import sqlite3
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Iterator
-
+from typing import Any, AsyncIterator, Callable, Iterator
+from uuid import uuid4
+
+from .change_feed import ChangeFeed
+from .event_archive import read_segment, write_segment
+from .event_codec import (
+    PAYLOAD_ENCODINGS,
+    decode_payload,
+    decode_type,
+    encode_payload,
+    encode_type,
+    type_column_values,
+)
 from .models import (
     ConversatorTask,
+    DeferredPayload,
     InboxItem,
     TaskEvent,
     TaskMapping,
     TaskStatus,
     EventType,
+    create_task_canceled_payload,
+    create_task_compacted_payload,
     create_task_created_payload,
 )
+from .state_cache import ReadThroughCache
 
 
 # SQL schema for the state database
@@ -65,14 +87,293 @@ CREATE TABLE IF NOT EXISTS mappings (
     session_id TEXT
 );
 
+-- Snapshots of derived state (tasks + mappings) as of last_event_id
+CREATE TABLE IF NOT EXISTS snapshots (
+    snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    last_event_id INTEGER NOT NULL,
+    tasks TEXT NOT NULL,
+    mappings TEXT NOT NULL
+);
+
+-- Compressed segment files holding raw events removed by compaction
+CREATE TABLE IF NOT EXISTS archive_segments (
+    segment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL,
+    first_event_id INTEGER NOT NULL,
+    last_event_id INTEGER NOT NULL,
+    event_count INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+-- Which archive segments hold each compacted task's history
+CREATE TABLE IF NOT EXISTS archived_tasks (
+    task_id TEXT NOT NULL,
+    segment_id INTEGER NOT NULL,
+    PRIMARY KEY (task_id, segment_id)
+);
+
 -- Indexes for common queries
 CREATE INDEX IF NOT EXISTS idx_events_task ON events(task_id);
 CREATE INDEX IF NOT EXISTS idx_events_type ON events(type);
 CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+CREATE INDEX IF NOT EXISTS idx_tasks_updated ON tasks(updated_at, task_id);
+CREATE INDEX IF NOT EXISTS idx_inbox_created ON inbox(created_at, inbox_id);
 CREATE INDEX IF NOT EXISTS idx_inbox_ack ON inbox(acknowledged_at);
 CREATE INDEX IF NOT EXISTS idx_inbox_severity ON inbox(severity);
 """
 
+# Events fetched per cursor round-trip during replay
+REPLAY_BATCH_SIZE = 500
+
+# Number of snapshots kept; older ones are pruned when a new one is taken
+SNAPSHOT_RETENTION = 3
+
+# Columns that replay stamps with wall-clock time, so they never match a
+# snapshot taken from live state and are skipped by verify_snapshot
+REPLAY_VOLATILE_COLUMNS = ("updated_at",)
+
+JOURNAL_MODES = ("wal", "delete", "truncate", "persist")
+SYNCHRONOUS_LEVELS = ("off", "normal", "full", "extra")
+
+
+@dataclass
+class CommitStats:
+    """Group-commit counters reported by the writer thread."""
+
+    commits: int = 0
+    jobs: int = 0
+    failed_jobs: int = 0
+    max_batch: int = 0
+    last_latency_ms: float = 0.0
+    max_latency_ms: float = 0.0
+    total_latency_ms: float = 0.0
+
+    def record(self, batch_size: int, latency_ms: float) -> None:
+        """Record one committed batch."""
+        self.commits += 1
+        self.jobs += batch_size
+        self.max_batch = max(self.max_batch, batch_size)
+        self.last_latency_ms = latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+        self.total_latency_ms += latency_ms
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "commits": self.commits,
+            "jobs": self.jobs,
+            "failed_jobs": self.failed_jobs,
+            "max_batch": self.max_batch,
+            "avg_batch": round(self.jobs / self.commits, 2) if self.commits else 0.0,
+            "last_latency_ms": round(self.last_latency_ms, 3),
+            "max_latency_ms": round(self.max_latency_ms, 3),
+            "avg_latency_ms": (
+                round(self.total_latency_ms / self.commits, 3) if self.commits else 0.0
+            ),
+        }
+
+
+class _StateWriter:
+    """Dedicated thread that owns the read-write connection.
+
+    Every mutation is submitted as a job and executed in order on this
+    thread, so writes are serialized and never block the asyncio loop.
+
+    Jobs never commit themselves. The writer drains whatever is queued
+    (waiting up to ``commit_window`` seconds for more), runs each job in
+    its own savepoint and commits the whole batch once, so a burst of
+    events costs a single fsync. Futures resolve only after the commit.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        init: Callable[[sqlite3.Connection], None],
+        journal_mode: str = "wal",
+        synchronous: str = "normal",
+        commit_window: float = 0.0,
+        max_batch: int = 256,
+        after_commit: Callable[[sqlite3.Connection], None] | None = None,
+    ):
+        """Open the connection, initialize it and start the writer thread.
+
+        Args:
+            db_path: Path to SQLite database file
+            init: Schema setup run once before any job
+            journal_mode: SQLite journal mode (wal, delete, truncate, persist)
+            synchronous: SQLite synchronous level (off, normal, full, extra)
+            commit_window: Seconds to wait for more jobs before committing
+            max_batch: Maximum number of jobs per transaction
+            after_commit: Called with the connection on the writer thread once
+                          a batch has been committed or rolled back, before
+                          futures resolve
+        """
+        if journal_mode.lower() not in JOURNAL_MODES:
+            raise ValueError(f"Unsupported journal_mode: {journal_mode}")
+        if synchronous.lower() not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"Unsupported synchronous level: {synchronous}")
+
+        self.db_path = db_path
+        self.commit_window = commit_window
+        self.max_batch = max(1, max_batch)
+        self.after_commit = after_commit
+        self.stats = CommitStats()
+        # Autocommit mode: the writer loop issues BEGIN/COMMIT explicitly
+        self._conn = sqlite3.connect(
+            str(db_path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(f"PRAGMA journal_mode={journal_mode.lower()}")
+        self._conn.execute(f"PRAGMA synchronous={synchronous.upper()}")
+        init(self._conn)
+
+        self._jobs: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="state-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Queue a job to run on the writer thread.
+
+        Args:
+            fn: Callable invoked as fn(conn, *args)
+            *args: Extra arguments for the callable
+
+        Returns:
+            Future resolved with the callable's return value once committed
+        """
+        future: Future = Future()
+        self._jobs.put((fn, args, future))
+        return future
+
+    def close(self) -> None:
+        """Drain pending jobs, close the connection and stop the thread."""
+        self._jobs.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Writer loop: collect and commit batches until closed."""
+        try:
+            closing = False
+            while not closing:
+                batch, closing = self._collect(self._jobs.get())
+                if batch:
+                    self._commit_batch(batch)
+        finally:
+            self._conn.close()
+
+    def _collect(self, first: Any) -> tuple[list, bool]:
+        """Gather jobs that arrive within the coalescing window.
+
+        Returns:
+            Tuple of (jobs, closing) where closing means the sentinel was seen
+        """
+        if first is None:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + self.commit_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    job = self._jobs.get(timeout=remaining)
+                else:
+                    job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                return batch, True
+            batch.append(job)
+        return batch, False
+
+    def _commit_batch(self, batch: list) -> None:
+        """Run a batch of jobs in one transaction and resolve their futures."""
+        conn = self._conn
+        outcomes: list[tuple[Future, bool, Any]] = []
+        started = time.perf_counter()
+
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except BaseException as e:
+            for _, _, future in batch:
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(e)
+            return
+
+        for fn, args, future in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+            conn.execute("SAVEPOINT job")
+            try:
+                result = fn(conn, *args)
+            except BaseException as e:
+                conn.execute("ROLLBACK TO job")
+                conn.execute("RELEASE job")
+                self.stats.failed_jobs += 1
+                outcomes.append((future, False, e))
+            else:
+                conn.execute("RELEASE job")
+                outcomes.append((future, True, result))
+
+        try:
+            conn.execute("COMMIT")
+        except BaseException as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            if self.after_commit:
+                self.after_commit(conn)
+            for future, _, _ in outcomes:
+                future.set_exception(e)
+            return
+
+        if self.after_commit:
+            self.after_commit(conn)
+        self.stats.record(len(outcomes), (time.perf_counter() - started) * 1000)
+        for future, ok, value in outcomes:
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+class _ReaderPool:
+    """Small pool of read-only connections for queries."""
+
+    def __init__(self, db_path: Path, size: int):
+        """Open the read-only connections.
+
+        Args:
+            db_path: Path to SQLite database file (must already exist)
+            size: Number of connections (and async reader threads)
+        """
+        uri = f"{db_path.resolve().as_uri()}?mode=ro"
+        self._idle: queue.Queue[sqlite3.Connection] = queue.Queue()
+        self._all: list[sqlite3.Connection] = []
+        for _ in range(size):
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            self._idle.put(conn)
+            self._all.append(conn)
+        self.executor = ThreadPoolExecutor(
+            max_workers=size, thread_name_prefix="state-reader"
+        )
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Check out a connection for the duration of a query."""
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        """Stop the reader threads and close all connections."""
+        self.executor.shutdown(wait=True)
+        for conn in self._all:
+            conn.close()
+
 
 class StateStore:
     """Event-sourced state store backed by SQLite.
@@ -80,20 +381,72 @@ class StateStore:
     Events are appended to an immutable log, and derived state
     (tasks, inbox) is updated on each event. On recovery, state
     can be rebuilt by replaying events.
+
+    A single writer thread owns the read-write connection and a small
+    pool of read-only connections serves queries. The methods on this
+    class block until the work is done; use the ``aio`` facade
+    (AsyncStateStore) from the event loop to await the same operations
+    without stalling it.
     """
 
-    def __init__(self, db_path: Path | str):
+    def __init__(
+        self,
+        db_path: Path | str,
+        read_pool_size: int = 2,
+        journal_mode: str = "wal",
+        synchronous: str = "normal",
+        commit_window: float = 0.0,
+        snapshot_every: int = 1000,
+        archive_dir: Path | str | None = None,
+        payload_encoding: str = "json",
+        cache_size: int = 256,
+    ):
         """Initialize the state store.
 
         Args:
             db_path: Path to SQLite database file
+            read_pool_size: Number of read-only connections
+            journal_mode: SQLite journal mode for the writer (wal by default)
+            synchronous: SQLite synchronous level (normal is safe with WAL)
+            commit_window: Seconds the writer waits to coalesce more writes
+                           into the same transaction (0 = only group what
+                           is already queued)
+            snapshot_every: Take a snapshot of derived state every N events
+                            (0 disables automatic snapshots)
+            archive_dir: Directory for compacted event segments
+                         (default: "archive" next to the database)
+            payload_encoding: Encoding for new events, "json" or "compact"
+                              (interned type codes + binary payload records).
+                              Rows of either encoding are always readable.
+            cache_size: Max tasks/mappings kept in the read-through cache
+                        (0 disables it)
         """
+        if payload_encoding not in PAYLOAD_ENCODINGS:
+            raise ValueError(f"Unsupported payload_encoding: {payload_encoding}")
+
         self.db_path = Path(db_path)
+        self.payload_encoding = payload_encoding
+        self.archive_dir = Path(archive_dir) if archive_dir else self.db_path.parent / "archive"
+        self.snapshot_every = snapshot_every
+        self._last_snapshot_event_id = 0
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(str(self.db_path))
-        self.conn.row_factory = sqlite3.Row
         self._event_listeners: list = []
-        self._init_schema()
+        self._cache = ReadThroughCache(cache_size)
+        # Task IDs touched by the current write batch (writer thread only);
+        # None means derived state was rebuilt wholesale
+        self._dirty_tasks: set[str] | None = set()
+        self._events_written = False
+        self.changes = ChangeFeed(self)
+        self._writer = _StateWriter(
+            self.db_path,
+            self._init_schema,
+            journal_mode=journal_mode,
+            synchronous=synchronous,
+            commit_window=commit_window,
+            after_commit=self._after_commit,
+        )
+        self._readers = _ReaderPool(self.db_path, read_pool_size)
+        self.aio = AsyncStateStore(self)
 
     def add_event_listener(self, callback) -> None:
         """Add a callback to be notified of new events.
@@ -113,21 +466,95 @@ class StateStore:
         if callback in self._event_listeners:
             self._event_listeners.remove(callback)
 
-    def _init_schema(self) -> None:
+    def _init_schema(self, conn: sqlite3.Connection) -> None:
         """Initialize database schema."""
-        self.conn.executescript(SCHEMA)
-        self.conn.commit()
+        conn.executescript(SCHEMA)
+        row = conn.execute("SELECT MAX(last_event_id) AS last FROM snapshots").fetchone()
+        self._last_snapshot_event_id = row["last"] or 0
+        row = conn.execute("SELECT MAX(event_id) AS last FROM events").fetchone()
+        self.changes.last_event_id = row["last"] or 0
 
         # Migration: Add project_root column if it doesn't exist
         try:
-            self.conn.execute("SELECT project_root FROM tasks LIMIT 1")
+            conn.execute("SELECT project_root FROM tasks LIMIT 1")
         except sqlite3.OperationalError:
-            self.conn.execute("ALTER TABLE tasks ADD COLUMN project_root TEXT")
-            self.conn.commit()
+            conn.execute("ALTER TABLE tasks ADD COLUMN project_root TEXT")
 
     def close(self) -> None:
-        """Close the database connection."""
-        self.conn.close()
+        """Flush pending writes and close all database connections."""
+        self._writer.close()
+        self._readers.close()
+
+    @property
+    def commit_stats(self) -> dict:
+        """Group-commit latency and batch-size statistics."""
+        return self._writer.stats.to_dict()
+
+    @property
+    def cache_stats(self) -> dict:
+        """Read-through cache hit/miss statistics."""
+        return self._cache.stats()
+
+    def _after_commit(self, conn: sqlite3.Connection) -> None:
+        """Invalidate cached tasks and publish events for the finished batch."""
+        self._cache.invalidate(self._dirty_tasks)
+        self._dirty_tasks = set()
+        if self._events_written:
+            self._events_written = False
+            self._publish_committed(conn)
+
+    def _publish_committed(self, conn: sqlite3.Connection) -> None:
+        """Read back newly committed events and hand them to the change feed.
+
+        Reading after COMMIT means rolled-back jobs are never published and
+        subscribers always see events in event_id order.
+        """
+        if not self.changes.subscriber_count:
+            row = conn.execute("SELECT MAX(event_id) AS last FROM events").fetchone()
+            self.changes.last_event_id = row["last"] or 0
+            return
+
+        rows = conn.execute(
+            "SELECT * FROM events WHERE event_id > ? ORDER BY event_id ASC",
+            (self.changes.last_event_id,)
+        ).fetchall()
+        self.changes.publish([self._row_to_event(row) for row in rows])
+
+    def _mark_dirty(self, task_id: str | None = None) -> None:
+        """Record a task (or, with no ID, all derived state) as written."""
+        if task_id is None:
+            self._dirty_tasks = None
+        elif self._dirty_tasks is not None:
+            self._dirty_tasks.add(task_id)
+
+    def _cached_read(self, key: tuple[str, str], fn: Callable[..., Any], *args: Any) -> Any:
+        """Serve a single-object lookup from the cache, reading through on a miss."""
+        hit, value = self._cache.get(key)
+        if hit:
+            return value
+        generation = self._cache.generation
+        value = self._read(fn, *args)
+        if value is not None:
+            self._cache.put(key, value, generation)
+        return value
+
+    def _read(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a query function on a pooled read-only connection."""
+        with self._readers.connection() as conn:
+            return fn(conn, *args)
+
+    def _write(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a mutation on the writer thread and wait for it."""
+        return self._writer.submit(fn, *args).result()
+
+    def _notify(self, event: TaskEvent) -> None:
+        """Notify listeners of a committed event."""
+        for listener in self._event_listeners:
+            try:
+                listener(event)
+            except Exception:
+                # Don't let listener errors break event processing
+                pass
 
     # --- Event Operations ---
 
@@ -140,40 +567,43 @@ class StateStore:
         Returns:
             The assigned event_id
         """
-        cursor = self.conn.execute(
+        event_id = self._write(self._insert_event, event)
+        self._notify(event)
+        return event_id
+
+    def _insert_event(self, conn: sqlite3.Connection, event: TaskEvent) -> int:
+        """Insert an event and apply it to derived state (writer thread)."""
+        self._mark_dirty(event.task_id)
+        self._events_written = True
+        cursor = conn.execute(
             """
             INSERT INTO events (time, type, task_id, payload)
             VALUES (?, ?, ?, ?)
             """,
             (
                 event.time.isoformat(),
-                event.type,
+                encode_type(event.type, self.payload_encoding),
                 event.task_id,
-                json.dumps(event.payload)
+                encode_payload(event.type, event.payload, self.payload_encoding)
             )
         )
         event_id = cursor.lastrowid
         event.event_id = event_id
 
         # Update derived state based on event type
-        self._apply_event(event)
-        self.conn.commit()
-
-        # Notify listeners
-        for listener in self._event_listeners:
-            try:
-                listener(event)
-            except Exception:
-                # Don't let listener errors break event processing
-                pass
+        self._apply_event(conn, event)
 
+        if self.snapshot_every and event_id - self._last_snapshot_event_id >= self.snapshot_every:
+            self._write_snapshot(conn)
         return event_id
 
     def get_events(
         self,
         task_id: str | None = None,
         event_type: EventType | None = None,
-        after_id: int = 0
+        after_id: int = 0,
+        include_archived: bool = False,
+        limit: int | None = None
     ) -> list[TaskEvent]:
         """Get events matching filters.
 
@@ -181,10 +611,71 @@ class StateStore:
             task_id: Filter by task ID
             event_type: Filter by event type
             after_id: Only return events after this ID
+            include_archived: With task_id, also read the task's raw history
+                              from archive segments written by compaction
+            limit: Maximum number of events to return (default: all)
 
         Returns:
             List of matching events
         """
+        return self._read(
+            self._query_events, task_id, event_type, after_id, include_archived, limit
+        )
+
+    def iter_events(
+        self,
+        task_id: str | None = None,
+        event_type: EventType | None = None,
+        after_id: int = 0,
+        page_size: int = REPLAY_BATCH_SIZE
+    ) -> Iterator[TaskEvent]:
+        """Iterate events in ID order, one keyset page at a time.
+
+        Each page is a separate indexed query on event_id, so memory stays
+        bounded and no connection is held between pages.
+
+        Args:
+            task_id: Filter by task ID
+            event_type: Filter by event type
+            after_id: Only return events after this ID
+            page_size: Events fetched per query
+
+        Returns:
+            Iterator of matching events
+        """
+        while True:
+            page = self._read(
+                self._query_live_events, task_id, event_type, after_id, page_size
+            )
+            yield from page
+            if len(page) < page_size:
+                return
+            after_id = page[-1].event_id
+
+    def _query_events(
+        self,
+        conn: sqlite3.Connection,
+        task_id: str | None,
+        event_type: EventType | None,
+        after_id: int,
+        include_archived: bool = False,
+        limit: int | None = None
+    ) -> list[TaskEvent]:
+        events = self._query_live_events(conn, task_id, event_type, after_id, limit)
+        if include_archived and task_id:
+            archived = self._query_archived_events(conn, task_id, event_type, after_id)
+            if archived:
+                events = sorted(archived + events, key=lambda e: e.event_id)[:limit]
+        return events
+
+    def _query_live_events(
+        self,
+        conn: sqlite3.Connection,
+        task_id: str | None,
+        event_type: EventType | None,
+        after_id: int,
+        limit: int | None = None
+    ) -> list[TaskEvent]:
         query = "SELECT * FROM events WHERE event_id > ?"
         params: list = [after_id]
 
@@ -193,24 +684,113 @@ class StateStore:
             params.append(task_id)
 
         if event_type:
-            query += " AND type = ?"
-            params.append(event_type)
+            query += " AND type IN (?, ?)"
+            params.extend(type_column_values(event_type))
 
         query += " ORDER BY event_id ASC"
 
-        rows = self.conn.execute(query, params).fetchall()
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        rows = conn.execute(query, params).fetchall()
         return [self._row_to_event(row) for row in rows]
 
+    def _query_archived_events(
+        self,
+        conn: sqlite3.Connection,
+        task_id: str,
+        event_type: EventType | None,
+        after_id: int
+    ) -> list[TaskEvent]:
+        """Read a compacted task's raw events back from its archive segments."""
+        segments = conn.execute(
+            """
+            SELECT s.path FROM archive_segments s
+            JOIN archived_tasks a ON a.segment_id = s.segment_id
+            WHERE a.task_id = ?
+            ORDER BY s.first_event_id ASC
+            """,
+            (task_id,)
+        ).fetchall()
+
+        events = []
+        for segment in segments:
+            path = self.db_path.parent / segment["path"]
+            if not path.exists():
+                print(f"[State] Archive segment missing: {path}")
+                continue
+            for row in read_segment(path):
+                if row["task_id"] != task_id or row["event_id"] <= after_id:
+                    continue
+                if event_type and decode_type(row["type"]) != event_type:
+                    continue
+                events.append(self._row_to_event(row))
+        return events
+
     def _row_to_event(self, row: sqlite3.Row) -> TaskEvent:
-        """Convert a database row to TaskEvent."""
+        """Convert a database row to TaskEvent.
+
+        The payload is decoded lazily, so callers that only need the type
+        or task_id never pay for parsing it.
+        """
+        event_type = decode_type(row["type"])
+        raw_payload = row["payload"]
         return TaskEvent(
             event_id=row["event_id"],
             time=datetime.fromisoformat(row["time"]),
-            type=row["type"],
+            type=event_type,
             task_id=row["task_id"],
-            payload=json.loads(row["payload"])
+            payload=DeferredPayload(lambda: decode_payload(event_type, raw_payload))
         )
 
+    def count_events_by_hour(
+        self,
+        since: datetime | None = None,
+        event_type: EventType | None = None
+    ) -> list[dict]:
+        """Count events per type per hour, computed in SQL.
+
+        Args:
+            since: Only count events at or after this time
+            event_type: Only count this event type
+
+        Returns:
+            List of {"hour", "type", "count"} dicts ordered by hour
+        """
+        return self._read(self._count_events_by_hour, since, event_type)
+
+    def _count_events_by_hour(
+        self,
+        conn: sqlite3.Connection,
+        since: datetime | None,
+        event_type: EventType | None
+    ) -> list[dict]:
+        # ISO timestamps sort lexically; the first 13 chars are YYYY-MM-DDTHH
+        query = "SELECT substr(time, 1, 13) AS hour, type, COUNT(*) AS count FROM events WHERE 1=1"
+        params: list = []
+
+        if since:
+            query += " AND time >= ?"
+            params.append(since.isoformat())
+
+        if event_type:
+            query += " AND type IN (?, ?)"
+            params.extend(type_column_values(event_type))
+
+        query += " GROUP BY hour, type"
+
+        # Rows may hold either a type name or its interned code
+        counts: dict[tuple[str, str], int] = {}
+        for row in conn.execute(query, params):
+            key = (row["hour"], decode_type(row["type"]))
+            counts[key] = counts.get(key, 0) + row["count"]
+
+        return [
+            {"hour": f"{hour}:00", "type": name, "count": count}
+            for (hour, name), count in sorted(counts.items())
+        ]
+
     # --- Task Operations ---
 
     def get_task(self, task_id: str) -> ConversatorTask | None:
@@ -222,7 +802,10 @@ class StateStore:
         Returns:
             The task or None if not found
         """
-        row = self.conn.execute(
+        return self._cached_read(("task", task_id), self._query_task, task_id)
+
+    def _query_task(self, conn: sqlite3.Connection, task_id: str) -> ConversatorTask | None:
+        row = conn.execute(
             "SELECT * FROM tasks WHERE task_id = ?",
             (task_id,)
         ).fetchone()
@@ -245,13 +828,21 @@ class StateStore:
         Returns:
             List of matching tasks
         """
+        return self._read(self._query_tasks, status, limit)
+
+    def _query_tasks(
+        self,
+        conn: sqlite3.Connection,
+        status: TaskStatus | None,
+        limit: int
+    ) -> list[ConversatorTask]:
         if status:
-            rows = self.conn.execute(
+            rows = conn.execute(
                 "SELECT * FROM tasks WHERE status = ? ORDER BY updated_at DESC LIMIT ?",
                 (status, limit)
             ).fetchall()
         else:
-            rows = self.conn.execute(
+            rows = conn.execute(
                 "SELECT * FROM tasks ORDER BY updated_at DESC LIMIT ?",
                 (limit,)
             ).fetchall()
@@ -260,7 +851,10 @@ class StateStore:
 
     def get_active_tasks(self) -> list[ConversatorTask]:
         """Get all tasks that are not done, failed, or canceled."""
-        rows = self.conn.execute(
+        return self._read(self._query_active_tasks)
+
+    def _query_active_tasks(self, conn: sqlite3.Connection) -> list[ConversatorTask]:
+        rows = conn.execute(
             """
             SELECT * FROM tasks
             WHERE status NOT IN ('done', 'failed', 'canceled')
@@ -269,6 +863,66 @@ class StateStore:
         ).fetchall()
         return [self._row_to_task(row) for row in rows]
 
+    def iter_tasks(
+        self,
+        status: TaskStatus | None = None,
+        page_size: int = 100
+    ) -> Iterator[ConversatorTask]:
+        """Iterate tasks by most recently updated, one keyset page at a time.
+
+        Args:
+            status: Filter by status
+            page_size: Tasks fetched per query
+
+        Returns:
+            Iterator of matching tasks
+        """
+        cursor: tuple[str, str] | None = None
+        while True:
+            page = self._read(self._query_task_page, status, cursor, page_size)
+            yield from page
+            if len(page) < page_size:
+                return
+            cursor = (page[-1].updated_at.isoformat(), page[-1].task_id)
+
+    def _query_task_page(
+        self,
+        conn: sqlite3.Connection,
+        status: TaskStatus | None,
+        cursor: tuple[str, str] | None,
+        page_size: int
+    ) -> list[ConversatorTask]:
+        query = "SELECT * FROM tasks WHERE 1=1"
+        params: list = []
+
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+
+        if cursor:
+            query += " AND (updated_at, task_id) < (?, ?)"
+            params.extend(cursor)
+
+        query += " ORDER BY updated_at DESC, task_id DESC LIMIT ?"
+        params.append(page_size)
+
+        rows = conn.execute(query, params).fetchall()
+        return [self._row_to_task(row) for row in rows]
+
+    def count_tasks_by_status(self) -> dict[str, int]:
+        """Count tasks per status, computed in SQL.
+
+        Returns:
+            Mapping of status to task count
+        """
+        return self._read(self._count_tasks_by_status)
+
+    def _count_tasks_by_status(self, conn: sqlite3.Connection) -> dict[str, int]:
+        rows = conn.execute(
+            "SELECT status, COUNT(*) AS count FROM tasks GROUP BY status"
+        ).fetchall()
+        return {row["status"]: row["count"] for row in rows}
+
     def _row_to_task(self, row: sqlite3.Row) -> ConversatorTask:
         """Convert a database row to ConversatorTask."""
         return ConversatorTask(
@@ -294,7 +948,10 @@ class StateStore:
         Args:
             item: The inbox item to add
         """
-        self.conn.execute(
+        self._write(self._insert_inbox_item, item)
+
+    def _insert_inbox_item(self, conn: sqlite3.Connection, item: InboxItem) -> None:
+        conn.execute(
             """
             INSERT INTO inbox (inbox_id, severity, summary, refs, created_at, acknowledged_at)
             VALUES (?, ?, ?, ?, ?, ?)
@@ -308,7 +965,6 @@ class StateStore:
                 item.acknowledged_at.isoformat() if item.acknowledged_at else None
             )
         )
-        self.conn.commit()
 
     def get_inbox(
         self,
@@ -326,6 +982,15 @@ class StateStore:
         Returns:
             List of inbox items
         """
+        return self._read(self._query_inbox, unread_only, severity, limit)
+
+    def _query_inbox(
+        self,
+        conn: sqlite3.Connection,
+        unread_only: bool,
+        severity: str | None,
+        limit: int
+    ) -> list[InboxItem]:
         query = "SELECT * FROM inbox WHERE 1=1"
         params: list = []
 
@@ -339,7 +1004,7 @@ class StateStore:
         query += " ORDER BY created_at DESC LIMIT ?"
         params.append(limit)
 
-        rows = self.conn.execute(query, params).fetchall()
+        rows = conn.execute(query, params).fetchall()
         return [self._row_to_inbox_item(row) for row in rows]
 
     def acknowledge_inbox(self, inbox_id: str) -> None:
@@ -348,11 +1013,13 @@ class StateStore:
         Args:
             inbox_id: The inbox item ID
         """
-        self.conn.execute(
+        self._write(self._ack_inbox, inbox_id)
+
+    def _ack_inbox(self, conn: sqlite3.Connection, inbox_id: str) -> None:
+        conn.execute(
             "UPDATE inbox SET acknowledged_at = ? WHERE inbox_id = ?",
             (datetime.utcnow().isoformat(), inbox_id)
         )
-        self.conn.commit()
 
     def acknowledge_all_inbox(self) -> int:
         """Mark all unread inbox items as acknowledged.
@@ -360,13 +1027,89 @@ class StateStore:
         Returns:
             Number of items acknowledged
         """
-        cursor = self.conn.execute(
+        return self._write(self._ack_all_inbox)
+
+    def _ack_all_inbox(self, conn: sqlite3.Connection) -> int:
+        cursor = conn.execute(
             "UPDATE inbox SET acknowledged_at = ? WHERE acknowledged_at IS NULL",
             (datetime.utcnow().isoformat(),)
         )
-        self.conn.commit()
         return cursor.rowcount
 
+    def iter_inbox(
+        self,
+        unread_only: bool = False,
+        severity: str | None = None,
+        page_size: int = 100
+    ) -> Iterator[InboxItem]:
+        """Iterate inbox items newest first, one keyset page at a time.
+
+        Args:
+            unread_only: Only return unacknowledged items
+            severity: Filter by severity
+            page_size: Items fetched per query
+
+        Returns:
+            Iterator of inbox items
+        """
+        cursor: tuple[str, str] | None = None
+        while True:
+            page = self._read(
+                self._query_inbox_page, unread_only, severity, cursor, page_size
+            )
+            yield from page
+            if len(page) < page_size:
+                return
+            cursor = (page[-1].created_at.isoformat(), page[-1].inbox_id)
+
+    def _query_inbox_page(
+        self,
+        conn: sqlite3.Connection,
+        unread_only: bool,
+        severity: str | None,
+        cursor: tuple[str, str] | None,
+        page_size: int
+    ) -> list[InboxItem]:
+        query = "SELECT * FROM inbox WHERE 1=1"
+        params: list = []
+
+        if unread_only:
+            query += " AND acknowledged_at IS NULL"
+
+        if severity:
+            query += " AND severity = ?"
+            params.append(severity)
+
+        if cursor:
+            query += " AND (created_at, inbox_id) < (?, ?)"
+            params.extend(cursor)
+
+        query += " ORDER BY created_at DESC, inbox_id DESC LIMIT ?"
+        params.append(page_size)
+
+        rows = conn.execute(query, params).fetchall()
+        return [self._row_to_inbox_item(row) for row in rows]
+
+    def count_inbox_by_severity(self, unread_only: bool = False) -> dict[str, int]:
+        """Count inbox items per severity, computed in SQL.
+
+        Args:
+            unread_only: Only count unacknowledged items
+
+        Returns:
+            Mapping of severity to item count
+        """
+        return self._read(self._count_inbox_by_severity, unread_only)
+
+    def _count_inbox_by_severity(
+        self, conn: sqlite3.Connection, unread_only: bool
+    ) -> dict[str, int]:
+        query = "SELECT severity, COUNT(*) AS count FROM inbox"
+        if unread_only:
+            query += " WHERE acknowledged_at IS NULL"
+        query += " GROUP BY severity"
+        return {row["severity"]: row["count"] for row in conn.execute(query)}
+
     def _row_to_inbox_item(self, row: sqlite3.Row) -> InboxItem:
         """Convert a database row to InboxItem."""
         return InboxItem(
@@ -386,35 +1129,32 @@ class StateStore:
         Args:
             mapping: The mapping to set
         """
-        self.conn.execute(
+        self._write(self._upsert_mapping, mapping)
+
+    def _upsert_mapping(self, conn: sqlite3.Connection, mapping: TaskMapping) -> None:
+        self._mark_dirty(mapping.task_id)
+        conn.execute(
             """
             INSERT OR REPLACE INTO mappings (task_id, beads_id, session_id)
             VALUES (?, ?, ?)
             """,
             (mapping.task_id, mapping.beads_id, mapping.session_id)
         )
-        self.conn.commit()
 
     def get_mapping_by_task(self, task_id: str) -> TaskMapping | None:
         """Get mapping by Conversator task ID."""
-        row = self.conn.execute(
-            "SELECT * FROM mappings WHERE task_id = ?",
-            (task_id,)
-        ).fetchone()
-
-        if row:
-            return TaskMapping(
-                task_id=row["task_id"],
-                beads_id=row["beads_id"],
-                session_id=row["session_id"]
-            )
-        return None
+        return self._cached_read(("mapping", task_id), self._query_mapping, "task_id", task_id)
 
     def get_mapping_by_beads(self, beads_id: str) -> TaskMapping | None:
         """Get mapping by Beads task ID."""
-        row = self.conn.execute(
-            "SELECT * FROM mappings WHERE beads_id = ?",
-            (beads_id,)
+        return self._cached_read(("beads", beads_id), self._query_mapping, "beads_id", beads_id)
+
+    def _query_mapping(
+        self, conn: sqlite3.Connection, column: str, value: str
+    ) -> TaskMapping | None:
+        row = conn.execute(
+            f"SELECT * FROM mappings WHERE {column} = ?",
+            (value,)
         ).fetchone()
 
         if row:
@@ -427,17 +1167,18 @@ class StateStore:
 
     # --- Event Application (Derived State) ---
 
-    def _apply_event(self, event: TaskEvent) -> None:
+    def _apply_event(self, conn: sqlite3.Connection, event: TaskEvent) -> None:
         """Apply an event to update derived state.
 
         Args:
+            conn: The writer connection
             event: The event to apply
         """
         now = datetime.utcnow().isoformat()
 
         if event.type == "TaskCreated":
             payload = event.payload
-            self.conn.execute(
+            conn.execute(
                 """
                 INSERT INTO tasks (
                     task_id, title, status, priority, project_root,
@@ -456,13 +1197,13 @@ class StateStore:
                 )
             )
             # Create initial mapping
-            self.conn.execute(
+            conn.execute(
                 "INSERT OR IGNORE INTO mappings (task_id) VALUES (?)",
                 (event.task_id,)
             )
 
         elif event.type == "WorkingPromptUpdated":
-            self.conn.execute(
+            conn.execute(
                 """
                 UPDATE tasks SET
                     working_prompt_path = ?,
@@ -479,7 +1220,7 @@ class StateStore:
             )
 
         elif event.type == "QuestionsRaised":
-            self.conn.execute(
+            conn.execute(
                 """
                 UPDATE tasks SET
                     status = 'awaiting_user',
@@ -491,7 +1232,7 @@ class StateStore:
             )
 
         elif event.type == "UserAnswered":
-            self.conn.execute(
+            conn.execute(
                 """
                 UPDATE tasks SET
                     status = 'refining',
@@ -504,7 +1245,7 @@ class StateStore:
 
         elif event.type == "HandoffFrozen":
             payload = event.payload
-            self.conn.execute(
+            conn.execute(
                 """
                 UPDATE tasks SET
                     status = 'ready_to_handoff',
@@ -523,7 +1264,7 @@ class StateStore:
 
         elif event.type == "BeadsTaskLinked":
             beads_id = event.payload.get("beads_id")
-            self.conn.execute(
+            conn.execute(
                 """
                 UPDATE tasks SET
                     beads_id = ?,
@@ -534,7 +1275,7 @@ class StateStore:
                 (beads_id, now, event.event_id, event.task_id)
             )
             # Update mapping
-            self.conn.execute(
+            conn.execute(
                 "UPDATE mappings SET beads_id = ? WHERE task_id = ?",
                 (beads_id, event.task_id)
             )
@@ -542,7 +1283,7 @@ class StateStore:
         elif event.type == "BuilderDispatched":
             payload = event.payload
             session_id = payload.get("session_id")
-            self.conn.execute(
+            conn.execute(
                 """
                 UPDATE tasks SET
                     status = 'handed_off',
@@ -554,7 +1295,7 @@ class StateStore:
                 (session_id, now, event.event_id, event.task_id)
             )
             # Update mapping
-            self.conn.execute(
+            conn.execute(
                 "UPDATE mappings SET session_id = ? WHERE task_id = ?",
                 (session_id, event.task_id)
             )
@@ -568,7 +1309,7 @@ class StateStore:
             else:
                 task_status = "running"
 
-            self.conn.execute(
+            conn.execute(
                 """
                 UPDATE tasks SET
                     status = ?,
@@ -580,7 +1321,7 @@ class StateStore:
             )
 
         elif event.type == "GateRequested":
-            self.conn.execute(
+            conn.execute(
                 """
                 UPDATE tasks SET
                     status = 'awaiting_gate',
@@ -593,7 +1334,7 @@ class StateStore:
 
         elif event.type in ("GateApproved", "GateDenied"):
             # Return to running after gate decision
-            self.conn.execute(
+            conn.execute(
                 """
                 UPDATE tasks SET
                     status = 'running',
@@ -605,7 +1346,7 @@ class StateStore:
             )
 
         elif event.type == "BuildCompleted":
-            self.conn.execute(
+            conn.execute(
                 """
                 UPDATE tasks SET
                     status = 'done',
@@ -617,7 +1358,7 @@ class StateStore:
             )
 
         elif event.type == "BuildFailed":
-            self.conn.execute(
+            conn.execute(
                 """
                 UPDATE tasks SET
                     status = 'failed',
@@ -629,7 +1370,7 @@ class StateStore:
             )
 
         elif event.type == "TaskCanceled":
-            self.conn.execute(
+            conn.execute(
                 """
                 UPDATE tasks SET
                     status = 'canceled',
@@ -640,6 +1381,240 @@ class StateStore:
                 (now, event.event_id, event.task_id)
             )
 
+        elif event.type == "TaskCompacted":
+            # Summary of a folded history: restore the task's final state
+            payload = event.payload
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO tasks (
+                    task_id, beads_id, title, status, priority, project_root,
+                    created_at, updated_at, working_prompt_path,
+                    handoff_prompt_path, builder_session_id, last_event_id
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    event.task_id,
+                    payload.get("beads_id"),
+                    payload.get("title", "Untitled Task"),
+                    payload.get("final_status", "done"),
+                    payload.get("priority", 0),
+                    payload.get("project_root"),
+                    payload.get("created_at") or event.time.isoformat(),
+                    payload.get("updated_at") or now,
+                    payload.get("working_prompt_path"),
+                    payload.get("handoff_prompt_path"),
+                    payload.get("builder_session_id"),
+                    event.event_id
+                )
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO mappings (task_id, beads_id, session_id) VALUES (?, ?, ?)",
+                (event.task_id, payload.get("beads_id"), payload.get("session_id"))
+            )
+
+    # --- Compaction ---
+
+    def compact(
+        self,
+        older_than: timedelta = timedelta(days=30),
+        archive: bool = True,
+        codec: str | None = None
+    ) -> dict:
+        """Fold the histories of long-finished tasks into summary events.
+
+        Every done, failed or canceled task last updated before the cutoff
+        has its events replaced by one TaskCompacted event carrying its
+        final state. With archive=True the raw events are first written to
+        a compressed segment so get_events(include_archived=True) can still
+        return them.
+
+        Args:
+            older_than: Only compact tasks idle for at least this long
+            archive: Keep raw events in an archive segment
+            codec: Archive codec, "zstd" or "gzip" (default: best available)
+
+        Returns:
+            Dict with compacted task count, removed events and segment path
+            (relative to the database directory)
+        """
+        cutoff = (datetime.utcnow() - older_than).isoformat()
+        histories = self._read(self._compaction_candidates, cutoff)
+        # Compress and sync the segment before the write job, so queued writes
+        # never wait on it and events are only deleted once it is on disk
+        segment = self._write_archive_segment(histories, codec) if archive else None
+        try:
+            result = self._write(self._compact, histories, segment)
+        except BaseException:
+            self._discard_segment(segment)
+            raise
+        if not result["tasks"]:
+            self._discard_segment(segment)
+        return result
+
+    def _compaction_candidates(
+        self,
+        conn: sqlite3.Connection,
+        cutoff: str
+    ) -> list[tuple[ConversatorTask, list[sqlite3.Row]]]:
+        """Finished tasks idle since the cutoff, with their (uncompacted) events."""
+        rows = conn.execute(
+            """
+            SELECT * FROM tasks
+            WHERE status IN ('done', 'failed', 'canceled') AND updated_at < ?
+            """,
+            (cutoff,)
+        ).fetchall()
+
+        histories = []
+        for row in rows:
+            events = conn.execute(
+                "SELECT * FROM events WHERE task_id = ? ORDER BY event_id ASC",
+                (row["task_id"],)
+            ).fetchall()
+            # A single event means the task is already compacted
+            if len(events) > 1:
+                histories.append((self._row_to_task(row), events))
+        return histories
+
+    def _write_archive_segment(
+        self,
+        histories: list[tuple[ConversatorTask, list[sqlite3.Row]]],
+        codec: str | None
+    ) -> tuple[Path, list[dict]] | None:
+        """Write the raw events of the given histories to a new segment."""
+        if not histories:
+            return None
+        raw = sorted(
+            (self._row_to_event(event).to_dict() for _, events in histories for event in events),
+            key=lambda event: event["event_id"]
+        )
+        return write_segment(self.archive_dir, raw, codec), raw
+
+    @staticmethod
+    def _discard_segment(segment: tuple[Path, list[dict]] | None) -> None:
+        """Remove a segment that was not recorded in the database."""
+        if segment is not None:
+            segment[0].unlink(missing_ok=True)
+
+    def _archive_ref(self, path: Path) -> str:
+        """Segment path as stored: relative to the database directory if inside it."""
+        if path.is_relative_to(self.db_path.parent):
+            return str(path.relative_to(self.db_path.parent))
+        return str(path)
+
+    def _compact(
+        self,
+        conn: sqlite3.Connection,
+        histories: list[tuple[ConversatorTask, list[sqlite3.Row]]],
+        segment: tuple[Path, list[dict]] | None
+    ) -> dict:
+        result = {"tasks": 0, "events_removed": 0, "archive_path": None}
+
+        # Tasks that gained events since the candidates were read stay as they are
+        current = []
+        for task, events in histories:
+            count, last_id = conn.execute(
+                "SELECT COUNT(*), MAX(event_id) FROM events WHERE task_id = ?",
+                (task.task_id,)
+            ).fetchone()
+            if count == len(events) and last_id == events[-1]["event_id"]:
+                current.append((task, events))
+        if not current:
+            return result
+
+        segment_id = None
+        if segment is not None:
+            path, raw = segment
+            result["archive_path"] = self._archive_ref(path)
+            cursor = conn.execute(
+                """
+                INSERT INTO archive_segments
+                    (path, first_event_id, last_event_id, event_count, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    result["archive_path"],
+                    raw[0]["event_id"],
+                    raw[-1]["event_id"],
+                    len(raw),
+                    datetime.utcnow().isoformat()
+                )
+            )
+            segment_id = cursor.lastrowid
+
+        for task, events in current:
+            mapping = self._query_mapping(conn, "task_id", task.task_id)
+            conn.execute("DELETE FROM events WHERE task_id = ?", (task.task_id,))
+            self._insert_event(conn, TaskEvent(
+                type="TaskCompacted",
+                task_id=task.task_id,
+                payload=create_task_compacted_payload(
+                    task,
+                    event_count=len(events),
+                    first_event_id=events[0]["event_id"],
+                    last_event_id=events[-1]["event_id"],
+                    archive_path=result["archive_path"],
+                    session_id=mapping.session_id if mapping else None,
+                )
+            ))
+            if segment_id is not None:
+                conn.execute(
+                    "INSERT OR IGNORE INTO archived_tasks (task_id, segment_id) VALUES (?, ?)",
+                    (task.task_id, segment_id)
+                )
+            result["tasks"] += 1
+            result["events_removed"] += len(events)
+
+        return result
+
+    def migrate_payload_encoding(self, encoding: str) -> dict:
+        """Re-encode every stored event in place.
+
+        Args:
+            encoding: Target encoding, "json" or "compact"
+
+        Returns:
+            Dict with converted row count and payload bytes before/after
+        """
+        if encoding not in PAYLOAD_ENCODINGS:
+            raise ValueError(f"Unsupported payload_encoding: {encoding}")
+        return self._write(self._migrate_payload_encoding, encoding)
+
+    def _migrate_payload_encoding(self, conn: sqlite3.Connection, encoding: str) -> dict:
+        result = {"encoding": encoding, "converted": 0, "bytes_before": 0, "bytes_after": 0}
+        after_id = 0
+        while True:
+            rows = conn.execute(
+                """
+                SELECT event_id, type, payload FROM events
+                WHERE event_id > ? ORDER BY event_id ASC LIMIT ?
+                """,
+                (after_id, REPLAY_BATCH_SIZE)
+            ).fetchall()
+            if not rows:
+                break
+
+            updates = []
+            for row in rows:
+                event_type = decode_type(row["type"])
+                payload = decode_payload(event_type, row["payload"])
+                new_type = encode_type(event_type, encoding)
+                new_payload = encode_payload(event_type, payload, encoding)
+                result["bytes_before"] += len(row["type"]) + len(row["payload"])
+                result["bytes_after"] += len(new_type) + len(new_payload)
+                if (new_type, new_payload) != (row["type"], row["payload"]):
+                    updates.append((new_type, new_payload, row["event_id"]))
+
+            conn.executemany(
+                "UPDATE events SET type = ?, payload = ? WHERE event_id = ?", updates
+            )
+            result["converted"] += len(updates)
+            after_id = rows[-1]["event_id"]
+
+        self.payload_encoding = encoding
+        return result
+
     # --- Recovery ---
 
     def replay_events(self, after_event_id: int = 0) -> int:
@@ -651,17 +1626,183 @@ class StateStore:
         Returns:
             Number of events replayed
         """
+        return self._write(self._replay, after_event_id)
+
+    def _replay(self, conn: sqlite3.Connection, after_event_id: int) -> int:
+        self._mark_dirty()
         if after_event_id == 0:
             # Clear derived state for full replay
-            self.conn.execute("DELETE FROM tasks")
-            self.conn.execute("DELETE FROM mappings")
+            conn.execute("DELETE FROM tasks")
+            conn.execute("DELETE FROM mappings")
+
+        count = 0
+        for event in self._iter_events(conn, after_event_id):
+            self._apply_event(conn, event)
+            count += 1
+
+        return count
+
+    def _iter_events(
+        self,
+        conn: sqlite3.Connection,
+        after_id: int,
+        batch_size: int = REPLAY_BATCH_SIZE
+    ) -> Iterator[TaskEvent]:
+        """Stream events after an ID in batches instead of loading them all."""
+        cursor = conn.execute(
+            "SELECT * FROM events WHERE event_id > ? ORDER BY event_id ASC",
+            (after_id,)
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield self._row_to_event(row)
+
+    def create_snapshot(self) -> int:
+        """Snapshot the derived tables at the latest event.
 
-        events = self.get_events(after_id=after_event_id)
-        for event in events:
-            self._apply_event(event)
+        Returns:
+            The new snapshot_id
+        """
+        return self._write(self._write_snapshot)
 
-        self.conn.commit()
-        return len(events)
+    def _write_snapshot(self, conn: sqlite3.Connection) -> int:
+        last_event_id = conn.execute(
+            "SELECT COALESCE(MAX(event_id), 0) FROM events"
+        ).fetchone()[0]
+        tasks = [dict(row) for row in conn.execute("SELECT * FROM tasks")]
+        mappings = [dict(row) for row in conn.execute("SELECT * FROM mappings")]
+
+        cursor = conn.execute(
+            """
+            INSERT INTO snapshots (created_at, last_event_id, tasks, mappings)
+            VALUES (?, ?, ?, ?)
+            """,
+            (
+                datetime.utcnow().isoformat(),
+                last_event_id,
+                json.dumps(tasks),
+                json.dumps(mappings)
+            )
+        )
+        conn.execute(
+            """
+            DELETE FROM snapshots WHERE snapshot_id NOT IN (
+                SELECT snapshot_id FROM snapshots ORDER BY snapshot_id DESC LIMIT ?
+            )
+            """,
+            (SNAPSHOT_RETENTION,)
+        )
+        self._last_snapshot_event_id = last_event_id
+        return cursor.lastrowid
+
+    def _load_snapshot(
+        self, conn: sqlite3.Connection, snapshot_id: int | None = None
+    ) -> sqlite3.Row | None:
+        """Load a snapshot row by ID, or the latest one."""
+        if snapshot_id is None:
+            return conn.execute(
+                "SELECT * FROM snapshots ORDER BY snapshot_id DESC LIMIT 1"
+            ).fetchone()
+        return conn.execute(
+            "SELECT * FROM snapshots WHERE snapshot_id = ?",
+            (snapshot_id,)
+        ).fetchone()
+
+    def _restore_snapshot(self, conn: sqlite3.Connection, snapshot: sqlite3.Row) -> None:
+        """Replace derived tables with the contents of a snapshot."""
+        conn.execute("DELETE FROM tasks")
+        conn.execute("DELETE FROM mappings")
+        for table in ("tasks", "mappings"):
+            for row in json.loads(snapshot[table]):
+                columns = ", ".join(row)
+                placeholders = ", ".join("?" for _ in row)
+                conn.execute(
+                    f"INSERT INTO {table} ({columns}) VALUES ({placeholders})",
+                    list(row.values())
+                )
+
+    def recover(self) -> dict:
+        """Rebuild derived state from the latest snapshot plus the event tail.
+
+        Falls back to a full replay when no snapshot exists.
+
+        Returns:
+            Dict with the snapshot used and the number of events replayed
+        """
+        return self._write(self._recover)
+
+    def _recover(self, conn: sqlite3.Connection) -> dict:
+        snapshot = self._load_snapshot(conn)
+        if snapshot is None:
+            return {"snapshot_id": None, "from_event_id": 0, "replayed": self._replay(conn, 0)}
+
+        self._restore_snapshot(conn, snapshot)
+        return {
+            "snapshot_id": snapshot["snapshot_id"],
+            "from_event_id": snapshot["last_event_id"],
+            "replayed": self._replay(conn, snapshot["last_event_id"]),
+        }
+
+    def verify_snapshot(self, snapshot_id: int | None = None) -> dict:
+        """Check that snapshot + tail replay matches a full replay.
+
+        Both rebuilds run in scratch in-memory databases, so live state is
+        never touched. Columns in REPLAY_VOLATILE_COLUMNS are not compared.
+
+        Args:
+            snapshot_id: Snapshot to verify (default: latest)
+
+        Returns:
+            Dict with ok flag, row counts and any differing rows
+
+        Raises:
+            ValueError: If the snapshot does not exist
+        """
+        return self._read(self._verify_snapshot, snapshot_id)
+
+    def _verify_snapshot(self, conn: sqlite3.Connection, snapshot_id: int | None) -> dict:
+        snapshot = self._load_snapshot(conn, snapshot_id)
+        if snapshot is None:
+            raise ValueError(f"Snapshot not found: {snapshot_id or 'latest'}")
+
+        full = _scratch_db()
+        restored = _scratch_db()
+        try:
+            for event in self._iter_events(conn, 0):
+                self._apply_event(full, event)
+
+            self._restore_snapshot(restored, snapshot)
+            for event in self._iter_events(conn, snapshot["last_event_id"]):
+                self._apply_event(restored, event)
+
+            differences = []
+            counts = {}
+            for table, key in (("tasks", "task_id"), ("mappings", "task_id")):
+                expected = _table_rows(full, table, key)
+                actual = _table_rows(restored, table, key)
+                counts[table] = len(expected)
+                for row_id in sorted(expected.keys() | actual.keys()):
+                    if expected.get(row_id) != actual.get(row_id):
+                        differences.append({
+                            "table": table,
+                            "id": row_id,
+                            "replay": expected.get(row_id),
+                            "snapshot": actual.get(row_id),
+                        })
+        finally:
+            full.close()
+            restored.close()
+
+        return {
+            "snapshot_id": snapshot["snapshot_id"],
+            "last_event_id": snapshot["last_event_id"],
+            "ok": not differences,
+            "counts": counts,
+            "differences": differences,
+        }
 
     # --- High-Level Helpers ---
 
@@ -681,17 +1822,10 @@ class StateStore:
         Returns:
             The created task
         """
-        from uuid import uuid4
-        task_id = str(uuid4())
-
-        event = TaskEvent(
-            type="TaskCreated",
-            task_id=task_id,
-            payload=create_task_created_payload(title, working_prompt_path, project_root)
-        )
+        event = _task_created_event(title, working_prompt_path, project_root)
         self.append_event(event)
 
-        return self.get_task(task_id)
+        return self.get_task(event.task_id)
 
     def update_task_status(self, task_id: str, event_type: EventType, payload: dict | None = None) -> None:
         """Update a task by emitting an event.
@@ -715,9 +1849,296 @@ class StateStore:
             task_id: The task to cancel
             reason: Cancellation reason
         """
-        from .models import create_task_canceled_payload
         self.update_task_status(
             task_id,
             "TaskCanceled",
             create_task_canceled_payload(reason)
         )
+
+
+def _scratch_db() -> sqlite3.Connection:
+    """Create an empty in-memory database with the state schema."""
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _table_rows(conn: sqlite3.Connection, table: str, key: str) -> dict[str, dict]:
+    """Load a derived table keyed by ID, without replay-volatile columns."""
+    rows = {}
+    for row in conn.execute(f"SELECT * FROM {table}"):
+        data = {k: row[k] for k in row.keys() if k not in REPLAY_VOLATILE_COLUMNS}
+        rows[data[key]] = data
+    return rows
+
+
+def _task_created_event(
+    title: str,
+    working_prompt_path: str | None,
+    project_root: str | None
+) -> TaskEvent:
+    """Build the TaskCreated event for a new task."""
+    return TaskEvent(
+        type="TaskCreated",
+        task_id=str(uuid4()),
+        payload=create_task_created_payload(title, working_prompt_path, project_root)
+    )
+
+
+class AsyncStateStore:
+    """Awaitable facade over a StateStore.
+
+    Writes are handed to the store's writer thread and queries run on its
+    read-only pool, so none of these coroutines block the event loop.
+    Listeners are still invoked on the loop thread after the write commits.
+    """
+
+    def __init__(self, store: StateStore):
+        """Initialize the facade.
+
+        Args:
+            store: The underlying state store
+        """
+        self._store = store
+
+    async def _read(self, fn: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._store._readers.executor, self._store._read, fn, *args
+        )
+
+    async def _write(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.wrap_future(self._store._writer.submit(fn, *args))
+
+    async def _cached_read(
+        self, key: tuple[str, str], fn: Callable[..., Any], *args: Any
+    ) -> Any:
+        # Cache hits are answered inline without a thread hop
+        cache = self._store._cache
+        hit, value = cache.get(key)
+        if hit:
+            return value
+        generation = cache.generation
+        value = await self._read(fn, *args)
+        if value is not None:
+            cache.put(key, value, generation)
+        return value
+
+    # --- Event Operations ---
+
+    async def append_event(self, event: TaskEvent) -> int:
+        """Append an event and update derived state."""
+        event_id = await self._write(self._store._insert_event, event)
+        self._store._notify(event)
+        return event_id
+
+    async def get_events(
+        self,
+        task_id: str | None = None,
+        event_type: EventType | None = None,
+        after_id: int = 0,
+        include_archived: bool = False,
+        limit: int | None = None
+    ) -> list[TaskEvent]:
+        """Get events matching filters."""
+        return await self._read(
+            self._store._query_events, task_id, event_type, after_id, include_archived, limit
+        )
+
+    async def iter_events(
+        self,
+        task_id: str | None = None,
+        event_type: EventType | None = None,
+        after_id: int = 0,
+        page_size: int = REPLAY_BATCH_SIZE
+    ) -> AsyncIterator[TaskEvent]:
+        """Iterate events in ID order, awaiting one keyset page at a time."""
+        while True:
+            page = await self._read(
+                self._store._query_live_events, task_id, event_type, after_id, page_size
+            )
+            for event in page:
+                yield event
+            if len(page) < page_size:
+                return
+            after_id = page[-1].event_id
+
+    async def count_events_by_hour(
+        self,
+        since: datetime | None = None,
+        event_type: EventType | None = None
+    ) -> list[dict]:
+        """Count events per type per hour, computed in SQL."""
+        return await self._read(self._store._count_events_by_hour, since, event_type)
+
+    # --- Task Operations ---
+
+    async def get_task(self, task_id: str) -> ConversatorTask | None:
+        """Get a task by ID."""
+        return await self._cached_read(("task", task_id), self._store._query_task, task_id)
+
+    async def get_tasks(
+        self,
+        status: TaskStatus | None = None,
+        limit: int = 100
+    ) -> list[ConversatorTask]:
+        """Get tasks matching filters."""
+        return await self._read(self._store._query_tasks, status, limit)
+
+    async def get_active_tasks(self) -> list[ConversatorTask]:
+        """Get all tasks that are not done, failed, or canceled."""
+        return await self._read(self._store._query_active_tasks)
+
+    async def iter_tasks(
+        self,
+        status: TaskStatus | None = None,
+        page_size: int = 100
+    ) -> AsyncIterator[ConversatorTask]:
+        """Iterate tasks by most recently updated, one keyset page at a time."""
+        cursor: tuple[str, str] | None = None
+        while True:
+            page = await self._read(self._store._query_task_page, status, cursor, page_size)
+            for task in page:
+                yield task
+            if len(page) < page_size:
+                return
+            cursor = (page[-1].updated_at.isoformat(), page[-1].task_id)
+
+    async def count_tasks_by_status(self) -> dict[str, int]:
+        """Count tasks per status, computed in SQL."""
+        return await self._read(self._store._count_tasks_by_status)
+
+    # --- Inbox Operations ---
+
+    async def add_inbox_item(self, item: InboxItem) -> None:
+        """Add an item to the inbox."""
+        await self._write(self._store._insert_inbox_item, item)
+
+    async def get_inbox(
+        self,
+        unread_only: bool = False,
+        severity: str | None = None,
+        limit: int = 50
+    ) -> list[InboxItem]:
+        """Get inbox items."""
+        return await self._read(self._store._query_inbox, unread_only, severity, limit)
+
+    async def iter_inbox(
+        self,
+        unread_only: bool = False,
+        severity: str | None = None,
+        page_size: int = 100
+    ) -> AsyncIterator[InboxItem]:
+        """Iterate inbox items newest first, one keyset page at a time."""
+        cursor: tuple[str, str] | None = None
+        while True:
+            page = await self._read(
+                self._store._query_inbox_page, unread_only, severity, cursor, page_size
+            )
+            for item in page:
+                yield item
+            if len(page) < page_size:
+                return
+            cursor = (page[-1].created_at.isoformat(), page[-1].inbox_id)
+
+    async def count_inbox_by_severity(self, unread_only: bool = False) -> dict[str, int]:
+        """Count inbox items per severity, computed in SQL."""
+        return await self._read(self._store._count_inbox_by_severity, unread_only)
+
+    async def acknowledge_inbox(self, inbox_id: str) -> None:
+        """Mark an inbox item as acknowledged."""
+        await self._write(self._store._ack_inbox, inbox_id)
+
+    async def acknowledge_all_inbox(self) -> int:
+        """Mark all unread inbox items as acknowledged."""
+        return await self._write(self._store._ack_all_inbox)
+
+    # --- Mapping Operations ---
+
+    async def set_mapping(self, mapping: TaskMapping) -> None:
+        """Set or update a task mapping."""
+        await self._write(self._store._upsert_mapping, mapping)
+
+    async def get_mapping_by_task(self, task_id: str) -> TaskMapping | None:
+        """Get mapping by Conversator task ID."""
+        return await self._cached_read(
+            ("mapping", task_id), self._store._query_mapping, "task_id", task_id
+        )
+
+    async def get_mapping_by_beads(self, beads_id: str) -> TaskMapping | None:
+        """Get mapping by Beads task ID."""
+        return await self._cached_read(
+            ("beads", beads_id), self._store._query_mapping, "beads_id", beads_id
+        )
+
+    # --- Compaction ---
+
+    async def compact(
+        self,
+        older_than: timedelta = timedelta(days=30),
+        archive: bool = True,
+        codec: str | None = None
+    ) -> dict:
+        """Fold the histories of long-finished tasks into summary events."""
+        store = self._store
+        cutoff = (datetime.utcnow() - older_than).isoformat()
+        histories = await self._read(store._compaction_candidates, cutoff)
+        segment = None
+        if archive:
+            segment = await asyncio.to_thread(store._write_archive_segment, histories, codec)
+        try:
+            result = await self._write(store._compact, histories, segment)
+        except BaseException:
+            store._discard_segment(segment)
+            raise
+        if not result["tasks"]:
+            store._discard_segment(segment)
+        return result
+
+    # --- Recovery ---
+
+    async def replay_events(self, after_event_id: int = 0) -> int:
+        """Rebuild derived state by replaying events."""
+        return await self._write(self._store._replay, after_event_id)
+
+    async def create_snapshot(self) -> int:
+        """Snapshot the derived tables at the latest event."""
+        return await self._write(self._store._write_snapshot)
+
+    async def recover(self) -> dict:
+        """Rebuild derived state from the latest snapshot plus the event tail."""
+        return await self._write(self._store._recover)
+
+    # --- High-Level Helpers ---
+
+    async def create_task(
+        self,
+        title: str,
+        working_prompt_path: str | None = None,
+        project_root: str | None = None
+    ) -> ConversatorTask:
+        """Create a new task with a TaskCreated event."""
+        event = _task_created_event(title, working_prompt_path, project_root)
+        await self.append_event(event)
+
+        return await self.get_task(event.task_id)
+
+    async def update_task_status(
+        self, task_id: str, event_type: EventType, payload: dict | None = None
+    ) -> None:
+        """Update a task by emitting an event."""
+        event = TaskEvent(
+            type=event_type,
+            task_id=task_id,
+            payload=payload or {}
+        )
+        await self.append_event(event)
+
+    async def cancel_task(self, task_id: str, reason: str = "User requested") -> None:
+        """Cancel a task."""
+        await self.update_task_status(
+            task_id,
+            "TaskCanceled",
+            create_task_canceled_payload(reason)
+        )
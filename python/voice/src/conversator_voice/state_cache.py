@@ -0,0 +1,106 @@
+"""Bounded read-through cache for hot StateStore lookups."""
+
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Any, Iterable
+
+from .models import ConversatorTask, TaskMapping
+
+# Cache keys are (kind, id) where kind is "task", "mapping" (by task_id)
+# or "beads" (mapping by beads_id)
+CacheKey = tuple[str, str]
+
+
+class ReadThroughCache:
+    """LRU cache of ConversatorTask/TaskMapping objects.
+
+    Only found objects are cached, so there are no negative entries to
+    invalidate. The state store invalidates by task_id after every commit;
+    a generation counter stops a query that raced with a commit from
+    re-inserting data that was already stale. Callers always receive a
+    copy so mutating a returned object never corrupts the cache.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum cached objects (0 disables caching)
+        """
+        self.max_entries = max_entries
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[CacheKey, ConversatorTask | TaskMapping] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> tuple[bool, Any]:
+        """Look up a key.
+
+        Returns:
+            Tuple of (hit, copy of the cached object or None)
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, replace(value)
+
+    def put(self, key: CacheKey, value: ConversatorTask | TaskMapping, generation: int) -> None:
+        """Cache an object read at the given generation.
+
+        Args:
+            key: Cache key
+            value: Object read from the database
+            generation: Value of self.generation taken before the read
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return  # A commit landed while we were reading
+            self._entries[key] = replace(value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, task_ids: Iterable[str] | None = None) -> None:
+        """Drop cached objects for the given tasks (None = everything)."""
+        with self._lock:
+            self.generation += 1
+            if task_ids is None:
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                return
+
+            ids = set(task_ids)
+            if not ids:
+                return
+            stale = [
+                key for key, value in self._entries.items()
+                if key[1] in ids or value.task_id in ids
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def stats(self) -> dict:
+        """Hit/miss counters for confirming the cache reduces query load."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,87 @@
+"""Maintenance commands for the Conversator state store."""
+
+import argparse
+import json
+import sqlite3
+import sys
+from datetime import timedelta
+
+from .state import StateStore
+
+
+def cli() -> None:
+    """Command-line interface entry point."""
+    parser = argparse.ArgumentParser(
+        description="Conversator state store maintenance",
+    )
+    parser.add_argument(
+        "--db",
+        default=".conversator/state.sqlite",
+        help="Path to state database (default: .conversator/state.sqlite)",
+    )
+
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("snapshot", help="Snapshot derived tables at the latest event")
+    verify = commands.add_parser("verify", help="Verify a snapshot against a full replay")
+    verify.add_argument("--snapshot-id", type=int, default=None, help="Default: latest")
+    commands.add_parser(
+        "recover", help="Rebuild derived tables from the latest snapshot plus event tail"
+    )
+    compact = commands.add_parser(
+        "compact", help="Fold histories of long-finished tasks into summary events"
+    )
+    compact.add_argument(
+        "--older-than-days", type=float, default=30.0, help="Idle age cutoff (default: 30)"
+    )
+    compact.add_argument(
+        "--no-archive", action="store_true", help="Drop raw events instead of archiving them"
+    )
+    compact.add_argument(
+        "--codec", choices=["zstd", "gzip"], default=None, help="Archive codec (default: best)"
+    )
+    migrate = commands.add_parser(
+        "migrate-encoding", help="Re-encode stored events in place (json or compact)"
+    )
+    migrate.add_argument("--to", choices=["json", "compact"], required=True)
+    migrate.add_argument(
+        "--no-vacuum", action="store_true", help="Skip VACUUM after converting"
+    )
+
+    args = parser.parse_args()
+
+    store = StateStore(args.db, snapshot_every=0)
+    try:
+        if args.command == "snapshot":
+            result = {"snapshot_id": store.create_snapshot()}
+        elif args.command == "verify":
+            try:
+                result = store.verify_snapshot(args.snapshot_id)
+            except ValueError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+        elif args.command == "compact":
+            result = store.compact(
+                older_than=timedelta(days=args.older_than_days),
+                archive=not args.no_archive,
+                codec=args.codec,
+            )
+        elif args.command == "migrate-encoding":
+            result = store.migrate_payload_encoding(args.to)
+        else:
+            result = store.recover()
+    finally:
+        store.close()
+
+    # VACUUM cannot run inside the writer's transactions; reclaim space after
+    if args.command == "migrate-encoding" and not args.no_vacuum:
+        conn = sqlite3.connect(args.db)
+        conn.execute("VACUUM")
+        conn.close()
+
+    print(json.dumps(result, indent=2))
+    if result.get("ok") is False:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    cli()
@@ -26,6 +26,7 @@ ThreadStatus = Literal[
 
 AnnouncementKind = Literal[
     "wait_started",
+    "response_preview",
     "response_ready",
     "info",
     "error",
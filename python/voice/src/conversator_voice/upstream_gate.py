@@ -0,0 +1,116 @@
+"""Gate microphone audio before it is sent to Gemini.
+
+With gating off, every captured frame goes upstream. Gemini bills input
+audio by duration, so long stretches of nobody talking cost as much as
+speech. In "speech" mode the gate follows the voice activity detector:
+
+- at speech onset, the VAD's pre-roll is sent first, so the start of the
+  first word is not clipped;
+- frames inside a segment are sent, including the trailing hangover,
+  which gives Gemini's own end-of-turn detection the silence it expects;
+- between segments frames are dropped, except for one keep-alive frame
+  every keepalive_ms. With keepalive_ms = 0 nothing is sent between
+  segments, and the audio_end signal sent when a segment ends stands in
+  for the silence. (Keep-alives closer together than the pre-roll may
+  send a frame twice; only the latest is left out of the pre-roll.)
+
+Time is measured with the frames' capture timestamps, so a burst of
+queued frames is gated the same as frames arriving in real time.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from .audio_analysis import AudioFrame
+from .vad import VADResult
+
+UPSTREAM_GATING_MODES = ("off", "speech")
+
+
+@dataclass
+class GateSettings:
+    """Upstream gating options."""
+
+    mode: str = "off"  # off | speech
+    keepalive_ms: float = 2000.0  # Silence frame interval between segments (0 = none)
+    sample_rate: int = 16000
+
+
+class UpstreamGate:
+    """Choose which analysed frames are sent upstream, and count the savings."""
+
+    def __init__(self, settings: GateSettings | None = None):
+        """Initialize the gate.
+
+        Args:
+            settings: Gating mode and keep-alive interval
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        self.settings = settings or GateSettings()
+        if self.settings.mode not in UPSTREAM_GATING_MODES:
+            raise ValueError(
+                f"Unknown upstream gating mode: {self.settings.mode} "
+                f"(expected one of {UPSTREAM_GATING_MODES})"
+            )
+        self._last_sent_at = float("-inf")
+        self._last_keepalive_at: float | None = None
+        self.frames_in = 0
+        self.frames_sent = 0
+        self.keepalives = 0
+        self.bytes_in = 0
+        self.bytes_sent = 0
+
+    def admit(self, frame: AudioFrame, result: VADResult) -> list[AudioFrame]:
+        """Frames to send for this one, in order.
+
+        Args:
+            frame: The frame just captured
+            result: The VAD's result for it
+
+        Returns:
+            Nothing (dropped), the frame itself, or at speech onset the
+            pre-roll followed by the frame
+        """
+        self.frames_in += 1
+        self.bytes_in += len(frame.pcm)
+
+        if self.settings.mode == "off" or (result.is_speech and not result.started):
+            out = [frame]
+        elif result.started:
+            # Skip a pre-roll frame that already went out as a keep-alive
+            out = [f for f in result.pre_roll if f.captured_at != self._last_keepalive_at]
+            out.append(frame)
+        elif (
+            self.settings.keepalive_ms > 0
+            and (frame.captured_at - self._last_sent_at) * 1000 >= self.settings.keepalive_ms
+        ):
+            self.keepalives += 1
+            self._last_keepalive_at = frame.captured_at
+            out = [frame]
+        else:
+            return []
+
+        self._last_sent_at = frame.captured_at
+        self.frames_sent += len(out)
+        self.bytes_sent += sum(len(f.pcm) for f in out)
+        return out
+
+    def _seconds(self, nbytes: int) -> float:
+        return nbytes / 2 / self.settings.sample_rate
+
+    def stats(self) -> dict[str, Any]:
+        """Audio sent and saved since the session started."""
+        saved = max(self.bytes_in - self.bytes_sent, 0)
+        return {
+            "mode": self.settings.mode,
+            "frames_in": self.frames_in,
+            "frames_sent": self.frames_sent,
+            "keepalives": self.keepalives,
+            "bytes_sent": self.bytes_sent,
+            "bytes_saved": saved,
+            "seconds_sent": round(self._seconds(self.bytes_sent), 1),
+            "seconds_saved": round(self._seconds(saved), 1),
+            "saved_ratio": round(saved / self.bytes_in, 3) if self.bytes_in else 0.0,
+        }
@@ -13,6 +13,9 @@ from typing import AsyncIterator
 import numpy as np
 import sounddevice as sd
 
+from ..audio_analysis import AudioFrame, SpeechLevels, analyze
+from .ring_buffer import AudioRingBuffer
+
 
 class LocalVoiceSource:
     """Voice source using local microphone via sounddevice.
@@ -25,12 +28,9 @@ class LocalVoiceSource:
     - Short cooldown after playback to catch residual echo
     - User can still interrupt by speaking loudly (detected via RMS threshold)
     - Output uses callback-based streaming for low-latency playback
+    - Input frames are pushed to the event loop from the capture callback
     """
 
-    # RMS threshold for detecting user speech during playback (for interruption)
-    # Must be higher than max speaker echo (observed ~8700 RMS)
-    INTERRUPT_THRESHOLD = 10000
-
     # Cooldown period after playback stops (seconds)
     # Longer cooldown helps prevent picking up echo tail
     POST_PLAYBACK_COOLDOWN = 0.5
@@ -43,6 +43,12 @@ class LocalVoiceSource:
     # Echo arrives immediately; real interrupts come after a brief moment
     ECHO_WINDOW_MS = 200
 
+    # Speech that can be queued for playback ahead of the speaker (seconds)
+    PLAYBACK_BUFFER_SECONDS = 120
+
+    # Captured frames waiting for the event loop; the oldest is dropped beyond this
+    MAX_PENDING_FRAMES = 30
+
     def __init__(
         self,
         input_sample_rate: int = 16000,
@@ -61,14 +67,29 @@ class LocalVoiceSource:
         self.chunk_duration_ms = chunk_duration_ms
         self.chunk_size = int(input_sample_rate * chunk_duration_ms / 1000)
 
-        self._input_queue: queue.Queue[bytes] = queue.Queue()
+        # Thresholds shared with the send loop. The interrupt level must be
+        # higher than max speaker echo (observed ~8700 RMS)
+        self.speech_levels = SpeechLevels()
+
+        # Capture: the PortAudio callback converts each block that passes echo
+        # suppression into a reused slab, analyses it once and pushes the
+        # frame to the event loop
+        self._slab = np.zeros(self.chunk_size, dtype=np.int16)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Analysed frames; None marks the end of capture
+        self._frames: asyncio.Queue[AudioFrame | None] = asyncio.Queue()
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self._capture_latency_last = 0.0
+        self._capture_latency_max = 0.0
         self._output_queue: queue.Queue[bytes] = queue.Queue()
         self._running = False
         self._input_stream = None
         self._output_stream = None
 
-        # Output buffer for non-blocking playback callback
-        self._output_buffer: bytes = b""
+        # Preallocated playback ring; play_audio writes, the output callback reads
+        self._playback = AudioRingBuffer(int(output_sample_rate * self.PLAYBACK_BUFFER_SECONDS))
+        # Guards the playback state flags below (not the audio itself)
         self._output_lock = threading.Lock()
 
         # Track if audio is being played (for echo suppression and ambient ducking)
@@ -81,6 +102,19 @@ class LocalVoiceSource:
     async def start(self) -> None:
         """Initialize and start capturing audio."""
         self._running = True
+        self._loop = asyncio.get_running_loop()
+
+        def capture_frame(indata, frames, captured_at) -> AudioFrame:
+            """Convert a block to int16 in the reused slab and analyse it once.
+
+            Only called for blocks that survive echo suppression, so frames
+            dropped in the echo window cost nothing on the audio thread.
+            """
+            if len(self._slab) < frames:
+                self._slab = np.zeros(frames, dtype=np.int16)
+            audio_int16 = self._slab[:frames]
+            np.multiply(indata[:, 0], 32767, out=audio_int16, casting="unsafe")
+            return analyze(audio_int16, sample_rate=self.input_sample_rate, captured_at=captured_at)
 
         def input_callback(indata, frames, time_info, status):
             """Capture audio with echo suppression during playback."""
@@ -89,9 +123,7 @@ class LocalVoiceSource:
             if not self._running:
                 return
 
-            # Convert float32 to int16 PCM
-            audio_int16 = (indata[:, 0] * 32767).astype(np.int16)
-            audio_bytes = audio_int16.tobytes()
+            captured_at = time.monotonic()
 
             # Time-gated echo suppression with interrupt window
             # Echo arrives immediately after audio is played; real interrupts come later
@@ -119,47 +151,30 @@ class LocalVoiceSource:
                     return
 
                 # Past echo window AND minimum playback - allow loud interrupts
-                rms = np.sqrt(np.mean(audio_int16.astype(np.float32)**2))
-                if rms > self.INTERRUPT_THRESHOLD:
+                frame = capture_frame(indata, frames, captured_at)
+                if self.speech_levels.is_interrupt(frame):
                     # User is trying to interrupt - send audio
-                    self._input_queue.put(audio_bytes)
+                    self._post_frame(frame)
                 # Otherwise, suppress (likely still echo or background noise)
                 return
 
             # Not playing - send audio normally
-            self._input_queue.put(audio_bytes)
+            self._post_frame(capture_frame(indata, frames, captured_at))
 
         def output_callback(outdata, frames, time_info, status):
             """Non-blocking callback to pull audio for playback."""
             if status:
                 print(f"Audio output status: {status}")
 
-            bytes_needed = frames * 2  # 16-bit = 2 bytes per sample
+            # int16 -> float32 straight from the ring into outdata, silence-padded
+            played = self._playback.read_into(outdata[:, 0], scale=1 / 32767.0)
 
             with self._output_lock:
                 was_playing = self._is_playing
-
-                if len(self._output_buffer) >= bytes_needed:
-                    # Have enough data
-                    data = self._output_buffer[:bytes_needed]
-                    self._output_buffer = self._output_buffer[bytes_needed:]
-                    self._is_playing = True
-                elif len(self._output_buffer) > 0:
-                    # Have some data, pad with silence
-                    data = self._output_buffer + b'\x00' * (bytes_needed - len(self._output_buffer))
-                    self._output_buffer = b""
-                    self._is_playing = True
-                else:
-                    # No data - output silence
-                    data = b'\x00' * bytes_needed
-                    self._is_playing = False
-                    # Track when playback ended for cooldown
-                    if was_playing:
-                        self._playback_ended_time = time.time()
-
-            # Convert to float32 for sounddevice
-            audio_array = np.frombuffer(data, dtype=np.int16)
-            outdata[:, 0] = audio_array.astype(np.float32) / 32767.0
+                self._is_playing = played > 0
+                # Track when playback ended for cooldown
+                if was_playing and not played:
+                    self._playback_ended_time = time.time()
 
         # Start input stream
         self._input_stream = sd.InputStream(
@@ -196,6 +211,22 @@ class LocalVoiceSource:
             self._output_stream.stop()
             self._output_stream.close()
             self._output_stream = None
+        # Wake get_audio_chunks so it can return
+        self._frames.put_nowait(None)
+
+    def _post_frame(self, frame: AudioFrame) -> None:
+        """Hand a captured frame to the event loop (called on the audio thread)."""
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._deliver_frame, frame)
+
+    def _deliver_frame(self, frame: AudioFrame) -> None:
+        """Queue a captured frame, dropping the oldest if the consumer lags."""
+        if self._frames.qsize() >= self.MAX_PENDING_FRAMES:
+            self._frames.get_nowait()
+            self.frames_dropped += 1
+        self._frames.put_nowait(frame)
+        self.frames_captured += 1
 
     def stop_playback(self) -> None:
         """Stop playback immediately (called on user interrupt).
@@ -203,33 +234,38 @@ class LocalVoiceSource:
         Clears the output buffer so playback stops at next callback.
         When interrupted, we skip cooldown because the user is actively speaking.
         """
+        self._playback.clear()
         with self._output_lock:
-            self._output_buffer = b""
             self._is_playing = False
             self._was_interrupted = True  # Skip cooldown - user is speaking
             self._playback_ended_time = time.time()  # Update timer for consistency
 
+    async def get_audio_frames(self) -> AsyncIterator[AudioFrame]:
+        """Yield captured frames with their analysis as soon as they are recorded.
+
+        Yields:
+            Frames of 16-bit PCM with level already measured
+        """
+        while self._running:
+            frame = await self._frames.get()
+            if frame is None:
+                break
+            latency = time.monotonic() - frame.captured_at
+            self._capture_latency_last = latency
+            self._capture_latency_max = max(self._capture_latency_max, latency)
+            yield frame
+
     async def get_audio_chunks(self) -> AsyncIterator[bytes]:
         """Yield audio chunks as they become available.
 
+        Chunks are pushed by the capture callback, so each one is yielded as
+        soon as its block is recorded.
+
         Yields:
             Raw audio bytes in 16-bit PCM format
         """
-        while self._running:
-            try:
-                # Non-blocking get with timeout
-                chunk = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self._input_queue.get(timeout=0.1)
-                )
-                yield chunk
-            except queue.Empty:
-                await asyncio.sleep(0.01)  # Yield to event loop
-                continue
-            except Exception as e:
-                if self._running:
-                    print(f"Audio capture error: {e}")
-                break
+        async for frame in self.get_audio_frames():
+            yield frame.pcm
 
     def flush_input_queue(self) -> None:
         """Clear any pending input audio.
@@ -239,23 +275,23 @@ class LocalVoiceSource:
         """
         try:
             while True:
-                self._input_queue.get_nowait()
-        except queue.Empty:
+                self._frames.get_nowait()
+        except asyncio.QueueEmpty:
             pass
 
     async def play_audio(self, audio_data: bytes) -> None:
         """Queue audio for playback.
 
-        Audio is added to the output buffer and played by the callback.
+        Audio is copied into the playback ring and played by the callback.
         This is non-blocking - returns immediately.
 
         Args:
             audio_data: Raw audio bytes (16-bit PCM at output_sample_rate)
         """
         if audio_data:
+            self._playback.write_bytes(audio_data)
             with self._output_lock:
                 was_playing = self._is_playing
-                self._output_buffer += audio_data
                 # Set playing flag immediately to enable echo suppression
                 # Don't wait for output callback - we need to suppress input NOW
                 self._is_playing = True
@@ -272,7 +308,21 @@ class LocalVoiceSource:
     def is_playback_complete(self) -> bool:
         """Check if all queued audio has been played."""
         with self._output_lock:
-            return not self._is_playing and len(self._output_buffer) == 0
+            return not self._is_playing and len(self._playback) == 0
+
+    def capture_stats(self) -> dict:
+        """Captured/dropped frame counts and callback-to-consumer latency."""
+        return {
+            "frames_captured": self.frames_captured,
+            "frames_dropped": self.frames_dropped,
+            "pending_frames": self._frames.qsize(),
+            "latency_last_ms": round(self._capture_latency_last * 1000, 2),
+            "latency_max_ms": round(self._capture_latency_max * 1000, 2),
+        }
+
+    def playback_stats(self) -> dict:
+        """Playback ring fill level and overflow/underrun counters."""
+        return self._playback.stats()
 
     async def wait_for_playback_complete(self, timeout: float = 5.0) -> bool:
         """Wait for playback to complete.
@@ -0,0 +1,131 @@
+"""Preallocated ring buffer for audio playback.
+
+The playback path has one producer (play_audio on the event loop) and one
+consumer (the sounddevice output callback on the audio thread). Each side
+owns one position counter and only reads the other's, so reads and writes
+need no lock: under the GIL an int assignment is atomic, and a stale view
+of the other side's counter can only understate the available data or
+free space. Samples are copied at most twice per call (once per side of
+the wrap), so cost is O(frame) however much speech is queued.
+"""
+
+from typing import Any
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """Single-producer, single-consumer ring of PCM samples."""
+
+    def __init__(self, capacity: int, dtype: Any = np.int16):
+        """Initialize the buffer.
+
+        Args:
+            capacity: Samples the buffer can hold
+            dtype: Sample type of written audio
+        """
+        self.capacity = capacity
+        self._ring = np.zeros(capacity, dtype=dtype)
+        self._itemsize = self._ring.itemsize
+        # Monotonic sample counters; position in the ring is counter % capacity
+        self._write = 0  # Owned by the producer
+        self._read = 0  # Owned by the consumer
+        self._discard_to = 0  # Set by the producer, applied by the consumer
+        self._partial = b""  # Trailing bytes of a write that split a sample
+        self.overflow_samples = 0
+        # Reads that ran dry while audio was flowing (the end of each reply
+        # counts once; more than that means the producer fell behind)
+        self.underruns = 0
+        self._flowing = False
+
+    def __len__(self) -> int:
+        """Samples queued for reading."""
+        return self._write - max(self._read, self._discard_to)
+
+    def write(self, samples: np.ndarray) -> int:
+        """Append samples; whatever does not fit is dropped and counted.
+
+        Args:
+            samples: 1-D array of the buffer's dtype
+
+        Returns:
+            Samples written
+        """
+        write = self._write
+        free = self.capacity - (write - max(self._read, self._discard_to))
+        count = min(len(samples), free)
+        if count < len(samples):
+            self.overflow_samples += len(samples) - count
+        if count <= 0:
+            return 0
+
+        start = write % self.capacity
+        first = min(count, self.capacity - start)
+        self._ring[start:start + first] = samples[:first]
+        if count > first:
+            self._ring[:count - first] = samples[first:count]
+        # Publish only after the samples are in place
+        self._write = write + count
+        return count
+
+    def write_bytes(self, data: bytes) -> int:
+        """Append raw PCM bytes (split samples are carried to the next call).
+
+        Returns:
+            Samples written
+        """
+        if self._partial:
+            data = self._partial + data
+        usable = len(data) - len(data) % self._itemsize
+        self._partial = data[usable:]
+        count = usable // self._itemsize
+        return self.write(np.frombuffer(data, dtype=self._ring.dtype, count=count))
+
+    def read_into(self, out: np.ndarray, scale: float | None = None) -> int:
+        """Fill `out` from the buffer, padding with silence.
+
+        Args:
+            out: Destination view (e.g. a column of sounddevice's outdata)
+            scale: Multiply samples by this while copying (converts int16
+                to float output in the same pass)
+
+        Returns:
+            Samples read (the rest of `out` is zeroed)
+        """
+        read = max(self._read, self._discard_to)
+        wanted = len(out)
+        count = min(wanted, self._write - read)
+
+        start = read % self.capacity
+        first = min(count, self.capacity - start)
+        self._copy(self._ring[start:start + first], out[:first], scale)
+        if count > first:
+            self._copy(self._ring[:count - first], out[first:count], scale)
+        if count < wanted:
+            out[count:] = 0
+            if self._flowing:
+                self.underruns += 1
+        self._flowing = count == wanted
+        self._read = read + count
+        return count
+
+    @staticmethod
+    def _copy(src: np.ndarray, dst: np.ndarray, scale: float | None) -> None:
+        if scale is None:
+            dst[:] = src
+        else:
+            np.multiply(src, scale, out=dst, casting="unsafe")
+
+    def clear(self) -> None:
+        """Drop everything queued (safe to call from the producer)."""
+        self._partial = b""
+        self._discard_to = self._write
+
+    def stats(self) -> dict[str, Any]:
+        """Fill level and overflow/underrun counters."""
+        return {
+            "capacity_samples": self.capacity,
+            "queued_samples": len(self),
+            "overflow_samples": self.overflow_samples,
+            "underruns": self.underruns,
+        }
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from conversator_voice.audio_analysis import AudioFrame, SpeechLevels, analyze, audio_frames
+from conversator_voice.vad import (
+    EnergyClassifier,
+    VADSettings,
+    VoiceActivityDetector,
+    frames_from_pcm,
+)
+
+
+def test_analysis_and_thresholds_are_computed_once_per_frame():
+    t = np.arange(1600) / 16000
+    tone = (3000 * np.sin(2 * np.pi * 1000 * t)).astype(np.int16)
+
+    frame = analyze(tone, features=True)
+    assert frame.pcm == tone.tobytes()
+    assert frame.rms == pytest.approx(3000 / np.sqrt(2), rel=0.01)
+    assert frame.zero_crossing_rate == pytest.approx(2000 / 16000, rel=0.05)
+    assert frame.spectral_centroid == pytest.approx(1000, rel=0.05)
+
+    levels = SpeechLevels(speech=1500, generating_factor=3, interrupt=10000)
+    assert levels.is_speech(frame)
+    assert not levels.is_speech(frame, generating=True)
+    assert not levels.is_interrupt(frame)
+
+    # Offline frames are stamped from the start of the audio, beginning at 0
+    frames = frames_from_pcm(np.tile(tone, 3))
+    assert [f.captured_at for f in frames] == pytest.approx([0.0, 0.1, 0.2])
+
+
+@pytest.mark.asyncio
+async def test_audio_frames_analyses_plain_chunk_sources_and_passes_text_through():
+    class ChunkSource:
+        async def get_audio_chunks(self):
+            yield b"TEXT:hello"
+            yield np.full(160, 100, dtype=np.int16).tobytes()
+
+    items = [item async for item in audio_frames(ChunkSource())]
+    assert items[0] == b"TEXT:hello"
+    assert isinstance(items[1], AudioFrame) and items[1].rms == pytest.approx(100)
+
+
+def _frame(rms: float) -> AudioFrame:
+    return AudioFrame(pcm=bytes(3200), rms=rms, peak=int(rms))
+
+
+def test_energy_vad_adapts_to_the_noise_floor():
+    settings = VADSettings(margin_db=6, noise_window_s=1)
+    vad = VoiceActivityDetector(EnergyClassifier(settings, SpeechLevels(speech=1500)), settings)
+
+    # A fan at 2500 rms: speech by the fixed threshold, background for the VAD
+    assert not any(vad.process(_frame(2500)).is_speech for _ in range(20))
+    assert vad.stats()["noise_floor_rms"] == 2500
+    assert vad.process(_frame(8000)).voiced
+
+    # When the fan stops, the floor follows it down within the window
+    for _ in range(20):
+        vad.process(_frame(100))
+    assert vad.stats()["noise_floor_rms"] == 100
+    assert vad.process(_frame(2000)).voiced
+
+
+def test_speech_longer_than_the_noise_window_is_not_cut_off():
+    settings = VADSettings()  # 5 s noise window
+    vad = VoiceActivityDetector(EnergyClassifier(settings), settings)
+    rng = np.random.default_rng(0)
+
+    for _ in range(20):  # 2 s of room noise
+        vad.process(_frame(200))
+    # 15 s of continuous speech
+    results = [vad.process(_frame(rng.uniform(2000, 5000))) for _ in range(150)]
+
+    assert not any(r.ended for r in results)
+    assert all(r.is_speech for r in results[1:])
+    assert vad.stats()["noise_floor_rms"] < 1000
+
+
+def test_vad_segments_with_pre_roll_and_hangover():
+    settings = VADSettings(min_speech_ms=200, end_of_speech_ms=300, pre_roll_ms=200)
+    vad = VoiceActivityDetector(EnergyClassifier(settings), settings)
+
+    quiet = [_frame(100) for _ in range(5)]
+    for frame in quiet:
+        assert not vad.process(frame).is_speech
+    onset = _frame(5000)
+    assert not vad.process(onset).started
+
+    started = vad.process(_frame(5000))
+    assert started.started and started.is_speech
+    # Up to 200 ms from before the onset frame that tipped it, oldest first
+    assert started.pre_roll == [quiet[-1], onset]
+
+    # A short pause does not end the turn; the hangover does
+    results = [vad.process(_frame(f)) for f in (100, 100, 5000, 100, 100, 100)]
+    assert [r.ended for r in results] == [False, False, False, False, False, True]
+    assert not vad.in_speech
+    assert vad.stats()["segments"] == 1
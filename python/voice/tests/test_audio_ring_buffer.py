@@ -0,0 +1,28 @@
+import numpy as np
+
+from conversator_voice.voice_sources.ring_buffer import AudioRingBuffer
+
+
+def test_ring_wraps_converts_and_counts_overflow_and_underrun():
+    ring = AudioRingBuffer(capacity=8)
+    out = np.ones(5, dtype=np.float32)
+
+    # Odd byte counts split a sample across writes
+    samples = np.array([1000, -2000, 3000, 4000, 5000, 6000], dtype=np.int16).tobytes()
+    assert ring.write_bytes(samples[:5]) == 2
+    assert ring.write_bytes(samples[5:]) == 4
+    assert ring.read_into(out, scale=1 / 1000) == 5
+    assert out.tolist() == [1.0, -2.0, 3.0, 4.0, 5.0]
+
+    # Wraps around the end of the ring; the excess is dropped and counted
+    assert ring.write(np.arange(10, dtype=np.int16)) == 7
+    assert ring.overflow_samples == 3
+    out = np.ones(10, dtype=np.float32)
+    assert ring.read_into(out) == 8
+    assert out.tolist() == [6000, 0, 1, 2, 3, 4, 5, 6, 0, 0]
+    assert ring.underruns == 1
+
+    ring.write(np.arange(4, dtype=np.int16))
+    ring.clear()
+    assert len(ring) == 0
+    assert ring.read_into(np.ones(2, dtype=np.float32)) == 0
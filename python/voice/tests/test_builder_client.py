@@ -4,6 +4,7 @@ import httpx
 import pytest
 
 from conversator_voice.builder_client import OpenCodeBuilder
+from conversator_voice.opencode_transport import OpenCodeTransport
 
 
 class RequestRecorder:
@@ -14,6 +15,14 @@ class RequestRecorder:
         self.requests.append(request)
 
 
+async def mock_transport(handler) -> OpenCodeTransport:
+    """A private transport, so tests leave the shared pool alone."""
+    transport = OpenCodeTransport("http://localhost:4096")
+    await transport.client.aclose()
+    transport.client = httpx.AsyncClient(transport=httpx.MockTransport(handler), timeout=10)
+    return transport
+
+
 @pytest.mark.asyncio
 async def test_dispatch_task_plan_mode_sends_plan_agent(tmp_path):
     recorder = RequestRecorder()
@@ -32,9 +41,10 @@ async def test_dispatch_task_plan_mode_sends_plan_agent(tmp_path):
 
         raise AssertionError(f"Unexpected request: {request.method} {request.url}")
 
-    builder = OpenCodeBuilder(name="opencode", base_url="http://localhost:4096", model="test")
-    await builder.client.aclose()
-    builder.client = httpx.AsyncClient(transport=httpx.MockTransport(handler), timeout=10)
+    transport = await mock_transport(handler)
+    builder = OpenCodeBuilder(
+        name="opencode", base_url="http://localhost:4096", model="test", transport=transport
+    )
 
     prompt_path = tmp_path / "prompt.md"
     prompt_path.write_text("# Test Prompt\n")
@@ -44,6 +54,7 @@ async def test_dispatch_task_plan_mode_sends_plan_agent(tmp_path):
     assert builder.plan_sessions["task-1"] == "ses_123"
 
     await builder.close()
+    await transport.aclose()
 
 
 @pytest.mark.asyncio
@@ -62,9 +73,10 @@ async def test_approve_and_build_sends_build_agent(tmp_path):
 
         raise AssertionError(f"Unexpected request: {request.method} {request.url}")
 
-    builder = OpenCodeBuilder(name="opencode", base_url="http://localhost:4096", model="test")
-    await builder.client.aclose()
-    builder.client = httpx.AsyncClient(transport=httpx.MockTransport(handler), timeout=10)
+    transport = await mock_transport(handler)
+    builder = OpenCodeBuilder(
+        name="opencode", base_url="http://localhost:4096", model="test", transport=transport
+    )
 
     builder.plan_sessions["task-1"] = "ses_123"
 
@@ -74,3 +86,75 @@ async def test_approve_and_build_sends_build_agent(tmp_path):
     assert "task-1" not in builder.plan_sessions
 
     await builder.close()
+    await transport.aclose()
+
+
+@pytest.mark.asyncio
+async def test_plan_response_fetches_only_new_messages():
+    history = [
+        {"info": {"id": f"msg_{i:03d}", "role": "assistant"},
+         "parts": [{"id": f"prt_{i:03d}", "type": "text", "text": f"step {i}"}]}
+        for i in range(30)
+    ]
+    limits: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/session/ses_123/message"
+        limit = request.url.params.get("limit")
+        limits.append(limit)
+        return httpx.Response(200, json=history[-int(limit):] if limit else history)
+
+    transport = await mock_transport(handler)
+    builder = OpenCodeBuilder(
+        name="opencode", base_url="http://localhost:4096", model="test", transport=transport
+    )
+    builder.plan_sessions["task-1"] = "ses_123"
+
+    assert (await builder.get_plan_response("task-1"))["plan"] == "step 29"
+
+    history.append({"info": {"id": "msg_030", "role": "assistant"},
+                    "parts": [{"id": "prt_030", "type": "text", "text": "final plan"}]})
+    assert (await builder.get_plan_response("task-1"))["plan"] == "final plan"
+    assert limits == [None, "20"]
+    assert len(await builder.get_session_messages("task-1")) == 31
+
+    await builder.close()
+    assert builder.plan_sessions == {} and builder.message_cache.stats()["sessions"] == 0
+    await transport.aclose()
+
+
+@pytest.mark.asyncio
+async def test_cached_messages_are_released_after_plan_approval_and_task_end():
+    status = {"type": "busy"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/message"):
+            return httpx.Response(200, json=[{
+                "info": {"id": "msg_001", "role": "assistant"},
+                "parts": [{"id": "prt_001", "type": "text", "text": "plan"}],
+            }])
+        if request.url.path == "/session/ses_123/prompt_async":
+            return httpx.Response(204)
+        if request.url.path == "/session/status":
+            return httpx.Response(200, json={"ses_123": status})
+        raise AssertionError(f"Unexpected request: {request.method} {request.url}")
+
+    transport = await mock_transport(handler)
+    builder = OpenCodeBuilder(
+        name="opencode", base_url="http://localhost:4096", model="test", transport=transport
+    )
+    builder.plan_sessions["task-1"] = "ses_123"
+
+    await builder.get_plan_response("task-1")
+    assert builder.message_cache.is_loaded("ses_123")
+    assert (await builder.approve_and_build("task-1"))["building"] is True
+    assert builder.message_cache.stats()["sessions"] == 0
+
+    await builder.get_session_messages("task-1")
+    assert await builder.get_session_status("task-1") == "busy"
+    assert builder.message_cache.is_loaded("ses_123")
+    status["type"] = "completed"
+    assert await builder.get_session_status("task-1") == "completed"
+    assert builder.message_cache.stats()["sessions"] == 0
+
+    await transport.aclose()
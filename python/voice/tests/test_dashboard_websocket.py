@@ -0,0 +1,130 @@
+import asyncio
+import json
+
+import pytest
+
+from conversator_voice.dashboard.websocket import ConnectionManager
+from conversator_voice.dashboard.ws_protocol import decode
+
+
+class FakeWebSocket:
+    def __init__(self, stalled: bool = False, subprotocols: list[str] | None = None):
+        self.client = None
+        self.scope = {"subprotocols": subprotocols or []}
+        self.accepted: str | None = None
+        self.frames: list[str | bytes] = []
+        self.received: list[dict] = []
+        self.release = asyncio.Event()
+        if not stalled:
+            self.release.set()
+
+    async def accept(self, subprotocol: str | None = None) -> None:
+        self.accepted = subprotocol
+
+    async def send_text(self, message: str) -> None:
+        await self.release.wait()
+        self.frames.append(message)
+        self.received.append(json.loads(message))
+
+    async def send_bytes(self, message: bytes) -> None:
+        await self.release.wait()
+        self.frames.append(message)
+        self.received.append(decode(message))
+
+
+def lagging_age(manager: ConnectionManager) -> float:
+    return max(s["queue_age_ms"] for s in manager.client_stats())
+
+
+@pytest.mark.asyncio
+async def test_stalled_client_neither_blocks_others_nor_grows_unbounded():
+    manager = ConnectionManager(max_queue=4)
+    fast, stalled = FakeWebSocket(), FakeWebSocket(stalled=True)
+    await manager.connect(fast)
+    await manager.connect(stalled)
+
+    for i in range(10):
+        await asyncio.wait_for(manager.broadcast("task_update", {"n": i}), timeout=0.1)
+    await asyncio.sleep(0)
+
+    assert [m["data"]["n"] for m in fast.received] == list(range(10))
+    lagging = {s["sent"]: s for s in manager.client_stats()}[0]
+    assert lagging["queue_depth"] <= 4
+    assert lagging["resyncs"] >= 1
+    await asyncio.sleep(0.01)
+    assert lagging_age(manager) >= 10
+
+    stalled.release.set()
+    await asyncio.sleep(0.01)
+    assert any(m["type"] == "resync" for m in stalled.received)
+    assert lagging_age(manager) == 0.0
+
+    await manager.close()
+    assert manager.connection_count == 0
+
+
+@pytest.mark.asyncio
+async def test_clients_only_receive_subscribed_topics_and_sessions():
+    manager = ConnectionManager()
+    inbox_only, viewer, everything = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    for ws in (inbox_only, viewer, everything):
+        await manager.connect(ws)
+    await manager.handle_client_message(inbox_only, '{"action": "subscribe", "topics": ["inbox"]}')
+    await manager.handle_client_message(
+        viewer, '{"action": "subscribe", "topics": ["messages"], "sessions": ["ses_1"]}'
+    )
+
+    await manager.broadcast_inbox_item("inbox_1", "info", "Done")
+    for session_id in ("ses_1", "ses_2"):
+        await manager.broadcast("opencode_message_chunk", {
+            "session_id": session_id, "content_delta": "hi",
+        })
+    await asyncio.sleep(0.01)
+
+    def received(ws):
+        return [(m["type"], m["data"].get("session_id")) for m in ws.received]
+
+    assert received(inbox_only) == [("subscribed", None), ("inbox_item", None)]
+    assert received(viewer) == [("subscribed", None), ("opencode_message_chunk", "ses_1")]
+    assert len(received(everything)) == 3
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_malformed_subscription_is_ignored():
+    manager = ConnectionManager()
+    ws = FakeWebSocket()
+    await manager.connect(ws)
+    for message in (
+        '{"action": "subscribe", "topics": "inbox"}',
+        '{"action": "subscribe", "topics": ["inbox"], "sessions": [1]}',
+        '{"action": "unsubscribe", "topics": {"inbox": true}}',
+    ):
+        await manager.handle_client_message(ws, message)
+
+    await manager.broadcast_inbox_item("inbox_1", "info", "Done")
+    await asyncio.sleep(0.01)
+
+    assert [m["type"] for m in ws.received] == ["inbox_item"]
+    assert manager.client_stats()[0]["topics"] is None
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_binary_protocol_is_negotiated_and_compresses_large_events():
+    manager = ConnectionManager()
+    legacy = FakeWebSocket()
+    binary = FakeWebSocket(subprotocols=["conversator.binary", "conversator.json"])
+    await manager.connect(legacy)
+    await manager.connect(binary)
+    assert (legacy.accepted, binary.accepted) == (None, "conversator.binary")
+
+    entry = {"role": "assistant", "content": "All tests pass. " * 100}
+    await manager.broadcast_conversation_entry(entry)
+    await asyncio.sleep(0.01)
+
+    assert isinstance(legacy.frames[0], str)
+    assert isinstance(binary.frames[0], bytes)
+    assert len(binary.frames[0]) < len(legacy.frames[0]) / 10
+    assert binary.received[0]["data"] == legacy.received[0]["data"] == entry
+    await manager.close()
@@ -0,0 +1,131 @@
+import asyncio
+import importlib
+import sys
+import threading
+import time
+import types
+
+import numpy as np
+import pytest
+
+
+class FakeStream:
+    """Stands in for a sounddevice stream; the test fires the callback itself."""
+
+    def __init__(self, samplerate, channels, dtype, blocksize, callback):
+        self.blocksize = blocksize
+        self.callback = callback
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def local(monkeypatch):
+    fake = types.SimpleNamespace(InputStream=FakeStream, OutputStream=FakeStream)
+    monkeypatch.setitem(sys.modules, "sounddevice", fake)
+    monkeypatch.delitem(sys.modules, "conversator_voice.voice_sources.local", raising=False)
+    return importlib.import_module("conversator_voice.voice_sources.local")
+
+
+def capture(source, blocks: int) -> None:
+    """Fire the input callback from another thread, like PortAudio does."""
+    stream = source._input_stream
+
+    def run():
+        for i in range(blocks):
+            block = np.full((stream.blocksize, 1), (i + 1) / 1000, dtype=np.float32)
+            stream.callback(block, stream.blocksize, None, None)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+
+
+def block_index(pcm: bytes) -> int:
+    """Recover the block number written by capture()."""
+    return round(np.frombuffer(pcm, dtype=np.int16)[0] / 32.767) - 1
+
+
+async def until(condition) -> None:
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+@pytest.mark.asyncio
+async def test_frames_from_the_audio_thread_arrive_in_order(local):
+    source = local.LocalVoiceSource()
+    await source.start()
+
+    capture(source, 10)
+    chunks = source.get_audio_chunks()
+    received = [block_index(await anext(chunks)) for _ in range(10)]
+
+    assert received == list(range(10))
+    assert source.capture_stats()["frames_captured"] == 10
+    await source.stop()
+
+
+@pytest.mark.asyncio
+async def test_stalled_consumer_drops_oldest_frames(local):
+    source = local.LocalVoiceSource()
+    await source.start()
+    limit = source.MAX_PENDING_FRAMES
+
+    capture(source, limit + 5)
+    await until(lambda: source.frames_captured == limit + 5)
+
+    stats = source.capture_stats()
+    assert source.frames_dropped == stats["frames_dropped"] == 5
+    assert stats["pending_frames"] == limit
+    first = await anext(source.get_audio_frames())
+    assert block_index(first.pcm) == 5
+    await source.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_ends_get_audio_chunks(local):
+    source = local.LocalVoiceSource()
+    await source.start()
+
+    async def consume():
+        return [chunk async for chunk in source.get_audio_chunks()]
+
+    consumer = asyncio.create_task(consume())
+    capture(source, 2)
+    await until(lambda: source._frames.empty() and source.frames_captured == 2)
+    await source.stop()
+
+    assert len(await asyncio.wait_for(consumer, timeout=1)) == 2
+
+
+@pytest.mark.asyncio
+async def test_blocks_suppressed_as_echo_are_not_analysed(local, monkeypatch):
+    analysed = []
+    analyze = local.analyze
+    monkeypatch.setattr(local, "analyze", lambda *a, **kw: analysed.append(1) or analyze(*a, **kw))
+    source = local.LocalVoiceSource()
+    await source.start()
+
+    # Playback audio just arrived: inside the echo window
+    source._is_playing = True
+    source._last_audio_received_time = time.time()
+    capture(source, 3)
+    await asyncio.sleep(0.05)  # Let any queued deliveries run
+    assert analysed == [] and source.frames_captured == 0
+
+    source._is_playing = False
+    source._was_interrupted = True  # No cooldown
+    capture(source, 1)
+    await until(lambda: source.frames_captured == 1)
+    assert len(analysed) == 1
+    await source.stop()
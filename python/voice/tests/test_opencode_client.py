@@ -0,0 +1,373 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from conversator_voice.opencode_client import OpenCodeClient
+from conversator_voice.opencode_sse_client import MultiSourceSSEManager, OpenCodeSSEClient
+from conversator_voice.opencode_transport import OpenCodeTransport, endpoint_key, get_transport
+from conversator_voice.session_store import SessionStoreLimits
+from conversator_voice.sse_parser import SSEDecoder
+
+
+async def mock_transport(handler) -> OpenCodeTransport:
+    """A private transport, so tests leave the shared pool alone."""
+    transport = OpenCodeTransport("http://localhost:4096")
+    await transport.client.aclose()
+    transport.client = httpx.AsyncClient(transport=httpx.MockTransport(handler), timeout=10)
+    return transport
+
+
+async def make_streaming_client(
+    texts: tuple[str, ...] = ("Hello", "Hello there"),
+    stale_reply: bool = False,
+) -> tuple[OpenCodeClient, OpenCodeSSEClient, list[str]]:
+    paths: list[str] = []
+
+    async def emit_reply():
+        if stale_reply:
+            # An earlier answer re-emitted on the bus: complete, with its own text
+            await stream._handle_event("message.part.updated", {"properties": {"part": {
+                "id": "prt_0", "messageID": "msg_old", "sessionID": "ses_123",
+                "type": "text", "text": "Old answer",
+            }}})
+            await stream._handle_event("message.updated", {"properties": {"info": {
+                "id": "msg_old", "sessionID": "ses_123", "role": "assistant",
+                "parentID": "msg_prev", "time": {"created": 1, "completed": 2},
+            }}})
+        now = time.time() * 1000
+        await stream._handle_event("message.updated", {"properties": {"info": {
+            "id": "msg_user", "sessionID": "ses_123", "role": "user", "time": {"created": now},
+        }}})
+        await stream._handle_event("message.updated", {"properties": {"info": {
+            "id": "msg_a", "sessionID": "ses_123", "role": "assistant",
+            "parentID": "msg_user", "time": {"created": now},
+        }}})
+        for text in texts:
+            await stream._handle_event("message.part.updated", {"properties": {"part": {
+                "id": "prt_1", "messageID": "msg_a", "sessionID": "ses_123",
+                "type": "text", "text": text,
+            }}})
+        await stream._handle_event("message.updated", {"properties": {"info": {
+            "id": "msg_a", "sessionID": "ses_123", "role": "assistant",
+            "parentID": "msg_user", "time": {"created": now, "completed": now + 1},
+        }}})
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        if request.url.path == "/session/ses_123/prompt_async":
+            asyncio.get_running_loop().create_task(emit_reply())
+            return httpx.Response(204)
+        raise AssertionError(f"Unexpected request: {request.method} {request.url}")
+
+    transport = await mock_transport(handler)
+    stream = OpenCodeSSEClient(base_url="http://localhost:4096", transport=transport)
+    stream._connected = True
+    client = OpenCodeClient("http://localhost:4096", event_stream=stream, transport=transport)
+    return client, stream, paths
+
+
+@pytest.mark.asyncio
+async def test_send_resolves_from_event_stream_without_polling():
+    client, stream, paths = await make_streaming_client()
+
+    events = [e async for e in client._send_and_poll("ses_123", "cvtr-planner", "hi")]
+
+    assert [e["type"] for e in events] == ["message", "complete"]
+    assert events[0]["content"] == "Hello there"
+    assert paths == ["/session/ses_123/prompt_async"]
+    assert "ses_123" not in stream._session_queues
+
+    await client.close()
+    await client.transport.aclose()
+
+
+async def _collect(events):
+    return [e async for e in events]
+
+
+@pytest.mark.asyncio
+async def test_reply_completing_without_text_resolves_immediately():
+    # A tool-only step: the assistant message completes with no text part
+    client, _, paths = await make_streaming_client(texts=())
+
+    events = await asyncio.wait_for(
+        _collect(client._send_and_poll("ses_123", "cvtr-planner", "hi")), timeout=5
+    )
+
+    assert [(e["type"], e["content"]) for e in events] == [("message", ""), ("complete", "")]
+    assert paths == ["/session/ses_123/prompt_async"]
+
+    await client.close()
+    await client.transport.aclose()
+
+
+@pytest.mark.asyncio
+async def test_older_assistant_message_on_the_bus_is_not_taken_as_the_reply():
+    client, _, _ = await make_streaming_client(stale_reply=True)
+
+    events = await asyncio.wait_for(
+        _collect(client._send_and_poll("ses_123", "cvtr-planner", "hi")), timeout=5
+    )
+
+    assert [(e["type"], e["content"]) for e in events] == [
+        ("message", "Hello there"), ("complete", "Hello there")
+    ]
+
+    await client.close()
+    await client.transport.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_text_deltas_before_completion():
+    client, _, _ = await make_streaming_client()
+
+    events = [
+        e async for e in client._send_and_poll("ses_123", "cvtr-planner", "hi", stream=True)
+    ]
+
+    assert [(e["type"], e["content"]) for e in events[:2]] == [
+        ("delta", "Hello"), ("delta", " there")
+    ]
+    assert [e["type"] for e in events[2:]] == ["message", "complete"]
+
+    await client.close()
+    await client.transport.aclose()
+
+
+@pytest.mark.asyncio
+async def test_health_check_is_served_from_recent_requests():
+    probes = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal probes
+        if request.url.path == "/agent":
+            probes += 1
+            return httpx.Response(200, json=[])
+        if request.url.path == "/session":
+            return httpx.Response(200, json={"id": "ses_123"})
+        raise AssertionError(f"Unexpected request: {request.method} {request.url}")
+
+    client = OpenCodeClient("http://localhost:4096", transport=await mock_transport(handler))
+
+    assert await client.create_session("one") == "ses_123"
+    assert await client.create_session("two") == "ses_123"
+    assert probes == 1
+
+    client.health.record_failure("connection refused")
+    assert await client.health_check() is False
+    client.health.failure_ttl = 0
+    assert await client.health_check() is True
+    assert probes == 2
+
+    await client.close()
+    await client.transport.aclose()
+
+
+@pytest.mark.asyncio
+async def test_only_successful_answers_mark_the_server_healthy():
+    statuses = {"/agent": 200, "/missing": 404, "/denied": 401, "/bad": 400}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(statuses[request.url.path], json={})
+
+    transport = await mock_transport(handler)
+    client = OpenCodeClient("http://localhost:4096", transport=transport)
+
+    for path in ("/missing", "/denied"):
+        await client._request("GET", path)
+        assert client.health.healthy is False
+    await client._request("GET", "/agent")
+    assert client.health.healthy is True
+    await client._request("GET", "/bad")
+    assert client.health.healthy is True
+
+    await transport.aclose()
+
+
+@pytest.mark.asyncio
+async def test_components_share_one_pooled_transport():
+    client = OpenCodeClient("http://localhost:4096/")
+    stream = OpenCodeSSEClient(base_url="http://localhost:4096")
+
+    assert client.transport is stream.transport is get_transport("http://localhost:4096")
+    assert client.client is client.transport.client
+    assert endpoint_key("GET", "/session/ses_4fA9x/message") == "GET /session/{id}/message"
+
+    await client.transport.aclose()
+    assert get_transport("http://localhost:4096") is not client.transport
+
+
+@pytest.mark.asyncio
+async def test_sse_store_evicts_least_recent_session_and_restores_from_spill(tmp_path):
+    limits = SessionStoreLimits(max_sessions=2, spill_dir=str(tmp_path))
+    limits_seen: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        limits_seen.append(request.url.params.get("limit"))
+        return httpx.Response(200, json=[{
+            "info": {"id": "msg_1", "sessionID": "ses_a", "role": "user"},
+            "parts": [{"id": "prt_1", "type": "text", "text": "x" * 100}],
+        }])
+
+    stream = OpenCodeSSEClient(
+        base_url="http://localhost:4096", limits=limits, transport=await mock_transport(handler)
+    )
+
+    assert len(await stream.fetch_session_messages("ses_a")) == 1
+    for session_id in ("ses_b", "ses_c"):
+        await stream._handle_event("message.part.updated", {"properties": {"part": {
+            "id": "prt_1", "messageID": "msg_1", "sessionID": session_id,
+            "type": "text", "text": "x" * 100,
+        }}})
+
+    usage = stream.connection_status["memory"]
+    assert (usage["evictions"], usage["spilled"], usage["tracked_sessions"]) == (1, 1, 2)
+    assert stream.message_cache.session_bytes("ses_a") == 0
+    assert usage["part_bytes"] == stream.message_cache.total_bytes > 0
+
+    messages = await stream.fetch_session_messages("ses_a")
+    assert [m.parts[0]["text"] for m in messages] == ["x" * 100]
+    assert limits_seen == [None, "20"]
+    assert stream.store.restored == 1
+
+    await stream.transport.aclose()
+
+
+@pytest.mark.asyncio
+async def test_spilled_session_is_restored_when_new_events_arrive_first(tmp_path):
+    limits = SessionStoreLimits(max_sessions=2, spill_dir=str(tmp_path))
+    stream = OpenCodeSSEClient(base_url="http://localhost:4096", limits=limits)
+
+    async def part(session_id: str, message_id: str, text: str) -> None:
+        await stream._handle_event("message.part.updated", {"properties": {"part": {
+            "id": f"prt_{message_id}", "messageID": message_id, "sessionID": session_id,
+            "type": "text", "text": text,
+        }}})
+
+    await stream._handle_event("session.updated", {"properties": {"info": {
+        "id": "ses_a", "title": "Conversator: cvtr-planner",
+    }}})
+    await part("ses_a", "msg_1", "before")
+    await part("ses_b", "msg_1", "b")
+    await part("ses_c", "msg_1", "c")
+    assert stream.store.has_spilled("ses_a")
+
+    # ses_a becomes active again before anyone reads it
+    await part("ses_a", "msg_2", "after")
+
+    assert not stream.store.has_spilled("ses_a")
+    session = stream.get_session("ses_a")
+    assert (session.agent_name, session.source) == ("cvtr-planner", "conversator")
+    assert [m.parts[0]["text"] for m in stream.get_session_messages("ses_a")] == [
+        "before", "after"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_manager_indexes_sessions_by_source_and_keeps_message_order():
+    manager = MultiSourceSSEManager()
+    layer2 = await manager.add_source("layer2", "http://localhost:4096", start=False)
+    builder = await manager.add_source("builder", "http://localhost:4097", start=False)
+
+    await layer2._handle_event("session.updated", {"properties": {"info": {"id": "ses_a"}}})
+    for message_id in ("msg_2", "msg_1", "msg_3"):
+        await builder._handle_event("message.part.updated", {"properties": {"part": {
+            "id": f"prt_{message_id}", "messageID": message_id, "sessionID": "ses_b",
+            "type": "text", "text": message_id,
+        }}})
+
+    assert manager.get_session("ses_a")[0] == "layer2"
+    assert [m.message_id for m in manager.get_session_messages("ses_b")] == [
+        "msg_1", "msg_2", "msg_3"
+    ]
+
+    await manager.remove_source("builder")
+    assert manager.get_session_messages("ses_b") == []
+    assert manager.get_session("ses_a")[1] is layer2.get_session("ses_a")
+
+
+def test_sse_decoder_handles_split_chunks_and_stream_fields():
+    stream = (
+        b"\xef\xbb\xbf: keepalive\r\nretry: 2500\r\n"
+        b"id: 7\r\nevent: message.updated\r\ndata: {\"a\":\r\ndata: 1}\r\n\r\n"
+        b"data: second\rid: 8\r\r: mixed endings\n"
+    )
+    decoder = SSEDecoder()
+    events = [e for i in range(len(stream)) for e in decoder.feed(stream[i:i + 1])]
+
+    assert [(e.event, e.data, e.id) for e in events] == [
+        ("message.updated", '{"a":\n1}', "7"), ("message", "second", "8")
+    ]
+    assert (decoder.retry, decoder.last_event_id) == (2500, "8")
+
+
+@pytest.mark.asyncio
+async def test_sse_listener_resumes_with_last_event_id():
+    seen_ids: list[str | None] = []
+    body = (
+        b'id: 41\ndata: {"type": "session.updated", "properties": {"info": {"id": "ses_a"}}}\n\n'
+    )
+
+    async def chunks():
+        yield body[:30]
+        yield body[30:]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path != "/event":
+            return httpx.Response(404)
+        seen_ids.append(request.headers.get("last-event-id"))
+        return httpx.Response(
+            200, headers={"content-type": "text/event-stream"}, content=chunks()
+        )
+
+    stream = OpenCodeSSEClient(
+        base_url="http://localhost:4096", transport=await mock_transport(handler)
+    )
+    stream._running = True
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await stream._listen_sse()
+
+    assert seen_ids == [None, "41"]
+    assert stream.get_session("ses_a") is not None
+    assert stream.connection_status["events_received"] == 2
+
+    await stream.transport.aclose()
+
+
+class RecordingWebSocket:
+    def __init__(self):
+        self.sent: list[tuple[str, dict]] = []
+
+    async def broadcast(self, event_type: str, data: dict) -> None:
+        self.sent.append((event_type, data))
+
+
+@pytest.mark.asyncio
+async def test_streaming_parts_are_coalesced_and_flushed_before_session_error():
+    ws = RecordingWebSocket()
+    stream = OpenCodeSSEClient(base_url="http://localhost:4096", ws_manager=ws, coalesce_window=10)
+    await stream._handle_event("session.updated", {"properties": {"info": {"id": "ses_1"}}})
+
+    for i in range(50):
+        await stream._handle_event("message.part.updated", {"properties": {
+            "part": {"id": "prt_1", "messageID": "msg_a", "sessionID": "ses_1", "type": "text"},
+            "delta": f"t{i} ",
+        }})
+    assert [event for event, _ in ws.sent] == ["opencode_session_created"]
+
+    await stream._handle_event("session.error", {"properties": {
+        "sessionID": "ses_1", "error": "boom",
+    }})
+    assert [event for event, _ in ws.sent] == [
+        "opencode_session_created", "opencode_message_chunk", "opencode_session_updated",
+    ]
+    chunk = ws.sent[1][1]
+    assert chunk["content_delta"] == "".join(f"t{i} " for i in range(50))
+    assert chunk["coalesced"] == 50
+    assert stream.connection_status["broadcast"]["broadcasts_sent"] == 1
+
+    await stream.transport.aclose()
@@ -0,0 +1,229 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from conversator_voice.config import ConversatorConfig
+from conversator_voice.models import InboxItem
+from conversator_voice.state import StateStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = StateStore(tmp_path / "state.sqlite")
+    yield store
+    store.close()
+
+
+def test_bare_off_in_yaml_selects_synchronous_off(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("state:\n  synchronous: off\n")
+    config = ConversatorConfig.load(str(config_path))
+    assert config.state_synchronous == "off"
+
+    store = StateStore(tmp_path / "state.sqlite", synchronous=config.state_synchronous)
+    store.close()
+
+
+def test_sync_api_round_trip(store):
+    seen = []
+    store.add_event_listener(seen.append)
+
+    task = store.create_task("Sync task")
+    store.update_task_status(task.task_id, "BuildCompleted", {})
+
+    assert store.get_task(task.task_id).status == "done"
+    assert [e.type for e in seen] == ["TaskCreated", "BuildCompleted"]
+    assert store.get_active_tasks() == []
+
+
+@pytest.mark.asyncio
+async def test_async_facade_matches_sync_reads(store):
+    task = await store.aio.create_task("Async task")
+    await store.aio.update_task_status(task.task_id, "QuestionsRaised", {"questions": []})
+
+    assert (await store.aio.get_task(task.task_id)).status == "awaiting_user"
+    assert store.get_task(task.task_id).status == "awaiting_user"
+    assert len(await store.aio.get_events(task_id=task.task_id)) == 2
+
+    assert await store.aio.replay_events(0) == 2
+    assert (await store.aio.get_task(task.task_id)).status == "awaiting_user"
+
+
+@pytest.mark.asyncio
+async def test_group_commit_coalesces_concurrent_writes(tmp_path):
+    store = StateStore(tmp_path / "state.sqlite", commit_window=0.05)
+    try:
+        task = await store.aio.create_task("Burst")
+        await asyncio.gather(*(
+            store.aio.update_task_status(
+                task.task_id,
+                "BuilderStatusChanged",
+                {"session_id": "s", "old_status": "running", "new_status": "running"},
+            )
+            for _ in range(20)
+        ))
+
+        stats = store.commit_stats
+        assert stats["jobs"] == 21
+        assert stats["commits"] < stats["jobs"]
+        assert len(store.get_events(task_id=task.task_id)) == 21
+    finally:
+        store.close()
+
+
+def test_failed_job_does_not_abort_batch(store):
+    def boom(conn):
+        conn.execute("DELETE FROM tasks")
+        raise RuntimeError("boom")
+
+    task = store.create_task("Survivor")
+    with pytest.raises(RuntimeError):
+        store._write(boom)
+
+    assert store.get_task(task.task_id) is not None
+    assert store.commit_stats["failed_jobs"] == 1
+
+
+def test_recover_from_snapshot_replays_only_tail(tmp_path):
+    store = StateStore(tmp_path / "state.sqlite", snapshot_every=3)
+    try:
+        first = store.create_task("First")
+        store.update_task_status(first.task_id, "QuestionsRaised", {"questions": []})
+        store.update_task_status(first.task_id, "UserAnswered", {"answers": {}})
+        second = store.create_task("Second")
+        store.update_task_status(second.task_id, "BuildFailed", {})
+
+        result = store.recover()
+        assert result["from_event_id"] == 3
+        assert result["replayed"] == 2
+        assert store.get_task(first.task_id).status == "refining"
+        assert store.get_task(second.task_id).status == "failed"
+
+        assert store.verify_snapshot()["ok"] is True
+    finally:
+        store.close()
+
+
+def test_compaction_folds_history_and_keeps_archive_readable(store):
+    task = store.create_task("Old work")
+    store.update_task_status(task.task_id, "WorkingPromptUpdated", {"path": "w.md"})
+    store.update_task_status(task.task_id, "BuildCompleted", {})
+    active = store.create_task("Still going")
+
+    result = store.compact(older_than=timedelta(0))
+    assert result["tasks"] == 1
+    assert result["events_removed"] == 3
+    # Stored relative to the database directory, in the payload as in the index
+    assert result["archive_path"].startswith("archive/")
+    assert (store.db_path.parent / result["archive_path"]).exists()
+
+    live = store.get_events(task_id=task.task_id)
+    assert [e.type for e in live] == ["TaskCompacted"]
+    assert live[0].payload["archive_path"] == result["archive_path"]
+    archived = store.get_events(task_id=task.task_id, include_archived=True)
+    assert [e.type for e in archived] == [
+        "TaskCreated", "WorkingPromptUpdated", "BuildCompleted", "TaskCompacted"
+    ]
+
+    before = store.get_task(task.task_id)
+    store.replay_events(0)
+    after = store.get_task(task.task_id)
+    assert (after.status, after.working_prompt_path) == ("done", "w.md")
+    assert after.updated_at == before.updated_at
+    assert store.get_task(active.task_id).status == "draft"
+
+
+def test_compaction_leaves_no_segment_when_the_write_job_fails(store, monkeypatch):
+    task = store.create_task("Old work")
+    store.update_task_status(task.task_id, "BuildCompleted", {})
+
+    def failing_compact(conn, histories, segment):
+        assert segment[0].exists()  # Written and synced before the job runs
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(store, "_compact", failing_compact)
+    with pytest.raises(RuntimeError):
+        store.compact(older_than=timedelta(0))
+
+    assert not any(store.archive_dir.iterdir())
+    assert len(store.get_events(task_id=task.task_id)) == 2
+
+
+@pytest.mark.asyncio
+async def test_keyset_iterators_and_sql_aggregates(store):
+    tasks = [store.create_task(f"Task {i}") for i in range(5)]
+    store.update_task_status(tasks[0].task_id, "BuildCompleted", {})
+    store.add_inbox_item(InboxItem(summary="a", severity="error"))
+    store.add_inbox_item(InboxItem(summary="b", severity="error"))
+    store.add_inbox_item(InboxItem(summary="c", severity="info"))
+
+    assert [e.event_id for e in store.iter_events(page_size=2)] == list(range(1, 7))
+    assert len(list(store.iter_tasks(page_size=2))) == 5
+    assert [t.task_id async for t in store.aio.iter_tasks(page_size=2)] == [
+        t.task_id for t in store.get_tasks()
+    ]
+    assert len([i async for i in store.aio.iter_inbox(page_size=1)]) == 3
+
+    assert await store.aio.count_tasks_by_status() == {"draft": 4, "done": 1}
+    assert store.count_inbox_by_severity() == {"error": 2, "info": 1}
+    hourly = store.count_events_by_hour()
+    assert sum(b["count"] for b in hourly if b["type"] == "TaskCreated") == 5
+
+
+def test_compact_encoding_round_trips_and_migrates(tmp_path):
+    store = StateStore(tmp_path / "state.sqlite")
+    try:
+        task = store.create_task("Encoded", working_prompt_path="w.md")
+        store.update_task_status(task.task_id, "BuildFailed", {"error": "x", "extra": [1]})
+
+        result = store.migrate_payload_encoding("compact")
+        assert result["converted"] == 2
+        assert result["bytes_after"] < result["bytes_before"]
+
+        store.update_task_status(task.task_id, "BuildCompleted", {})
+        events = store.get_events(task_id=task.task_id)
+        assert [e.type for e in events] == ["TaskCreated", "BuildFailed", "BuildCompleted"]
+        assert events[0].payload["working_prompt_path"] == "w.md"
+        assert events[1].payload == {"error": "x", "extra": [1]}
+        assert events[2].payload == {}
+        assert len(store.get_events(event_type="BuildFailed")) == 1
+
+        store.replay_events(0)
+        assert store.get_task(task.task_id).status == "done"
+    finally:
+        store.close()
+
+
+def test_read_through_cache_invalidates_on_commit(store):
+    task = store.create_task("Cached")
+    store.get_task(task.task_id)
+    store.get_task(task.task_id).status = "mutated"
+    assert store.get_task(task.task_id).status == "draft"
+    assert store.cache_stats["hits"] >= 2
+
+    store.update_task_status(task.task_id, "BuildCompleted", {})
+    assert store.get_task(task.task_id).status == "done"
+    store.replay_events(0)
+    assert store.get_task(task.task_id).status == "done"
+    assert store.cache_stats["invalidations"] >= 2
+
+
+@pytest.mark.asyncio
+async def test_change_feed_resumes_and_survives_overflow(store):
+    task = await store.aio.create_task("Fed")
+    live = store.changes.subscribe(queue_size=2)
+    resumed = store.changes.subscribe(last_event_id=0, task_id=task.task_id)
+
+    for _ in range(5):
+        await store.aio.update_task_status(task.task_id, "UserAnswered", {"answers": {}})
+    await asyncio.to_thread(store.update_task_status, task.task_id, "BuildCompleted", {})
+
+    async with live, resumed:
+        got_live = [(await live.get()).event_id for _ in range(6)]
+        got_resumed = [(await resumed.get()).event_id for _ in range(7)]
+
+    assert got_live == list(range(2, 8))
+    assert got_resumed == list(range(1, 8))
+    assert live.overflows >= 1
+    assert store.changes.subscriber_count == 0
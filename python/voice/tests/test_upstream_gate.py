@@ -0,0 +1,54 @@
+import pytest
+
+from conversator_voice.audio_analysis import AudioFrame
+from conversator_voice.upstream_gate import GateSettings, UpstreamGate
+from conversator_voice.vad import EnergyClassifier, VADSettings, VoiceActivityDetector
+
+
+def _run(gate: UpstreamGate, levels: list[float]) -> list[list[float]]:
+    """Feed 100 ms frames at the given RMS levels; return the capture times sent per frame."""
+    settings = VADSettings(min_speech_ms=200, end_of_speech_ms=300, pre_roll_ms=200)
+    vad = VoiceActivityDetector(EnergyClassifier(settings), settings)
+    sent = []
+    for i, rms in enumerate(levels):
+        frame = AudioFrame(pcm=bytes(3200), rms=rms, peak=int(rms), captured_at=i / 10)
+        sent.append([f.captured_at for f in gate.admit(frame, vad.process(frame))])
+    return sent
+
+
+def test_speech_gating_sends_pre_roll_speech_and_hangover_only():
+    gate = UpstreamGate(GateSettings(mode="speech", keepalive_ms=0))
+    levels = [100] * 10 + [5000] * 5 + [100] * 10
+    sent = _run(gate, levels)
+
+    assert sent[:10] == [[]] * 10
+    assert sent[10] == []  # First voiced frame: onset not confirmed yet
+    assert sent[11] == pytest.approx([0.9, 1.0, 1.1])  # Pre-roll, then the frame
+    # Speech and the 300 ms hangover, then nothing
+    assert [bool(s) for s in sent[12:]] == [True] * 6 + [False] * 7
+
+    stats = gate.stats()
+    assert stats["frames_sent"] == 9
+    assert stats["seconds_saved"] == pytest.approx(1.6)
+    assert stats["saved_ratio"] == pytest.approx(16 / 25, abs=0.001)
+
+
+def test_keepalives_during_silence_are_not_repeated_in_pre_roll():
+    gate = UpstreamGate(GateSettings(mode="speech", keepalive_ms=1000))
+    sent = _run(gate, [100] * 10 + [5000] * 3)
+
+    # Keep-alives at 0.0 s and at 1.0 s (still below the onset length)
+    assert sent[0] == [0.0] and sent[10] == [1.0]
+    # The pre-roll is frames 9 and 10; frame 10 was already sent
+    assert sent[11] == pytest.approx([0.9, 1.1])
+    assert gate.keepalives == 2
+
+
+def test_gating_off_sends_every_frame_once():
+    gate = UpstreamGate()
+    sent = _run(gate, [100] * 5 + [5000] * 5 + [100] * 5)
+    assert all(len(s) == 1 for s in sent)
+    assert gate.stats()["bytes_saved"] == 0
+
+    with pytest.raises(ValueError):
+        UpstreamGate(GateSettings(mode="vad"))